@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Collection-time benchmark for the HIL test suite.
+
+Runs ``pytest --collect-only`` on typhoon/tests in fresh interpreters and
+appends the timings to a JSON-lines history file, so regressions in import
+and collection cost show up over time (e.g. an API handle created at import
+time again).
+
+Usage:
+    python typhoon/benchmarks/bench_collection.py [--repeat 5] [--history PATH]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+TESTS_DIR = os.path.join(BENCH_DIR, "..", "tests")
+DEFAULT_HISTORY = os.path.join(BENCH_DIR, "history", "collection.jsonl")
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except Exception:
+        return None
+
+
+def time_collection(tests_dir, repeat):
+    timings = []
+    returncode = 0
+    for _ in range(repeat):
+        t_start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider", tests_dir],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        timings.append(time.perf_counter() - t_start)
+        returncode = returncode or proc.returncode
+    return timings, returncode
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tests-dir", default=TESTS_DIR)
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    args = parser.parse_args(argv)
+
+    timings, returncode = time_collection(args.tests_dir, args.repeat)
+    entry = {
+        "benchmark": "pytest_collect_only",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "repeat": args.repeat,
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "max_s": max(timings),
+        "collect_ok": returncode == 0,
+    }
+    os.makedirs(os.path.dirname(args.history), exist_ok=True)
+    with open(args.history, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+    print(f"collect-only: median {entry['median_s']*1000:.0f} ms "
+          f"(min {entry['min_s']*1000:.0f} ms, max {entry['max_s']*1000:.0f} ms) "
+          f"{'OK' if entry['collect_ok'] else 'FAILED'}")
+    return 0 if entry["collect_ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Performance benchmarks for the HIL test harness.
+
+Measures where test time goes and compares it against a stored JSON
+baseline, so regressions show up between Control Center upgrades:
+
+- call latency of the hil calls behind set_di / get_do / get_signal
+- achieved rate and jitter of the wait_for_pickup_or_trip polling loop
+- capture throughput at 10 kHz with the signals of test_q3_fault
+- model compile and load time
+
+Baselines are kept per backend in test_artifacts/benchmarks/<backend>.json
+(or --baseline, e.g. a file kept under version control). The first run (or
+--update-baseline) writes the baseline; later runs fail if a metric is worse
+than the baseline by more than --tolerance.
+
+Calls go to the bare API modules (HIL_INSTRUMENT=0), so the numbers do not
+include the call statistics proxies of hil_instrumentation.
+
+Usage:
+    python typhoon/benchmarks/run_benchmarks.py [--backend sim] [--update-baseline]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+TESTS_DIR = os.path.join(BENCH_DIR, "..", "tests")
+MODEL_PATH = os.path.join(BENCH_DIR, "..", "models", "digital-substation-demo.tse")
+BASELINE_DIR = os.path.join("test_artifacts", "benchmarks")
+Q3_SIGNALS = ["Grid Fault1.enable_fb", "S3_fb", "Three-phase Meter1.IA", "Three-phase Meter1.IA_RMS"]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+def latency_stats(samples_s):
+    us = [s * 1e6 for s in samples_s]
+    return {"p50_us": statistics.median(us), "p99_us": percentile(us, 0.99), "mean_us": statistics.fmean(us)}
+
+
+def bench_call_latency(busbar, n):
+    """Per-call latency of set_di, get_do and get_signal."""
+    cfg = busbar.CONFIG
+    calls = {
+        # writes the armed value, so protection on a live target stays armed
+        "set_di": lambda: busbar.set_di(cfg["arm_input_name"], 1),
+        "get_do": lambda: busbar.get_do(cfg["trip_output_name"]),
+        "get_signal": lambda: busbar.get_signal(cfg["meas_currents"][0]),
+    }
+    results = {}
+    for name, call in calls.items():
+        samples = []
+        for _ in range(n):
+            t_start = time.perf_counter()
+            call()
+            samples.append(time.perf_counter() - t_start)
+        for key, value in latency_stats(samples).items():
+            results[f"{name}.{key}"] = value
+    return results
+
+
+def bench_polling_loop(busbar, duration_s):
+    """Achieved rate and jitter of the 1 ms polling loop in wait_for_pickup_or_trip."""
+    stamps = []
+    original = busbar.do_reader
+
+    def timed_reader(name):
+        read = original(name)
+
+        def read_and_stamp():
+            stamps.append(time.perf_counter())
+            return read()
+        return read_and_stamp
+
+    busbar.do_reader = timed_reader
+    try:
+        # No fault applied: the loop polls for the whole timeout
+        busbar.BusbarDiffTester().wait_for_pickup_or_trip(
+            time.perf_counter(), trip_name=busbar.CONFIG["trip_output_name"], timeout=duration_s
+        )
+    finally:
+        busbar.do_reader = original
+
+    intervals = [b - a for a, b in zip(stamps, stamps[1:])]
+    return {
+        "poll.rate_hz": len(stamps) / duration_s,
+        "poll.interval_p50_us": statistics.median(intervals) * 1e6,
+        "poll.interval_p99_us": percentile(intervals, 0.99) * 1e6,
+        "poll.jitter_us": statistics.pstdev(intervals) * 1e6,
+    }
+
+
+def bench_capture(capture, duration_s, rate_hz=10000):
+    """Wall time to capture and retrieve ``duration_s`` of the test_q3_fault signals at 10 kHz."""
+    t_start = time.perf_counter()
+    capture.start_capture(duration_s, rate=rate_hz, signals=Q3_SIGNALS)
+    cap_data = capture.get_capture_results(wait_capture=True)
+    elapsed = time.perf_counter() - t_start
+    samples = cap_data.shape[0] * cap_data.shape[1]
+    return {
+        "capture.wall_s": elapsed,
+        "capture.overhead_s": max(elapsed - duration_s, 0.0),
+        "capture.samples_per_s": samples / elapsed,
+    }
+
+
+def bench_compile_load(hil, schematic, model_path, vhil_device):
+    """Uncached compile and load time of the demo model."""
+    t_start = time.perf_counter()
+    schematic.load(model_path)
+    schematic.compile()
+    t_compiled = time.perf_counter()
+    hil.load_model(file=schematic.get_compiled_model_file(model_path), vhil_device=vhil_device)
+    t_loaded = time.perf_counter()
+    return {"model.compile_s": t_compiled - t_start, "model.load_s": t_loaded - t_compiled}
+
+
+# Metrics where a larger value is better; all others are times (smaller is better)
+HIGHER_IS_BETTER = ("poll.rate_hz", "capture.samples_per_s")
+
+
+def compare(results, baseline, tolerance):
+    """List of (metric, value, baseline) for metrics worse than baseline by more than ``tolerance``."""
+    regressions = []
+    for key, value in results.items():
+        ref = baseline.get(key)
+        if ref is None or ref == 0:
+            continue
+        if key in HIGHER_IS_BETTER:
+            worse = value < ref * (1.0 - tolerance)
+        else:
+            worse = value > ref * (1.0 + tolerance)
+        if worse:
+            regressions.append((key, value, ref))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default=os.environ.get("HIL_BACKEND", "typhoon"), choices=["typhoon", "sim"])
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--calls", type=int, default=1000, help="calls per latency benchmark")
+    parser.add_argument("--poll-s", type=float, default=1.0, help="polling loop duration")
+    parser.add_argument("--capture-s", type=float, default=5.0, help="capture duration at 10 kHz")
+    parser.add_argument("--vhil", action="store_true", help="load the model on VHIL instead of a HIL device")
+    parser.add_argument("--skip-compile", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--baseline", default=None, help=f"baseline JSON (default {BASELINE_DIR}/<backend>.json)")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", default=None, help="write this run's results as JSON")
+    args = parser.parse_args(argv)
+
+    # The backend and the instrumentation are chosen at import time of hil_backend
+    os.environ["HIL_BACKEND"] = args.backend
+    os.environ["HIL_INSTRUMENT"] = "0"
+    sys.path.insert(0, os.path.abspath(TESTS_DIR))
+    import busbar_diff_fault_test as busbar
+    from api_handles import schematic_api
+    from hil_backend import capture, hil
+
+    results = {}
+    if not args.skip_compile:
+        results.update(bench_compile_load(hil, schematic_api(), args.model, args.vhil))
+    else:
+        hil.load_model(file=schematic_api().get_compiled_model_file(args.model), vhil_device=args.vhil)
+    hil.start_simulation()
+    try:
+        busbar.BusbarDiffTester().resolve_io()
+        results.update(bench_call_latency(busbar, args.calls))
+        results.update(bench_polling_loop(busbar, args.poll_s))
+        results.update(bench_capture(capture, args.capture_s))
+    finally:
+        hil.stop_simulation()
+
+    for key, value in results.items():
+        print(f"{key:32s} {value:14.3f}")
+
+    run = {"backend": args.backend, "timestamp": datetime.now().isoformat(timespec="seconds"), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(run, f, indent=2)
+
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f"{args.backend}.json")
+    if args.update_baseline or not os.path.exists(baseline_path):
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump(run, f, indent=2)
+        print(f"Baseline written: {baseline_path}")
+        return 0
+
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    for key, value, ref in regressions:
+        print(f"REGRESSION {key}: {value:.3f} (baseline {ref:.3f})")
+    print("OK" if not regressions else f"{len(regressions)} regression(s) vs {baseline_path}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,23 +1,19 @@
-from typhoon.api import hil
-from typhoon.api.schematic_editor import SchematicAPI
+import os
 import pytest
 import logging
+from datetime import datetime
 from pathlib import Path
-from typhoon.test import capture
-from typhoon.test import ranges
-import typhoon.test.signals as sig
+from busbar_faults import inject_bb_fault
+from device_pool import configure_model
+from endurance import EnduranceRun
+from hil_backend import capture, hil
+from model_cache import compile_cached
+from pps_monitor import monitor as monitor_pps
 
 
 logger = logging.getLogger(__name__)
-model = SchematicAPI()
 
 name = "model"
-dirpath = Path(__file__).parent
-model_path = str(dirpath / "digital-substation-demo.tse")
-
-compiled_model_path = model.get_compiled_model_file(model_path)
-
-logger = logging.getLogger(__name__)
 
 # script directory
 FILE_DIR_PATH = Path(__file__).parent
@@ -27,49 +23,43 @@ MODEL_NAME = "digital-substation-demo.tse"
 
 # path to schematic folder
 DIRECTORY_PATH = os.path.join(
-    FILE_DIR_PATH, "..", "..", "models"
+    FILE_DIR_PATH, "..", "models"
 )
 
 # path to model
 MODEL_PATH = os.path.join(DIRECTORY_PATH, MODEL_NAME)
 
-# compiled model path
-COMPILED_MODEL_PATH = model.get_compiled_model_file(MODEL_PATH)
+# maximum fault-to-trip time accepted for busbar faults
+RELAY_OPERATE_TIME_S = 0.1
+
+# PPS soak limits (10 kHz capture resolves edges to ~100 us)
+PPS_MAX_JITTER_S = 200e-6
+PPS_MAX_OFFSET_S = 200e-6
+PPS_MAX_DRIFT = 1e-6  # s/s
+
+# SCADA panel used with the model (part of the compile cache key)
+SCADA_PANEL_PATH = os.path.join(
+    FILE_DIR_PATH, "..", "scada", "digital-substation-demo.cus"
+)
+
+# hardware the model needs; checked by the device pool before leasing
+REQUIRED_DEVICES = ("HIL404", "HIL606")
+REQUIRED_CORES = 2
 
 @pytest.fixture(scope="module")
-def setup_function():
+def setup_function(schematic, hil_target):
+    model = schematic
     model.load(MODEL_PATH)
+    configure_model(model, hil_target)
+    logger.info(f"{hil_target.device} conf {hil_target.conf_id} ({hil_target.name}) is used")
 
-    # Detect connected hardware
-    try:
-        hw_settings = model.detect_hw_settings()
-        vhil_device = False
-        logger.info(f"{hw_settings[0]} {hw_settings[2]} device is used")
-    except Exception:
-        vhil_device = True
-
-    device, _, conf = model.get_hw_settings()
-    if device not in ("HIL404", "HIL606"):
-        pytest.skip(
-            "Skipped because they can run only on these machines HIL404 or HIL606"
-        )
-    dev_core = hil.get_device_features(
-        device=device, conf_id=conf, feature="Standard Processing Cores"
-    )
-    if dev_core < 2:
-        logger.info(
-            f"This test requires minimum {2} cores, current configuration has {dev_core} cores!"
-        )
-        pytest.skip("Device doesn't have required configuration to run the model")
-
-    model.compile()
-    hil.load_model(COMPILED_MODEL_PATH, vhil_device=vhil_device)
+    compiled = compile_cached(model, MODEL_PATH, extra_files=[SCADA_PANEL_PATH])
+    hil.load_model(compiled, vhil_device=hil_target.vhil)
     hil.start_simulation()    
 
-def trigger_bb_fault(setup_function):
+def trigger_bb_fault(setup_function, fault_select=11):
     # Fault:
-    fault_name = "FaultBB"
-    hil.set_scada_input_value(fault_name + '.Fault select', 11)
+    inject_bb_fault(fault_select)
 
     cap_data = capture.get_capture_results(wait_capture=True)
     #fault_time = sig.find(cap_data["Grid Fault1.enable_fb"], "above", 0.5, from_region="below", during=(0,5))
@@ -79,4 +69,47 @@ def trigger_bb_fault(setup_function):
     #logger.info(f"Circuit breaker trip occured at: {cb_time}")
     
     #reaction_time = cb_time - fault_time
-    #assert reaction_time <= Vreme_releja
\ No newline at end of file
+    #assert reaction_time <= Vreme_releja
+
+def test_bb_fault_endurance(setup_function):
+    """
+    Busbar fault soak test: fault every minute for ENDURANCE_HOURS (default 24),
+    captured in rolling windows streamed to disk. Each run writes to a new
+    timestamped directory; setting ENDURANCE_DIR to an earlier run's directory
+    resumes it from its last checkpoint (a completed or differently configured
+    run there is an error).
+    """
+    hours = float(os.environ.get("ENDURANCE_HOURS", "24"))
+    out_dir = os.environ.get("ENDURANCE_DIR") or os.path.join(
+        "test_artifacts", f"endurance_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    run = EnduranceRun(
+        out_dir,
+        signals=["Three-phase Meter1.IA"],
+        fault_signal="FaultBB.enable_fb",      # TODO: fault feedback signal of FaultBB
+        trip_signal="HV Bay 1.Digital Probe1", # CB probe, goes high when the breaker opens
+        duration_s=hours * 3600.0,
+        fault_select=11,
+    )
+    stats = run.run(log=logger.info)
+    logger.info(f"Endurance summary: {stats}")
+
+    assert stats["missed"] == 0, f"{stats['missed']} faults without trip"
+    assert stats["count"] == run.n_faults, f"{stats['count']} of {run.n_faults} faults tripped"
+    assert stats["max_s"] <= RELAY_OPERATE_TIME_S
+
+
+@pytest.mark.parametrize("signal", ["PTP", "Time Synch"])
+def test_pps_soak(setup_function, signal):
+    """
+    PPS quality over PPS_SOAK_HOURS (default 8, an overnight run): edge
+    jitter, offset to whole simulation seconds, drift and missed pulses,
+    captured in 60 s windows with constant memory.
+    """
+    hours = float(os.environ.get("PPS_SOAK_HOURS", "8"))
+    pps = monitor_pps(capture, hil, signal, hours * 3600.0, window_s=60.0, rate_hz=10000,
+                      reference=0.0, log=logger.info)
+    logger.info(f"{signal} soak summary: {pps.summary()}")
+
+    violations = pps.check(PPS_MAX_JITTER_S, PPS_MAX_OFFSET_S, max_drift_s_per_s=PPS_MAX_DRIFT,
+                           min_edges=int(hours * 3600 * 0.9))
+    assert not violations, f"{signal} out of spec: {violations}"
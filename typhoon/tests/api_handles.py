@@ -0,0 +1,21 @@
+"""
+Lazily created, process-wide Typhoon API handles.
+
+Creating a ``SchematicAPI`` starts the Schematic Editor API client, which is
+far too expensive to do at import (and therefore pytest collection) time.
+Test modules ask for the handle when a test actually needs it; the first
+call creates it and later calls reuse it for the rest of the process.
+"""
+from functools import lru_cache
+
+from hil_backend import is_simulated
+
+
+@lru_cache(maxsize=None)
+def schematic_api():
+    """Shared SchematicAPI instance, created on first use."""
+    if is_simulated():
+        from sim_backend import SimSchematic
+        return SimSchematic()
+    from typhoon.api.schematic_editor import SchematicAPI
+    return SchematicAPI()
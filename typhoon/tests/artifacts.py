@@ -0,0 +1,177 @@
+"""
+Columnar test artifact writer.
+
+``ArtifactWriter`` is a drop-in for ``csv.DictWriter`` in the busbar tests:
+rows go in through ``writerow(dict)``, are buffered per column and written as
+typed Arrow record batches, so floats stay floats on disk. Test metadata
+(fault type, CONFIG, timestamps) is stored in the file schema.
+
+Formats:
+- "parquet": compressed, best for archiving and dataset queries
+- "arrow":   Arrow IPC file, zero-copy when read back memory-mapped
+- "csv":     plain text export, metadata goes to a ``.meta.json`` sidecar
+
+With ``envelope`` (Parquet/Arrow only), min/max envelope levels of the
+numeric columns are built alongside the raw file while it is written; the
+first field is the time axis (see ``envelope.EnvelopeWriter``).
+"""
+import csv
+import json
+import os
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+METADATA_PREFIX = "hil."
+
+
+def artifact_path(directory, stem, fmt="parquet"):
+    return os.path.join(directory, stem + EXTENSIONS[fmt])
+
+
+def _encode_metadata(metadata):
+    return {
+        (METADATA_PREFIX + key).encode(): json.dumps(value, default=str).encode()
+        for key, value in (metadata or {}).items()
+    }
+
+
+def _decode_metadata(raw):
+    return {
+        key.decode()[len(METADATA_PREFIX):]: json.loads(value)
+        for key, value in (raw or {}).items()
+        if key.decode().startswith(METADATA_PREFIX)
+    }
+
+
+class ArtifactWriter:
+    """
+    Streaming row writer producing Parquet, Arrow IPC or CSV files.
+
+    Columns listed in ``string_fields`` are stored as strings, all others as
+    float64. Rows are buffered and written every ``batch_rows`` rows.
+    ``envelope`` is a tuple of decimation factors for min/max envelope levels.
+    """
+
+    def __init__(self, path, fieldnames, metadata=None, fmt="parquet", string_fields=("label",), batch_rows=4096,
+                 envelope=None):
+        if fmt not in EXTENSIONS:
+            raise ValueError(f"Unknown artifact format: {fmt!r}")
+        if envelope and fmt == "csv":
+            raise ValueError("Envelope levels need the parquet or arrow format")
+        self.path = path
+        self.fmt = fmt
+        self.fieldnames = list(fieldnames)
+        self.batch_rows = batch_rows
+        self.rows_written = 0
+        self.schema = pa.schema(
+            [pa.field(name, pa.string() if name in string_fields else pa.float64()) for name in self.fieldnames],
+            metadata=_encode_metadata(metadata),
+        )
+        self._columns = {name: [] for name in self.fieldnames}
+        self._pending = 0
+        self._envelope = None
+        if envelope:
+            from envelope import EnvelopeWriter
+
+            numeric = [name for name in self.fieldnames[1:] if name not in string_fields]
+            self._envelope = EnvelopeWriter(path, self.fieldnames[0], numeric, envelope, fmt, metadata)
+
+        if fmt == "parquet":
+            self._writer = pq.ParquetWriter(path, self.schema)
+        elif fmt == "arrow":
+            self._sink = pa.OSFile(path, "wb")
+            self._writer = pa.ipc.new_file(self._sink, self.schema)
+        else:
+            self._file = open(path, "w", newline="")
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+            self._writer.writeheader()
+            with open(path + ".meta.json", "w") as f:
+                json.dump(metadata or {}, f, indent=2, default=str)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def writeheader(self):
+        """Kept for csv.DictWriter compatibility; the header is written on open."""
+
+    def writerow(self, row):
+        if self.fmt == "csv":
+            self._writer.writerow(row)
+            self.rows_written += 1
+            return
+        for name in self.fieldnames:
+            self._columns[name].append(row.get(name))
+        self._pending += 1
+        if self._pending >= self.batch_rows:
+            self.flush()
+
+    def writerows(self, rows):
+        for row in rows:
+            self.writerow(row)
+
+    def write_columns(self, columns):
+        """Write a block of rows given as {name: sequence/ndarray} in one record batch."""
+        self.flush()
+        batch = pa.record_batch([pa.array(columns[f.name], type=f.type) for f in self.schema], schema=self.schema)
+        if self.fmt == "csv":
+            self.writerows(batch.to_pylist())
+            return
+        self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        self._writer.write_batch(batch)
+        self.rows_written += batch.num_rows
+        if self._envelope is not None:
+            self._envelope.write_columns({
+                name: batch.column(name).to_numpy(zero_copy_only=False)
+                for name in [self.fieldnames[0]] + self._envelope.columns
+            })
+
+    def flush(self):
+        if self.fmt == "csv":
+            self._file.flush()
+            return
+        if not self._pending:
+            return
+        batch = pa.record_batch(
+            [pa.array(self._columns[f.name], type=f.type) for f in self.schema], schema=self.schema
+        )
+        self._write_batch(batch)
+        self._columns = {name: [] for name in self.fieldnames}
+        self._pending = 0
+
+    def close(self):
+        self.flush()
+        if self.fmt == "csv":
+            self._file.close()
+        else:
+            self._writer.close()
+            if self.fmt == "arrow":
+                self._sink.close()
+            if self._envelope is not None:
+                self._envelope.close()
+
+
+def read_artifact(path) -> pa.Table:
+    """Read an artifact back as an Arrow table (memory-mapped for Parquet/Arrow files)."""
+    if path.endswith(".arrow"):
+        return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    if path.endswith(".parquet"):
+        return pq.read_table(path, memory_map=True)
+    return pa_csv.read_csv(path)
+
+
+def read_artifact_metadata(path) -> dict:
+    """Test metadata stored with an artifact."""
+    if path.endswith(".arrow"):
+        return _decode_metadata(pa.ipc.open_file(pa.memory_map(path, "r")).schema.metadata)
+    if path.endswith(".parquet"):
+        return _decode_metadata(pq.read_schema(path).metadata)
+    with open(path + ".meta.json") as f:
+        return json.load(f)
@@ -0,0 +1,115 @@
+"""
+Known substation state, restored between tests without reloading the model.
+
+``Baseline.capture()`` (typically right after ``start_simulation``) records
+
+- every SCADA input, contactor, digital input and model parameter written
+  so far (from the ``hil_backend.journal``)
+- the breaker/disconnector positions of all bays (``station_snapshot``)
+
+``restore()`` then undoes whatever a test did: inputs written since the
+capture are set back to their baseline value (or the input default, see
+``DEFAULTS``), and bays whose switchgear moved are switched back with
+``run_switching`` in interlocking order. Only what differs is written, so
+restoring an untouched substation costs one probe snapshot.
+
+Parameters first set after the capture have no known baseline value; pass
+them to ``capture(parameters=...)`` or ``restore`` raises RuntimeError.
+"""
+import logging
+
+from hil_backend import hil, journal
+from substation_state import diff_state, station_snapshot
+from switching import BAYS, SwitchCommand, run_switching
+
+logger = logging.getLogger(__name__)
+
+# Value of an input that was never written since the model was loaded
+DEFAULTS = {
+    "set_scada_input_value": {"value": 0},
+    "set_digital_input_value": {"value": 0},
+    # hand the contactor back to the model
+    "set_contactor": {"swControl": False, "swState": False},
+}
+
+# (open column, closed column) of each disconnector in STATE_COLUMNS
+_DISCONNECTORS = {"DC1": (1, 2), "DC2": (3, 4)}
+
+
+def restore_commands(actual, baseline, bays=BAYS):
+    """SwitchCommands that bring ``actual`` positions back to ``baseline`` (state matrices)."""
+    commands = []
+    for i, bay in enumerate(bays):
+        moves = []
+        for dc, (open_col, closed_col) in _DISCONNECTORS.items():
+            if baseline[i, closed_col] and not actual[i, closed_col]:
+                moves.append(SwitchCommand(bay, dc, "On"))
+            elif baseline[i, open_col] and not actual[i, open_col]:
+                moves.append(SwitchCommand(bay, dc, "Off"))
+        # Disconnectors only move with the breaker open
+        if actual[i, 0] and (moves or not baseline[i, 0]):
+            commands.append(SwitchCommand(bay, "CB", "Off"))
+        commands += moves
+        if baseline[i, 0] and (moves or not actual[i, 0]):
+            commands.append(SwitchCommand(bay, "CB", "On"))
+    return commands
+
+
+class Baseline:
+    """Snapshot of input values and switchgear positions; see the module docstring."""
+
+    def __init__(self, inputs, state, bays=BAYS, settle_ms=250):
+        self.inputs = inputs
+        self.state = state
+        self.bays = list(bays)
+        self.settle_ms = settle_ms
+
+    @classmethod
+    def capture(cls, bays=BAYS, parameters=None, settle_ms=250):
+        """
+        Record the current state. ``parameters`` maps (component path, parameter
+        name) to the value to restore for parameters not written yet.
+        """
+        inputs = journal.snapshot()
+        for (path, param), value in (parameters or {}).items():
+            key, value = journal.entry("set_parameter_value", path, param, value)
+            inputs.setdefault(key, value)
+        return cls(inputs, station_snapshot(bays), bays, settle_ms)
+
+    def _input_value(self, key):
+        if key in self.inputs:
+            return self.inputs[key]
+        name, target = key
+        if name not in DEFAULTS:
+            raise RuntimeError(f"No baseline value for {name}{dict(target)}; "
+                               f"pass it to Baseline.capture(parameters=...)")
+        return tuple(DEFAULTS[name].items())
+
+    def restore_inputs(self):
+        """Write back every input that differs from the baseline; returns the keys written."""
+        changed = [(key, value) for key, value in journal.snapshot().items() if value != self._input_value(key)]
+        for (name, target), _ in changed:
+            getattr(hil, name)(**dict(target), **dict(self._input_value((name, target))))
+        return [key for key, _ in changed]
+
+    def restore_positions(self):
+        """Switch bays back to the baseline positions; returns the commands run."""
+        commands = restore_commands(station_snapshot(self.bays), self.state, self.bays)
+        if commands:
+            run_switching(commands, settle_ms=self.settle_ms)
+        return commands
+
+    def restore(self):
+        """
+        Put inputs and switchgear back to the baseline; raises RuntimeError if
+        the positions do not match afterwards (e.g. a relay blocks closing).
+        """
+        # Inputs first: clears faults and stuck pulses before switching
+        inputs = self.restore_inputs()
+        commands = self.restore_positions()
+        mismatches = diff_state(station_snapshot(self.bays), self.state, self.bays)
+        if mismatches:
+            raise RuntimeError(f"Baseline not restored (bay, device, actual, expected): {mismatches}")
+        if inputs or commands:
+            logger.info(f"Restored baseline: {len(inputs)} inputs, {len(commands)} switching commands")
+        return inputs, commands
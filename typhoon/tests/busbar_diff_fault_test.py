@@ -7,9 +7,10 @@ What this gives you
 -------------------
 - Start/stop simulation flow
 - Arms your IED (or logic) and timestamps pickup/trip
+  (host polling, or sample-accurate from a triggered capture)
 - Injects an INTERNAL busbar fault (3φ bolted by default) and checks trip & time
 - Injects an EXTERNAL fault (on a feeder) and checks for NO-TRIP / stability
-- Captures waveforms (optional) and saves a CSV
+- Captures waveforms (optional) and saves them as Parquet/Arrow (or CSV)
 - Emits a simple pass/fail summary
 
 How to use
@@ -30,18 +31,29 @@ Notes:
   and set them via set_parameter or digital input as shown.
 """
 import time
-import csv
 import os
 from datetime import datetime
 
 # ===== Typhoon HIL API =====
 try:
-    # Newer API location
-    from typhoon.api.hil import hil
-    from typhoon.api.tlc import tlc
+    # Newer API location (or the offline simulator with HIL_BACKEND=sim)
+    from hil_backend import capture, hil
 except Exception:
     # Older API fallback (adjust if needed)
     from typhoonhild import hil  # type: ignore
+    capture = None
+
+from api_handles import schematic_api
+from artifacts import ArtifactWriter, artifact_path
+from busbar_analytics import analyze_capture, bay_current_signals, summarize
+from capture_timing import fault_response_times
+from hil_instrumentation import STATS
+from io_registry import IORegistry
+from model_cache import compile_cached
+from point_on_wave import inception_time
+from results_store import ResultsStore, busbar_rows, model_version
+from signal_sampler import SignalSampler
+from telemetry import publisher
 
 # =========================
 # ======= CONFIG =========
@@ -50,6 +62,8 @@ CONFIG = {
     # --- Model paths ---
     "model_path": r"CHANGE_ME/my_busbar_model.tse",            # TODO
     "compiled_model_path": r"CHANGE_ME/my_busbar_model.tse",   # or .tse/.rpc depending on your flow
+    "scada_panel_path": None,           # optional .cus panel; part of the compile cache key
+    "model_cache_dir": None,            # shared compiled-model cache (default: $HIL_MODEL_CACHE_DIR or ~/.cache)
 
     # --- Simulation setup ---
     "simulation_duration_s": 2.0,
@@ -57,12 +71,25 @@ CONFIG = {
     "fault_duration_s": 0.20,      # how long to leave fault applied (internal)
     "postfault_time_s": 0.20,      # time after clearing for assertions
     "rated_frequency_hz": 60.0,
+    # Point-on-wave fault inception: faults are scheduled (executeAt) at this
+    # phase A voltage angle, so the DC offset is the same in every run.
+    # None applies the fault immediately from the host (random angle).
+    "fault_inception_deg": None,
+    "fault_reference_angle_deg": 0.0,   # phase A voltage angle at simulation time 0
+    "fault_schedule_lead_s": 0.02,      # minimum time between scheduling and inception
 
     # --- Protection expectations ---
     "expect_pickup_in_s": 0.010,   # pickup by differential within 10 ms (example)
     "expect_trip_in_s": 0.040,     # trip within 40 ms (example)
     "stability_window_s": 0.250,   # for external fault: must NOT trip for this long
 
+    # --- Pickup/trip timing ---
+    # "poll":    poll the outputs from Python every 1 ms (includes host jitter + API round-trip)
+    # "capture": arm a capture triggered on the fault-enable signal and time pickup/trip
+    #            from the captured samples (sub-sample interpolation)
+    "timing_mode": "poll",
+    "timing_capture_rate_hz": 100000.0,
+
     # --- I/O mappings (adapt to your model or GPI/O wiring) ---
     # Use either model signals or physical DI/DO names exposed via HIL configuration.
     "arm_input_name": "DI_ARM",        # TODO: digital input (to arm relay/logic) or model signal
@@ -72,11 +99,20 @@ CONFIG = {
     # --- Measured signals (optional, for extra checks/records) ---
     "meas_currents": ["Ia_bus", "Ib_bus", "Ic_bus"],  # TODO: model analog signal names
     "meas_voltages": ["Va_bus", "Vb_bus", "Vc_bus"],  # TODO
+    # Continuous background sampling of the signals above into a ring buffer;
+    # checkpoint labels become event markers on that timeline
+    "background_sampler": False,
+    "sampler_rate_hz": 200.0,
+    "sampler_capacity": 100000,
 
     # --- Fault control (choose one style and comment the other) ---
     # Option A) Digital inputs that enable faults inside the model
     "internal_fault_di": "DI_FAULT_INTERNAL",  # TODO
     "external_fault_di": "DI_FAULT_EXTERNAL",  # TODO
+    # Signals captured as fault-enable reference in "capture" timing mode
+    # (default to the fault DIs above; set explicitly when using Option B)
+    "internal_fault_signal": None,
+    "external_fault_signal": None,
 
     # Option B) Direct parameter writes to built-in Fault components
     # "internal_fault_component": r"Grid/BusbarFault",      # example path in model tree
@@ -86,8 +122,19 @@ CONFIG = {
     # "fault_param_x_f": "Xfault",
     # "fault_impedance": (0.001, 0.0),                      # R, X for bolted fault
     # --- Capture ---
-    "capture_csv": True,
+    "capture_artifacts": True,
+    "capture_format": "parquet",   # "parquet", "arrow" (memory-mappable IPC) or "csv"
     "capture_dir": "test_artifacts",
+    # Differential/restraint analytics ("capture" timing mode): bays whose
+    # <bay>.IA/IB/IC currents are captured with the fault (None = off), and
+    # the dual-slope characteristic (see busbar_analytics.DEFAULT_CHARACTERISTIC)
+    "analytics_bays": None,            # e.g. ["HV Bay 1"] + [f"Bay {i}" for i in range(1, 11)]
+    "diff_characteristic": None,
+    # HIL API call counts/latencies of the run, saved as JSON and Prometheus text
+    "call_stats": True,
+    # Results of every run are appended to this dataset for cross-run queries
+    # (see results_store.py; None = off)
+    "results_store": os.path.join("test_artifacts", "results"),
 }
 
 
@@ -104,38 +151,70 @@ def now_str():
 
 def sleep_s(sec):
     # Small helper that can be intercepted if you want to sync to grid periods later
+    # (fault inception itself is synchronised via CONFIG["fault_inception_deg"])
     time.sleep(sec)
 
 
-def set_di(name, value: int):
-    """Set digital input or model boolean signal."""
+def wait_sim_time(t_sim):
+    """Block until the simulation time reaches ``t_sim``."""
+    remaining = t_sim - hil.get_sim_time()
+    if remaining > 0:
+        hil.wait_msec(remaining * 1000.0)
+
+
+# Pre-resolved I/O accessors, built in BusbarDiffTester.load_and_start()
+IO = None
+
+
+def set_di(name, value: int, execute_at=None):
+    """Set digital input or model boolean signal, optionally at simulation time ``execute_at``."""
+    kwargs = {} if execute_at is None else {"executeAt": execute_at}
+    writer = IO.writer(name) if IO else None
+    if writer:
+        writer(value, **kwargs)
+        return
     try:
-        hil.set_digital_input_value(name, value)
+        hil.set_digital_input_value(name, value, **kwargs)
     except Exception:
+        if kwargs:
+            raise
         # Fallback if your model exposes this as a top-level parameter/signal
         hil.set_signal_value(name, float(value))
 
 
 def get_do(name) -> int:
     """Read digital output or model boolean signal."""
+    reader = IO.reader(name) if IO else None
+    if reader:
+        return reader()
     try:
         return int(hil.get_digital_output_value(name))
     except Exception:
         return int(hil.get_signal_value(name) > 0.5)
 
 
+def do_reader(name):
+    """Callable reading digital output ``name``, bound once for use in polling loops."""
+    reader = IO.reader(name) if IO else None
+    return reader or (lambda: get_do(name))
+
+
 def get_signal(name) -> float:
     """Read analog value."""
+    reader = IO.analog(name) if IO else None
+    if reader:
+        return reader()
     return float(hil.get_signal_value(name))
 
 
-def set_fault_di(di_name: str, on: bool):
-    set_di(di_name, 1 if on else 0)
+def set_fault_di(di_name: str, on: bool, execute_at=None):
+    set_di(di_name, 1 if on else 0, execute_at)
 
 
-def set_fault_component(path: str, enable: bool):
+def set_fault_component(path: str, enable: bool, execute_at=None):
     # Example for parameter-based control; adjust param names in CONFIG if using this mode.
-    hil.set_parameter_value(path, CONFIG.get("fault_param_enable", "enabled"), 1 if enable else 0)
+    # The impedance is written first, so a scheduled enable picks it up.
+    kwargs = {} if execute_at is None else {"executeAt": execute_at}
     if enable and ("fault_param_r_f" in CONFIG or "fault_param_x_f" in CONFIG):
         r = CONFIG.get("fault_impedance", (0.001, 0.0))[0]
         x = CONFIG.get("fault_impedance", (0.001, 0.0))[1]
@@ -143,9 +222,34 @@ def set_fault_component(path: str, enable: bool):
             hil.set_parameter_value(path, CONFIG["fault_param_r_f"], r)
         if "fault_param_x_f" in CONFIG:
             hil.set_parameter_value(path, CONFIG["fault_param_x_f"], x)
-
-
-def capture_row(writer, t0, label):
+    hil.set_parameter_value(path, CONFIG.get("fault_param_enable", "enabled"), 1 if enable else 0, **kwargs)
+
+
+def open_artifact(fault_type):
+    """Artifact writer for one test run; fault type, CONFIG and start time go into the file schema."""
+    fmt = CONFIG.get("capture_format", "parquet")
+    path = artifact_path(CONFIG["capture_dir"], f"{fault_type}_fault_{now_str()}", fmt)
+    fieldnames = ["t_since_start_s", "label"] + CONFIG["meas_currents"] + CONFIG["meas_voltages"]
+    metadata = {"fault_type": fault_type, "config": CONFIG, "started_at": datetime.now().isoformat()}
+    return ArtifactWriter(path, fieldnames, metadata=metadata, fmt=fmt)
+
+
+def make_sampler():
+    """Background sampler for meas_currents/meas_voltages, or None if disabled."""
+    if not CONFIG.get("background_sampler"):
+        return None
+    return SignalSampler(
+        CONFIG["meas_currents"] + CONFIG["meas_voltages"],
+        rate_hz=CONFIG["sampler_rate_hz"],
+        capacity=CONFIG["sampler_capacity"],
+        hil=hil,
+    )
+
+
+def capture_row(writer, t0, label, sampler=None):
+    if sampler is not None:
+        sampler.mark(label)
+        return
     row = {
         "t_since_start_s": time.perf_counter() - t0,
         "label": label,
@@ -166,17 +270,34 @@ class BusbarDiffTester:
         self.results = []
         self.t_trip_internal = None
         self.t_pickup_internal = None
+        self.device = None
 
     def load_and_start(self):
         print("Loading and starting simulation...")
+        STATS.reset()
         model_path = CONFIG["compiled_model_path"] or CONFIG["model_path"]
         if model_path.lower().endswith(".tse"):
-            hil.load_model(model_path)
-            hil.compile_model()  # compile on the fly
+            # Compile on the fly, reusing a cached build when nothing changed
+            schematic = schematic_api()
+            schematic.load(model_path)
+            self.device = schematic.get_hw_settings()[0]
+            compiled = compile_cached(
+                schematic,
+                model_path,
+                extra_files=[CONFIG.get("scada_panel_path")],
+                cache_dir=CONFIG.get("model_cache_dir"),
+            )
+            hil.load_model(compiled)
         else:
             hil.load_model(model_path)
         hil.start_simulation()
         print("Simulation started.")
+        self.resolve_io()
+
+    def resolve_io(self):
+        """Resolve every configured I/O name once; fails fast on unknown names."""
+        global IO
+        IO = IORegistry.from_config(hil, CONFIG)
 
     def stop_and_unload(self):
         print("Stopping simulation...")
@@ -195,81 +316,160 @@ class BusbarDiffTester:
         sleep_s(0.05)
 
     def wait_for_pickup_or_trip(self, t0, pickup_name=None, trip_name=None, timeout=0.5):
+        read_pickup = do_reader(pickup_name) if pickup_name else None
+        read_trip = do_reader(trip_name) if trip_name else None
         t_start = time.perf_counter()
         t_pickup = None
         t_trip = None
         while (time.perf_counter() - t_start) < timeout:
-            if pickup_name:
-                if get_do(pickup_name):
-                    t_pickup = time.perf_counter()
-            if trip_name and get_do(trip_name):
+            if read_pickup and t_pickup is None and read_pickup():
+                t_pickup = time.perf_counter()
+            if read_trip and read_trip():
                 t_trip = time.perf_counter()
                 break
             time.sleep(0.001)  # 1 ms poll
         return t_pickup, t_trip
 
-    def apply_internal_fault(self, on: bool):
+    def capture_fault_response(self, apply_fault, fault_signal, pickup_name=None, trip_name=None, window_s=0.5):
+        """Arm a capture triggered on the fault signal, apply the fault and time pickup/trip from samples."""
+        if capture is None:
+            raise RuntimeError("Capture timing mode requires typhoon.test.capture.")
+        if not fault_signal:
+            raise RuntimeError("No fault signal configured for capture timing mode.")
+        signals = [s for s in (fault_signal, pickup_name, trip_name) if s]
+        analytics_bays = CONFIG.get("analytics_bays")
+        if analytics_bays:
+            signals += bay_current_signals(analytics_bays)
+        capture.start_capture(
+            window_s,
+            rate=CONFIG["timing_capture_rate_hz"],
+            signals=signals,
+            trigger_source=fault_signal,
+            trigger_threshold=0.5,
+            trigger_edge="Rising edge",
+        )
+        self.schedule_fault(apply_fault)
+        cap_data = capture.get_capture_results(wait_capture=True)
+        publisher().publish_frame("busbar", cap_data, fault_signal=fault_signal)
+        response = fault_response_times(cap_data, fault_signal, pickup_name, trip_name)
+        response["analytics"] = None
+        if analytics_bays:
+            result = analyze_capture(
+                cap_data, analytics_bays, CONFIG["rated_frequency_hz"], CONFIG.get("diff_characteristic")
+            )
+            response["analytics"] = summarize(result, t_from=response["t_fault"])
+            if response["t_fault"] is not None and response["analytics"]["first_operate_s"] is not None:
+                response["analytics"]["operate_s"] = response["analytics"]["first_operate_s"] - response["t_fault"]
+        return response
+
+    def schedule_fault(self, apply_fault):
+        """
+        Apply a fault at the configured point on wave.
+
+        Returns the simulation time of inception, or None when the fault was
+        applied immediately (``fault_inception_deg`` is None).
+        """
+        angle = CONFIG.get("fault_inception_deg")
+        fault = apply_fault.__name__[len("apply_"):]
+        if angle is None:
+            apply_fault(True)
+            publisher().event("fault", fault=fault)
+            return None
+        t_at = inception_time(
+            hil.get_sim_time(),
+            angle,
+            CONFIG["rated_frequency_hz"],
+            reference_deg=CONFIG.get("fault_reference_angle_deg", 0.0),
+            lead_s=CONFIG.get("fault_schedule_lead_s", 0.02),
+        )
+        apply_fault(True, execute_at=t_at)
+        publisher().event("fault", fault=fault, inception_deg=angle, t_sim=t_at)
+        return t_at
+
+    def apply_internal_fault(self, on: bool, execute_at=None):
         if "internal_fault_di" in CONFIG and CONFIG["internal_fault_di"]:
-            set_fault_di(CONFIG["internal_fault_di"], on)
+            set_fault_di(CONFIG["internal_fault_di"], on, execute_at)
         elif "internal_fault_component" in CONFIG:
-            set_fault_component(CONFIG["internal_fault_component"], on)
+            set_fault_component(CONFIG["internal_fault_component"], on, execute_at)
         else:
             raise RuntimeError("No internal fault control configured.")
 
-    def apply_external_fault(self, on: bool):
+    def apply_external_fault(self, on: bool, execute_at=None):
         if "external_fault_di" in CONFIG and CONFIG["external_fault_di"]:
-            set_fault_di(CONFIG["external_fault_di"], on)
+            set_fault_di(CONFIG["external_fault_di"], on, execute_at)
         elif "external_fault_component" in CONFIG:
-            set_fault_component(CONFIG["external_fault_component"], on)
+            set_fault_component(CONFIG["external_fault_component"], on, execute_at)
         else:
             raise RuntimeError("No external fault control configured.")
 
     def run_internal_fault_test(self):
         print("\n=== INTERNAL BUSBAR FAULT TEST ===")
         ensure_capture_dir()
-        csv_path = os.path.join(CONFIG["capture_dir"], f"internal_fault_{now_str()}.csv")
         pickup_name = CONFIG.get("pickup_output_name")
         trip_name = CONFIG.get("trip_output_name")
 
-        with open(csv_path, "w", newline="") as f:
-            fieldnames = ["t_since_start_s", "label"] + CONFIG["meas_currents"] + CONFIG["meas_voltages"]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+        with open_artifact("internal") as writer:
 
+            sampler = make_sampler()
             t0 = time.perf_counter()
-            capture_row(writer, t0, "start")
+            if sampler:
+                sampler.start(t0)
+            capture_row(writer, t0, "start", sampler)
 
             # Prefault
             sleep_s(CONFIG["prefault_time_s"])
-            capture_row(writer, t0, "prefault")
+            capture_row(writer, t0, "prefault", sampler)
 
-            # Apply internal 3φ fault
+            # Apply internal 3φ fault and observe pickup/trip
             print("Applying internal fault...")
-            self.apply_internal_fault(True)
-            t_fault = time.perf_counter()
-
-            # Observe pickup/trip
-            t_pickup, t_trip = self.wait_for_pickup_or_trip(
-                t_fault,
-                pickup_name=pickup_name,
-                trip_name=trip_name,
-                timeout=max(CONFIG["expect_trip_in_s"] * 2.0, 0.5),
-            )
-
-            if t_pickup:
-                self.t_pickup_internal = t_pickup - t_fault
-            if t_trip:
-                self.t_trip_internal = t_trip - t_fault
-
-            capture_row(writer, t0, "fault_applied")
+            timeout = max(CONFIG["expect_trip_in_s"] * 2.0, 0.5)
+            if CONFIG.get("timing_mode") == "capture":
+                response = self.capture_fault_response(
+                    self.apply_internal_fault,
+                    CONFIG.get("internal_fault_signal") or CONFIG.get("internal_fault_di"),
+                    pickup_name=pickup_name,
+                    trip_name=trip_name,
+                    window_s=timeout,
+                )
+                self.t_pickup_internal = response["pickup_s"]
+                self.t_trip_internal = response["trip_s"]
+                analytics = response["analytics"]
+            else:
+                analytics = None
+                t_at = self.schedule_fault(self.apply_internal_fault)
+                if t_at is not None:
+                    wait_sim_time(t_at)
+                t_fault = time.perf_counter()
+
+                t_pickup, t_trip = self.wait_for_pickup_or_trip(
+                    t_fault,
+                    pickup_name=pickup_name,
+                    trip_name=trip_name,
+                    timeout=timeout,
+                )
+
+                if t_pickup:
+                    self.t_pickup_internal = t_pickup - t_fault
+                if t_trip:
+                    self.t_trip_internal = t_trip - t_fault
+
+            telemetry = publisher()
+            if self.t_pickup_internal is not None:
+                telemetry.event("pickup", test="internal", t_s=self.t_pickup_internal)
+            if self.t_trip_internal is not None:
+                telemetry.event("trip", test="internal", t_s=self.t_trip_internal)
+            capture_row(writer, t0, "fault_applied", sampler)
             sleep_s(CONFIG["fault_duration_s"])
 
             # Clear fault
             print("Clearing internal fault...")
             self.apply_internal_fault(False)
-            capture_row(writer, t0, "fault_cleared")
+            capture_row(writer, t0, "fault_cleared", sampler)
 
             sleep_s(CONFIG["postfault_time_s"])
+            if sampler:
+                sampler.stop()
+                writer.write_columns(sampler.to_columns())
 
         # Assertions
         passed = True
@@ -295,65 +495,110 @@ class BusbarDiffTester:
             else:
                 messages.append(f"Trip OK: {self.t_trip_internal*1000:.1f} ms")
 
-        self.results.append({
+        if analytics is not None:
+            if analytics.get("operate_s") is None:
+                passed = False
+                messages.append(
+                    f"Differential never in operate zone (Id max {analytics['i_diff_max']:.1f}, "
+                    f"threshold {analytics['threshold_at_max']:.1f})."
+                )
+            else:
+                messages.append(
+                    f"Differential operate zone after {analytics['operate_s']*1000:.1f} ms "
+                    f"(Id max {analytics['i_diff_max']:.1f} at Ir {analytics['i_restraint_at_max']:.1f})"
+                )
+
+        self.add_result({
             "test": "Internal busbar fault",
             "passed": passed,
             "details": "; ".join(messages),
             "pickup_ms": None if self.t_pickup_internal is None else self.t_pickup_internal * 1000.0,
             "trip_ms": None if self.t_trip_internal is None else self.t_trip_internal * 1000.0,
-            "csv": csv_path if CONFIG["capture_csv"] else None,
+            "inception_deg": CONFIG.get("fault_inception_deg"),
+            "analytics": analytics,
+            "artifact": writer.path if CONFIG["capture_artifacts"] else None,
         })
         print("\n".join(messages))
-        print(f"CSV: {csv_path}")
+        print(f"Data: {writer.path}")
 
     def run_external_fault_test(self):
         print("\n=== EXTERNAL FAULT (STABILITY) TEST ===")
         ensure_capture_dir()
-        csv_path = os.path.join(CONFIG["capture_dir"], f"external_fault_{now_str()}.csv")
         trip_name = CONFIG.get("trip_output_name")
 
-        with open(csv_path, "w", newline="") as f:
-            fieldnames = ["t_since_start_s", "label"] + CONFIG["meas_currents"] + CONFIG["meas_voltages"]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+        with open_artifact("external") as writer:
 
+            sampler = make_sampler()
             t0 = time.perf_counter()
-            capture_row(writer, t0, "start")
+            if sampler:
+                sampler.start(t0)
+            capture_row(writer, t0, "start", sampler)
 
             # Prefault
             sleep_s(CONFIG["prefault_time_s"])
-            capture_row(writer, t0, "prefault")
+            capture_row(writer, t0, "prefault", sampler)
 
             print("Applying external fault...")
-            self.apply_external_fault(True)
-            t_fault = time.perf_counter()
-
-            tripped = False
-            t_start = time.perf_counter()
-            while (time.perf_counter() - t_start) < CONFIG["stability_window_s"]:
-                if trip_name and get_do(trip_name):
-                    tripped = True
-                    break
-                time.sleep(0.001)
-
-            capture_row(writer, t0, "external_fault_window_done")
+            if CONFIG.get("timing_mode") == "capture":
+                response = self.capture_fault_response(
+                    self.apply_external_fault,
+                    CONFIG.get("external_fault_signal") or CONFIG.get("external_fault_di"),
+                    trip_name=trip_name,
+                    window_s=CONFIG["stability_window_s"],
+                )
+                tripped = response["trip_s"] is not None
+                analytics = response["analytics"]
+            else:
+                analytics = None
+                t_at = self.schedule_fault(self.apply_external_fault)
+                if t_at is not None:
+                    wait_sim_time(t_at)
+                t_fault = time.perf_counter()
+
+                read_trip = do_reader(trip_name) if trip_name else None
+                tripped = False
+                t_start = time.perf_counter()
+                while (time.perf_counter() - t_start) < CONFIG["stability_window_s"]:
+                    if read_trip and read_trip():
+                        tripped = True
+                        break
+                    time.sleep(0.001)
+
+            if tripped:
+                publisher().event("trip", test="external")
+            capture_row(writer, t0, "external_fault_window_done", sampler)
 
             print("Clearing external fault...")
             self.apply_external_fault(False)
-            capture_row(writer, t0, "fault_cleared")
+            capture_row(writer, t0, "fault_cleared", sampler)
 
             sleep_s(CONFIG["postfault_time_s"])
+            if sampler:
+                sampler.stop()
+                writer.write_columns(sampler.to_columns())
 
         passed = not tripped
         details = "Stable (no trip) during external fault window." if passed else "FAILED: Relay tripped for external fault."
-        self.results.append({
+        if analytics is not None and analytics["first_operate_s"] is not None:
+            passed = False
+            details += (
+                f" FAILED: Differential in operate zone for external fault "
+                f"(Id max {analytics['i_diff_max']:.1f}, threshold {analytics['threshold_at_max']:.1f})."
+            )
+        self.add_result({
             "test": "External fault stability",
             "passed": passed,
             "details": details,
-            "csv": csv_path if CONFIG["capture_csv"] else None,
+            "inception_deg": CONFIG.get("fault_inception_deg"),
+            "analytics": analytics,
+            "artifact": writer.path if CONFIG["capture_artifacts"] else None,
         })
         print(details)
-        print(f"CSV: {csv_path}")
+        print(f"Data: {writer.path}")
+
+    def add_result(self, result):
+        self.results.append(result)
+        publisher().event("result", **result)
 
     def summary(self):
         print("\n================= SUMMARY =================")
@@ -368,11 +613,37 @@ class BusbarDiffTester:
             if r.get("trip_ms") is not None:
                 line += f" | trip={r['trip_ms']:.1f} ms"
             print(line)
-            if r.get("csv"):
-                print(f"  data: {r['csv']}")
+            if r.get("artifact"):
+                print(f"  data: {r['artifact']}")
         print("==========================================")
+        if CONFIG.get("call_stats") and STATS.summary()["functions"]:
+            self.save_call_stats()
+        if CONFIG.get("results_store"):
+            self.store_results()
         return 0 if not any_fail else 1
 
+    def store_results(self):
+        """Append this run's results to the cross-run results store."""
+        store = ResultsStore(CONFIG["results_store"])
+        run_id = store.append(
+            busbar_rows(self.results),
+            source="busbar_diff",
+            device=self.device,
+            model_version=model_version(CONFIG["model_path"], [CONFIG.get("scada_panel_path")]),
+        )
+        if run_id:
+            print(f"  results: {store.root} (run {run_id})")
+
+    def save_call_stats(self):
+        """Print and save the HIL API call statistics of this run."""
+        print("\nHIL API calls (by total time):")
+        print(STATS.format_table())
+        ensure_capture_dir()
+        stem = os.path.join(CONFIG["capture_dir"], f"hil_calls_{now_str()}")
+        STATS.to_json(stem + ".json", results=self.results)
+        STATS.to_prometheus(stem + ".prom", labels={"run": "busbar_diff"})
+        print(f"  stats: {stem}.json, {stem}.prom")
+
 
 def main():
     tester = BusbarDiffTester()
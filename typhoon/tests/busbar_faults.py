@@ -0,0 +1,27 @@
+"""
+Busbar fault injection through the FaultBB component of the substation model.
+
+Shared by the fault campaign, the endurance runs and the scenario compiler,
+so none of them has to import another just for the fault signal names.
+"""
+from hil_backend import hil
+
+FAULT_CONFIG = {
+    "fault_select_input": "FaultBB.Fault select",   # SCADA input selecting the fault type (0 = no fault)
+    "fault_component": "FaultBB",                   # component holding the fault impedance parameters
+    "fault_param_r_f": "Rfault",
+    "fault_param_x_f": "Xfault",
+    "fault_signal": "FaultBB.enable_fb",            # TODO: captured fault-enable feedback
+}
+
+
+def inject_bb_fault(fault_select, execute_at=None):
+    """Select a busbar fault type on the FaultBB component (0 clears the fault)."""
+    kwargs = {} if execute_at is None else {"executeAt": execute_at}
+    hil.set_scada_input_value(FAULT_CONFIG["fault_select_input"], fault_select, **kwargs)
+
+
+def set_fault_impedance(impedance):
+    r, x = impedance
+    hil.set_parameter_value(FAULT_CONFIG["fault_component"], FAULT_CONFIG["fault_param_r_f"], r)
+    hil.set_parameter_value(FAULT_CONFIG["fault_component"], FAULT_CONFIG["fault_param_x_f"], x)
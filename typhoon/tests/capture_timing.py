@@ -0,0 +1,85 @@
+"""
+Sample-accurate event timing from HIL captures.
+
+Instead of polling outputs from Python (which adds scheduling jitter and API
+round-trip time to every measurement), arm a capture on the fault-enable
+signal together with the pickup/trip outputs and read the latencies straight
+from the captured samples. Threshold crossings are linearly interpolated
+between neighbouring samples, so the resolution is better than one sample
+period.
+"""
+import numpy as np
+
+
+def index_seconds(data) -> np.ndarray:
+    """Return the index of a captured Series/DataFrame as float seconds."""
+    index = data.index
+    if hasattr(index, "total_seconds"):
+        # TimedeltaIndex, as returned by typhoon.test.capture
+        return np.asarray(index.total_seconds(), dtype=float)
+    return np.asarray(index, dtype=float)
+
+
+def first_crossing(t, x, threshold=0.5, edge="rising", t_from=None):
+    """
+    Time of the first crossing of ``threshold`` in ``x`` at or after ``t_from``.
+
+    ``edge`` is "rising" or "falling". The crossing instant is interpolated
+    linearly between the last sample before and the first sample after the
+    threshold. Returns None if there is no such crossing.
+    """
+    t = np.asarray(t, dtype=float)
+    x = np.asarray(x, dtype=float)
+    if edge == "rising":
+        active = x > threshold
+    elif edge == "falling":
+        active = x < threshold
+    else:
+        raise ValueError(f"Unknown edge type: {edge!r}")
+
+    start = 0 if t_from is None else int(np.searchsorted(t, t_from, side="left"))
+    # Crossing = inactive sample followed by active sample
+    hits = np.flatnonzero(~active[start:-1] & active[start + 1:])
+    if hits.size == 0:
+        return None
+    i = start + int(hits[0])
+    x0, x1 = x[i], x[i + 1]
+    frac = (threshold - x0) / (x1 - x0) if x1 != x0 else 1.0
+    return float(t[i] + frac * (t[i + 1] - t[i]))
+
+
+def fault_response_times(cap_data, fault_signal, pickup_signal=None, trip_signal=None, threshold=0.5):
+    """
+    Compute pickup and trip latency relative to the fault-enable edge.
+
+    ``cap_data`` is the DataFrame returned by ``capture.get_capture_results``.
+    If the fault signal is already active in the first sample (the capture was
+    triggered on it without pre-trigger data), the first sample is taken as
+    the fault instant.
+
+    Returns a dict with ``t_fault`` (capture time in s) and ``pickup_s`` /
+    ``trip_s`` (latency in s, or None if the output never asserted).
+    """
+    t = index_seconds(cap_data)
+    fault = np.asarray(cap_data[fault_signal], dtype=float)
+    if fault[0] > threshold:
+        t_fault = float(t[0])
+    else:
+        t_fault = first_crossing(t, fault, threshold, "rising")
+    result = {"t_fault": t_fault, "pickup_s": None, "trip_s": None}
+    if t_fault is None:
+        return result
+
+    for key, name in (("pickup_s", pickup_signal), ("trip_s", trip_signal)):
+        if not name:
+            continue
+        x = np.asarray(cap_data[name], dtype=float)
+        i_fault = int(np.searchsorted(t, t_fault, side="right")) - 1
+        if x[max(i_fault, 0)] > threshold:
+            # Already asserted at fault inception (e.g. left latched)
+            result[key] = 0.0
+            continue
+        t_edge = first_crossing(t, x, threshold, "rising", t_from=t[max(i_fault, 0)])
+        if t_edge is not None:
+            result[key] = t_edge - t_fault
+    return result
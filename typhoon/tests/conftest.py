@@ -0,0 +1,76 @@
+import logging
+import os
+import re
+
+import pytest
+
+from api_handles import schematic_api
+from device_pool import POOL_CONFIG, default_pool
+from hil_instrumentation import STATS
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture(scope="session")
+def schematic():
+    """
+    Session-wide SchematicAPI handle.
+
+    Only created when a test that uses it (directly or through a module
+    setup fixture) runs, so ``pytest --collect-only`` never starts the API.
+    """
+    return schematic_api()
+
+
+@pytest.fixture(scope="session")
+def device_pool(schematic):
+    """HIL targets available to this run (see ``device_pool``)."""
+    return default_pool(schematic)
+
+
+@pytest.fixture(scope="module")
+def hil_target(request, device_pool):
+    """
+    HIL target leased for the current test module.
+
+    A module can narrow the choice with ``REQUIRED_DEVICES`` (device types)
+    and ``REQUIRED_CORES`` (default ``POOL_CONFIG["min_cores"]``); the module
+    is skipped if no target in the pool qualifies.
+    """
+    try:
+        with device_pool.lease(
+            min_cores=getattr(request.module, "REQUIRED_CORES", POOL_CONFIG["min_cores"]),
+            devices=getattr(request.module, "REQUIRED_DEVICES", None),
+            timeout_s=POOL_CONFIG["lease_timeout_s"],
+            poll_s=POOL_CONFIG["poll_s"],
+            owner=os.environ.get("PYTEST_XDIST_WORKER", "main"),
+        ) as target:
+            yield target
+    except LookupError as exc:
+        pytest.skip(str(exc))
+
+
+@pytest.fixture(autouse=True)
+def hil_call_stats(request):
+    """
+    Per-test HIL API call statistics.
+
+    The summary is logged and attached to the test's user properties; with
+    ``HIL_INSTRUMENT_DIR`` set it is also written there as
+    ``<test>.json`` and ``<test>.prom``.
+    """
+    STATS.reset()
+    yield STATS
+    summary = STATS.summary()
+    if not summary["functions"]:
+        return
+    logger.info("HIL API calls for %s:\n%s", request.node.nodeid, STATS.format_table())
+    request.node.user_properties.append(("hil_api_calls", {
+        name: {"count": s["count"], "total_s": s["total_s"]} for name, s in summary["functions"].items()
+    }))
+    out_dir = os.environ.get("HIL_INSTRUMENT_DIR")
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+        stem = os.path.join(out_dir, re.sub(r"[^\w.-]+", "_", request.node.nodeid))
+        STATS.to_json(stem + ".json", test=request.node.nodeid)
+        STATS.to_prometheus(stem + ".prom", labels={"test": request.node.name})
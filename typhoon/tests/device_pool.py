@@ -0,0 +1,224 @@
+"""
+Pool of HIL targets shared by parallel pytest workers.
+
+With pytest-xdist every worker is a separate process that loads its own
+model, so each needs a HIL device to itself. The targets we own are listed
+in a JSON file named by ``HIL_DEVICE_POOL``:
+
+    {"targets": [
+        {"name": "hil606-a", "device": "HIL606", "conf_id": 4, "address": "10.0.0.21"},
+        {"name": "hil404-a", "device": "HIL404", "conf_id": 1, "address": "10.0.0.22"},
+        {"name": "vhil-1", "device": "HIL606", "conf_id": 4, "vhil": true}
+    ]}
+
+``DevicePool.lease`` hands out one target at a time per process: targets
+that do not have ``min_cores`` processing cores (``hil.get_device_features``)
+are never considered, and a target is taken by holding an exclusive lock on
+``<lock dir>/<name>.lock``. The lock is released when the lease ends, also
+when the test fails, and by the OS if the worker dies. Without
+``HIL_DEVICE_POOL`` the pool holds the single locally connected device, as
+detected by Schematic Editor; if none is detected that is an error, unless
+VHIL was asked for with ``HIL_VHIL=1``.
+
+Leases are module-scoped (see the ``hil_target`` fixture), so run with
+``pytest -n <number of targets> --dist loadfile`` to keep each module on one
+worker; workers beyond the number of targets wait for a free one.
+"""
+import json
+import logging
+import os
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+from hil_backend import hil, is_simulated
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+HilTarget = namedtuple("HilTarget", ["name", "device", "revision", "conf_id", "address", "vhil"])
+
+DEFAULT_LOCK_DIR = os.path.join(os.path.expanduser("~"), ".cache", "hil-testing", "devices")
+CORES_FEATURE = "Standard Processing Cores"
+
+POOL_CONFIG = {
+    # cores the substation models need (see 24hr-bb-fault-test.py)
+    "min_cores": 2,
+    # seconds to wait for a free target; None waits indefinitely
+    "lease_timeout_s": None,
+    "poll_s": 1.0,
+}
+
+
+def lock_dir_path(lock_dir=None):
+    return lock_dir or os.environ.get("HIL_DEVICE_LOCK_DIR") or DEFAULT_LOCK_DIR
+
+
+def target_from_dict(entry):
+    return HilTarget(
+        name=entry["name"],
+        device=entry["device"],
+        revision=entry.get("revision", 1),
+        conf_id=entry["conf_id"],
+        address=entry.get("address"),
+        vhil=bool(entry.get("vhil", False)),
+    )
+
+
+def load_targets(path):
+    """Targets listed in a pool file (see the module docstring)."""
+    with open(path) as f:
+        entries = json.load(f)["targets"]
+    targets = [target_from_dict(entry) for entry in entries]
+    names = [t.name for t in targets]
+    if len(set(names)) != len(names):
+        raise RuntimeError(f"Duplicate target names in {path}: {names}")
+    return targets
+
+
+def local_target(schematic, vhil=False):
+    """
+    The connected HIL device, or with ``vhil`` VHIL with the schematic's
+    hardware settings. Raises RuntimeError if no device is detected.
+    """
+    if vhil:
+        device, revision, conf_id = schematic.get_hw_settings()
+        return HilTarget("local-vhil", device, revision, conf_id, None, True)
+    try:
+        device, revision, conf_id = schematic.detect_hw_settings()
+    except Exception as exc:
+        raise RuntimeError(f"No HIL device detected ({exc}); list the targets in HIL_DEVICE_POOL "
+                           f"or set HIL_VHIL=1 to run on VHIL") from exc
+    return HilTarget("local", device, revision, conf_id, None, False)
+
+
+def configure_model(model, target):
+    """Point the loaded schematic at ``target``'s hardware (call after ``model.load``)."""
+    model.set_hw_settings(target.device, target.revision, target.conf_id)
+
+
+def core_count(target):
+    return hil.get_device_features(device=target.device, conf_id=target.conf_id, feature=CORES_FEATURE)
+
+
+def _try_lock(f):
+    try:
+        if os.name == "nt":
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(f):
+    if os.name == "nt":
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def connect(target):
+    """Make ``target`` the device the HIL API talks to (nothing to do for VHIL and the local device)."""
+    if is_simulated() or target.vhil or not target.address:
+        return
+    from typhoon.api import device_manager
+    device_manager.add_devices_to_setup(addresses=[target.address])
+    if not device_manager.connect_setup():
+        raise RuntimeError(f"Could not connect to HIL target {target.name} ({target.address})")
+
+
+def disconnect(target):
+    """Stop the simulation and hand the device back, logging (not raising) errors."""
+    try:
+        hil.stop_simulation()
+    except Exception as exc:
+        logger.warning(f"Stopping the simulation on {target.name} failed: {exc}")
+    if is_simulated() or target.vhil or not target.address:
+        return
+    from typhoon.api import device_manager
+    try:
+        device_manager.disconnect_setup()
+        device_manager.remove_devices_from_setup(addresses=[target.address])
+    except Exception as exc:
+        logger.warning(f"Releasing HIL target {target.name} failed: {exc}")
+
+
+class DevicePool:
+    """Cross-process leasing of ``HilTarget`` entries through lock files."""
+
+    def __init__(self, targets, lock_dir=None):
+        self.targets = list(targets)
+        self.lock_dir = lock_dir_path(lock_dir)
+        os.makedirs(self.lock_dir, exist_ok=True)
+
+    def eligible(self, min_cores=None, devices=None):
+        """Targets of one of ``devices`` (any if None) with at least ``min_cores`` cores."""
+        targets = []
+        for target in self.targets:
+            if devices is not None and target.device not in devices:
+                continue
+            if min_cores is not None:
+                cores = core_count(target)
+                if cores is None or cores < min_cores:
+                    logger.info(f"{target.name}: {target.device} conf {target.conf_id} has {cores} cores, "
+                                f"{min_cores} required")
+                    continue
+            targets.append(target)
+        return targets
+
+    def _acquire(self, targets, timeout_s, poll_s):
+        deadline = None if timeout_s is None else time.monotonic() + timeout_s
+        while True:
+            for target in targets:
+                f = open(os.path.join(self.lock_dir, f"{target.name}.lock"), "a+b")
+                if _try_lock(f):
+                    return target, f
+                f.close()
+            if deadline is not None and time.monotonic() >= deadline:
+                return None, None
+            time.sleep(poll_s)
+
+    @contextmanager
+    def lease(self, min_cores=None, devices=None, timeout_s=None, poll_s=1.0, owner=None):
+        """
+        Lock, connect and yield a free eligible target; disconnect and unlock on exit.
+
+        Raises LookupError if no target meets the requirements and TimeoutError
+        if none became free within ``timeout_s``.
+        """
+        targets = self.eligible(min_cores, devices)
+        if not targets:
+            raise LookupError(f"No HIL target with {min_cores} cores among {[t.name for t in self.targets]}"
+                              + (f" (devices {list(devices)})" if devices else ""))
+        target, f = self._acquire(targets, timeout_s, poll_s)
+        if target is None:
+            raise TimeoutError(f"No free HIL target after {timeout_s} s: {[t.name for t in targets]}")
+        try:
+            f.seek(0)
+            f.truncate()
+            f.write(f"{owner or os.getpid()}\n".encode())
+            f.flush()
+            logger.info(f"{owner or os.getpid()} leased HIL target {target.name}")
+            connect(target)
+            try:
+                yield target
+            finally:
+                disconnect(target)
+        finally:
+            _unlock(f)
+            f.close()
+
+
+def default_pool(schematic):
+    """Pool from ``HIL_DEVICE_POOL``, or of the local device (VHIL with ``HIL_VHIL=1``) only."""
+    path = os.environ.get("HIL_DEVICE_POOL")
+    targets = load_targets(path) if path else [local_target(schematic, os.environ.get("HIL_VHIL") == "1")]
+    return DevicePool(targets)
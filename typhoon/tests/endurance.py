@@ -0,0 +1,216 @@
+"""
+Bounded-memory endurance (soak) runs for busbar fault testing.
+
+An ``EnduranceRun`` splits a long run (24 h by default) into capture windows
+of a few seconds. Faults are injected through ``FaultBB.Fault select`` on a
+fixed schedule; each window is captured, streamed to its own Parquet file in
+chunks and then dropped, and trip times only feed ``RollingStats`` (fixed
+size histogram + running moments). Memory therefore stays flat for the whole
+run. After every window the run state is checkpointed atomically, so a
+crashed run resumes from the next window instead of starting over. The
+checkpoint records the run configuration; resuming with a different one,
+or re-running a completed run, raises RuntimeError instead of reporting
+the old statistics.
+
+The relay trip opens the breakers, so before every window the bays are
+switched back to the energised pre-fault state (``prefault_state``) and
+the probes must confirm it; otherwise every later fault would hit a dead
+busbar.
+
+Each window file gets min/max envelope levels (10x/100x/1000x by default,
+see ``envelope``) built while it is written, for quick scans of the run.
+"""
+import json
+import math
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+from artifacts import ArtifactWriter
+from baseline import restore_commands
+from busbar_faults import inject_bb_fault
+from capture_timing import index_seconds
+from envelope import DEFAULT_FACTORS, envelope_path
+from hil_backend import capture, hil
+from rolling_stats import RollingStats
+from substation_state import diff_state, expected_state, station_snapshot
+from switching import BAYS, run_switching
+from telemetry import publisher
+from transitions import find_transitions
+
+CHECKPOINT = "checkpoint.json"
+
+
+class EnduranceRun:
+    """
+    Windowed soak test: capture ``window_s`` at a time, fault every ``fault_interval_s``.
+
+    ``fault_signal`` and ``trip_signal`` are used to compute the trip time
+    of each injected fault; every name in ``signals`` is streamed to disk.
+    ``prefault_state`` (state matrix of ``bays``, default DC1 and CB closed,
+    DC2 open) is switched back to before each window.
+    """
+
+    def __init__(self, out_dir, signals, fault_signal, trip_signal, duration_s=24 * 3600.0,
+                 window_s=10.0, fault_interval_s=60.0, fault_delay_s=1.0, fault_duration_s=0.2,
+                 fault_select=11, rate_hz=10000, chunk_rows=65536, envelope=DEFAULT_FACTORS, bays=BAYS,
+                 prefault_state=None, energise_timeout_s=2.0):
+        self.out_dir = out_dir
+        self.signals = list(dict.fromkeys(list(signals) + [fault_signal, trip_signal]))
+        self.fault_signal = fault_signal
+        self.trip_signal = trip_signal
+        self.duration_s = duration_s
+        self.window_s = window_s
+        self.fault_every = max(1, int(round(fault_interval_s / window_s)))
+        self.fault_delay_s = fault_delay_s
+        self.fault_duration_s = fault_duration_s
+        self.fault_select = fault_select
+        self.rate_hz = rate_hz
+        self.chunk_rows = chunk_rows
+        self.envelope = tuple(envelope or ())
+        self.bays = list(bays)
+        self.prefault_state = (expected_state(self.bays, cb_closed=True, dc1_closed=True, dc2_closed=False)
+                               if prefault_state is None else np.asarray(prefault_state, dtype=np.int8))
+        self.energise_timeout_s = energise_timeout_s
+        self.n_windows = int(math.ceil(duration_s / window_s))
+        self.next_window = 0
+        self.stats = RollingStats()
+        self.started_at = datetime.now().isoformat()
+        os.makedirs(os.path.join(out_dir, "windows"), exist_ok=True)
+
+    @property
+    def n_faults(self):
+        """Number of faulted windows in the whole run."""
+        return int(math.ceil(self.n_windows / self.fault_every))
+
+    # ----- checkpointing -----
+    @property
+    def checkpoint_path(self):
+        return os.path.join(self.out_dir, CHECKPOINT)
+
+    def config(self):
+        """Parameters a resumed run must share with the checkpointed one (JSON types)."""
+        return {
+            "signals": self.signals, "fault_signal": self.fault_signal, "trip_signal": self.trip_signal,
+            "n_windows": self.n_windows, "window_s": self.window_s, "fault_every": self.fault_every,
+            "fault_delay_s": self.fault_delay_s, "fault_duration_s": self.fault_duration_s,
+            "fault_select": self.fault_select, "rate_hz": self.rate_hz, "bays": self.bays,
+            "prefault_state": self.prefault_state.tolist(),
+        }
+
+    def save_checkpoint(self):
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({
+                "next_window": self.next_window, "n_windows": self.n_windows, "config": self.config(),
+                "started_at": self.started_at, "updated_at": datetime.now().isoformat(),
+                "stats": self.stats.to_dict(),
+            }, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    def resume(self):
+        """
+        Continue from the last checkpoint, if any. Returns True if resumed.
+
+        Raises RuntimeError if the checkpoint is of a run with another
+        configuration, or of a run that has already completed.
+        """
+        if not os.path.exists(self.checkpoint_path):
+            return False
+        with open(self.checkpoint_path) as f:
+            state = json.load(f)
+        config = self.config()
+        saved = state.get("config") or {}
+        changed = sorted(k for k in config.keys() | saved.keys() if config.get(k) != saved.get(k))
+        if changed:
+            raise RuntimeError(f"{self.checkpoint_path} is of a run with different {changed}; "
+                               f"use a new output directory")
+        if state["next_window"] >= state["n_windows"]:
+            raise RuntimeError(f"{self.checkpoint_path} is of a completed run (started {state['started_at']}); "
+                               f"use a new output directory")
+        self.next_window = state["next_window"]
+        self.started_at = state["started_at"]
+        self.stats = RollingStats.from_dict(state["stats"])
+        return True
+
+    # ----- windows -----
+    def window_path(self, k):
+        return os.path.join(self.out_dir, "windows", f"window_{k:06d}.parquet")
+
+    def write_window(self, k, cap_data, faulted, trip_s):
+        """Stream one captured window to disk in chunks of ``chunk_rows``."""
+        t = index_seconds(cap_data) + k * self.window_s
+        values = {name: cap_data[name].to_numpy(dtype=float) for name in self.signals}
+        fields = ["t_s"] + self.signals
+        metadata = {"window": k, "fault_select": self.fault_select if faulted else None,
+                    "trip_s": trip_s, "written_at": datetime.now().isoformat()}
+        path = self.window_path(k)
+        with ArtifactWriter(path + ".part", fields, metadata=metadata, string_fields=(),
+                            envelope=self.envelope) as writer:
+            for start in range(0, len(t), self.chunk_rows):
+                sl = slice(start, start + self.chunk_rows)
+                columns = {"t_s": t[sl]}
+                columns.update((name, x[sl]) for name, x in values.items())
+                writer.write_columns(columns)
+        for factor in self.envelope:
+            os.replace(envelope_path(path + ".part", factor), envelope_path(path, factor))
+        os.replace(path + ".part", path)
+
+    def energise(self, poll_ms=50):
+        """
+        Switch the bays back to ``prefault_state`` and wait until the probes
+        confirm it; returns the switching commands run (none if nothing moved).
+        """
+        commands = restore_commands(station_snapshot(self.bays), self.prefault_state, self.bays)
+        if commands:
+            run_switching(commands)
+        deadline = hil.get_sim_time() + self.energise_timeout_s
+        while True:
+            mismatches = diff_state(station_snapshot(self.bays), self.prefault_state, self.bays)
+            if not mismatches:
+                return commands
+            if hil.get_sim_time() >= deadline:
+                raise RuntimeError(f"Pre-fault state not reached (bay, device, actual, expected): {mismatches}")
+            hil.wait_msec(poll_ms)
+
+    def run_window(self, k):
+        """Capture window ``k``; returns (faulted, trip time in s or None)."""
+        faulted = k % self.fault_every == 0
+        capture.start_capture(self.window_s, rate=self.rate_hz, signals=self.signals)
+        if faulted:
+            hil.wait_msec(self.fault_delay_s * 1000)
+            inject_bb_fault(self.fault_select)
+            hil.wait_msec(self.fault_duration_s * 1000)
+            inject_bb_fault(0)
+        cap_data = capture.get_capture_results(wait_capture=True)
+        telemetry = publisher()
+        telemetry.publish_frame("soak", cap_data, t0=k * self.window_s, window=k, faulted=faulted)
+
+        trip_s = None
+        if faulted:
+            edges = find_transitions(cap_data, columns=[self.fault_signal, self.trip_signal])
+            trip_s = edges.reaction_time(self.fault_signal, self.trip_signal, "rising", "rising")
+            self.stats.add(trip_s)
+            telemetry.event("fault", window=k, fault_select=self.fault_select)
+            telemetry.event("trip", window=k, t_s=trip_s)
+        self.write_window(k, cap_data, faulted, trip_s)
+        return faulted, trip_s
+
+    def run(self, log=print):
+        self.resume()
+        while self.next_window < self.n_windows:
+            k = self.next_window
+            t_start = time.perf_counter()
+            self.energise()
+            faulted, trip_s = self.run_window(k)
+            self.next_window = k + 1
+            self.save_checkpoint()
+            if faulted:
+                s = self.stats.summary()
+                trip = "no trip" if trip_s is None else f"trip={trip_s * 1000:.1f} ms"
+                p99 = "n/a" if s["p99_s"] is None else f"{s['p99_s'] * 1000:.1f} ms"
+                log(f"window {k + 1}/{self.n_windows}: {trip} | faults={s['count'] + s['missed']} "
+                    f"missed={s['missed']} p99={p99} ({time.perf_counter() - t_start:.1f} s)")
+        return self.stats.summary()
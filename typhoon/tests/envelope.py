@@ -0,0 +1,228 @@
+"""
+Min/max envelope pyramid for long waveform artifacts.
+
+Soak windows and 10 kHz captures hold far more samples than a plot or a
+scan needs, but short transients (breaker bounce on ``S3_fb``) must not be
+averaged away. ``EnvelopeWriter`` builds min/max envelope levels at
+increasing decimation factors (10x, 100x, 1000x by default) while the raw
+data is written: each level is computed from the one below it, one chunk at
+a time, and written to its own artifact next to the raw file:
+
+    window_000001.parquet          raw samples
+    window_000001.env10.parquet    t_start, t_end, <signal>.min, <signal>.max
+    window_000001.env100.parquet
+    window_000001.env1000.parquet
+
+``read_envelope`` returns a time range at a requested resolution and reads
+only the level it needs (with row-group pruning for Parquet), and
+``crossing_blocks`` lists the envelope blocks in which a signal crosses a
+threshold, to zoom in on transients level by level.
+"""
+import os
+from collections import namedtuple
+
+import numpy as np
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from artifacts import ArtifactWriter, read_artifact, read_artifact_metadata
+
+DEFAULT_FACTORS = (10, 100, 1000)
+
+Envelope = namedtuple("Envelope", ["factor", "t_start", "t_end", "minimum", "maximum"])
+
+
+def envelope_path(path, factor):
+    """Path of the ``factor`` envelope level of artifact ``path`` (``.part`` suffixes are kept)."""
+    suffix = ""
+    if path.endswith(".part"):
+        path, suffix = path[:-len(".part")], ".part"
+    root, ext = os.path.splitext(path)
+    return f"{root}.env{factor}{ext}{suffix}"
+
+
+class _Level:
+    """One decimation stage: reduces blocks of ``step`` input rows to one output row."""
+
+    def __init__(self, step):
+        self.step = step
+        self._carry = None
+
+    def push(self, t_start, t_end, lo, hi, final=False):
+        if self._carry is not None:
+            c_start, c_end, c_lo, c_hi = self._carry
+            t_start = np.concatenate([c_start, t_start])
+            t_end = np.concatenate([c_end, t_end])
+            lo = np.concatenate([c_lo, lo])
+            hi = np.concatenate([c_hi, hi])
+        n = len(t_start)
+        n_full = n if final else n - n % self.step
+        self._carry = None if n_full == n else (t_start[n_full:], t_end[n_full:], lo[n_full:], hi[n_full:])
+        if n_full == 0:
+            return None
+        starts = np.arange(0, n_full, self.step)
+        ends = np.minimum(starts + self.step, n_full) - 1
+        # fmin/fmax skip NaN samples (missed reads) unless a whole block is NaN
+        return (
+            t_start[starts],
+            t_end[ends],
+            np.fmin.reduceat(lo[:n_full], starts, axis=0),
+            np.fmax.reduceat(hi[:n_full], starts, axis=0),
+        )
+
+
+class EnvelopeWriter:
+    """
+    Streaming min/max envelope levels for the numeric ``columns`` of an artifact.
+
+    ``factors`` are decimation factors relative to the raw samples; each must
+    be a multiple of the previous one. Feed the same column blocks that go
+    into the raw artifact through ``write_columns``.
+    """
+
+    def __init__(self, path, time_field, columns, factors=DEFAULT_FACTORS, fmt="parquet", metadata=None):
+        factors = sorted(int(f) for f in factors)
+        for lower, upper in zip([1] + factors, factors):
+            if upper % lower:
+                raise ValueError(f"Envelope factor {upper} is not a multiple of {lower}")
+        self.time_field = time_field
+        self.columns = list(columns)
+        self.factors = factors
+        fields = ["t_start", "t_end"] + [f"{c}.{agg}" for c in self.columns for agg in ("min", "max")]
+        self._levels = []
+        self._writers = []
+        for lower, factor in zip([1] + factors, factors):
+            self._levels.append(_Level(factor // lower))
+            level_meta = {**(metadata or {}), "envelope_factor": factor, "time_field": time_field,
+                          "source": os.path.basename(path)}
+            self._writers.append(ArtifactWriter(envelope_path(path, factor), fields, metadata=level_meta,
+                                                fmt=fmt, string_fields=()))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write_columns(self, columns):
+        """Add a block of raw rows given as {name: sequence/ndarray}."""
+        t = np.asarray(columns[self.time_field], dtype=float)
+        values = np.column_stack([np.asarray(columns[c], dtype=float) for c in self.columns]) \
+            if self.columns else np.empty((len(t), 0))
+        self._push(t, t, values, values)
+
+    def _push(self, t_start, t_end, lo, hi, final=False):
+        for level, writer in zip(self._levels, self._writers):
+            out = level.push(t_start, t_end, lo, hi, final)
+            if out is None:
+                if not final:
+                    return
+                empty = np.empty(0)
+                t_start, t_end, lo, hi = empty, empty, lo[:0], hi[:0]
+                continue
+            t_start, t_end, lo, hi = out
+            block = {"t_start": t_start, "t_end": t_end}
+            for j, c in enumerate(self.columns):
+                block[f"{c}.min"] = lo[:, j]
+                block[f"{c}.max"] = hi[:, j]
+            writer.write_columns(block)
+
+    def close(self):
+        """Flush partial blocks (as shorter final blocks) and close every level."""
+        empty = np.empty(0)
+        self._push(empty, empty, np.empty((0, len(self.columns))), np.empty((0, len(self.columns))), final=True)
+        for writer in self._writers:
+            writer.close()
+
+
+def envelope_factors(path):
+    """Decimation factors available next to artifact ``path`` (ascending)."""
+    directory = os.path.dirname(path) or "."
+    root, ext = os.path.splitext(os.path.basename(path))
+    prefix = f"{root}.env"
+    factors = []
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and name.endswith(ext) and name[len(prefix):-len(ext)].isdigit():
+            factors.append(int(name[len(prefix):-len(ext)]))
+    return sorted(factors)
+
+
+def _read_range(path, columns, t_first, t_last, t_from, t_to):
+    """Rows of ``path`` with t_last >= t_from and t_first <= t_to, reading as little as possible."""
+    if path.endswith(".parquet"):
+        filters = []
+        if t_from is not None:
+            filters.append((t_last, ">=", t_from))
+        if t_to is not None:
+            filters.append((t_first, "<=", t_to))
+        return pq.read_table(path, columns=columns, filters=filters or None, memory_map=True)
+    table = read_artifact(path)
+    mask = None
+    if t_from is not None:
+        mask = pc.greater_equal(table[t_last], t_from)
+    if t_to is not None:
+        upper = pc.less_equal(table[t_first], t_to)
+        mask = upper if mask is None else pc.and_(mask, upper)
+    return (table if mask is None else table.filter(mask)).select(columns)
+
+
+def _level_rows(path):
+    if path.endswith(".parquet"):
+        return pq.ParquetFile(path).metadata.num_rows
+    return read_artifact(path).num_rows
+
+
+def read_envelope(path, signals, t_from=None, t_to=None, max_points=2000) -> Envelope:
+    """
+    Envelope of ``signals`` over [t_from, t_to] with at most about ``max_points`` blocks.
+
+    The finest level that fits ``max_points`` is chosen from the size of the
+    coarsest level; only that level (or the raw artifact, factor 1) is read.
+    """
+    signals = list(signals)
+    factors = envelope_factors(path)
+    if not factors:
+        raise FileNotFoundError(f"No envelope levels next to {path}")
+    coarsest = envelope_path(path, factors[-1])
+    time_field = read_artifact_metadata(coarsest)["time_field"]
+
+    # Raw samples in the range, estimated from the coarsest level
+    if t_from is None and t_to is None:
+        n_raw = _level_rows(coarsest) * factors[-1]
+    else:
+        n_raw = _read_range(coarsest, ["t_start"], "t_start", "t_end", t_from, t_to).num_rows * factors[-1]
+    factor = next((f for f in [1] + factors if n_raw / f <= max_points), factors[-1])
+
+    if factor == 1:
+        table = _read_range(path, [time_field] + signals, time_field, time_field, t_from, t_to)
+        t = table[time_field].to_numpy()
+        values = {s: table[s].to_numpy() for s in signals}
+        return Envelope(1, t, t, values, values)
+
+    columns = ["t_start", "t_end"] + [f"{s}.{agg}" for s in signals for agg in ("min", "max")]
+    table = _read_range(envelope_path(path, factor), columns, "t_start", "t_end", t_from, t_to)
+    return Envelope(
+        factor,
+        table["t_start"].to_numpy(),
+        table["t_end"].to_numpy(),
+        {s: table[f"{s}.min"].to_numpy() for s in signals},
+        {s: table[f"{s}.max"].to_numpy() for s in signals},
+    )
+
+
+def crossing_blocks(envelope: Envelope, signal, threshold=0.5):
+    """(t_start, t_end) of the envelope blocks in which ``signal`` crosses ``threshold``."""
+    lo = envelope.minimum[signal]
+    hi = envelope.maximum[signal]
+    if envelope.factor == 1:
+        # Raw samples: a crossing lies between two neighbouring samples
+        above = hi > threshold
+        idx = np.flatnonzero(above[1:] != above[:-1])
+        return list(zip(envelope.t_start[idx].tolist(), envelope.t_end[idx + 1].tolist()))
+    inside = (lo <= threshold) & (hi > threshold)
+    spans = [(envelope.t_start[i], envelope.t_end[i], i) for i in np.flatnonzero(inside)]
+    # Crossings between two neighbouring blocks that each stay on one side
+    above = lo > threshold
+    between = ~inside[:-1] & ~inside[1:] & (above[:-1] != above[1:])
+    spans += [(envelope.t_start[i], envelope.t_end[i + 1], i) for i in np.flatnonzero(between)]
+    return [(float(a), float(b)) for a, b, _ in sorted(spans, key=lambda s: s[2])]
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Parallel busbar fault campaign runner.
+
+Runs the cross product of
+- FaultBB "Fault select" codes,
+- fault impedances (R, X written to the fault component),
+- named pre-fault switching states,
+over the targets of a device pool (see ``device_pool``). Each worker
+process leases one target, connects to it and loads the model compiled for
+its hardware (one cached build per device type/configuration); cases are
+handed out to whichever worker is free, and every result row is appended
+to a single Parquet results file in the main process.
+
+The FaultBB fault is on the busbar, so one case captures the CB probes of
+all timed bays together and yields one result row (trip time) per bay.
+
+Cases run in any order, so each one first restores the baseline captured
+when the model started (inputs, fault and trip state, switchgear) and then
+switches to its fully specified pre-fault positions.
+
+Usage:
+    python fault_campaign.py --pool devices.json --targets hil606-a,vhil-1 --fault-selects 1,2,11
+"""
+import argparse
+import itertools
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+from contextlib import ExitStack
+from datetime import datetime
+from functools import partial
+from multiprocessing.util import Finalize
+
+from api_handles import schematic_api
+from artifacts import ArtifactWriter, artifact_path
+from baseline import Baseline, restore_commands
+from busbar_faults import FAULT_CONFIG, inject_bb_fault, set_fault_impedance
+from capture_timing import fault_response_times
+from device_pool import POOL_CONFIG, DevicePool, configure_model, default_pool, load_targets
+from hil_backend import capture, hil
+from model_cache import compile_cached
+from results_store import ResultsStore, import_artifact, model_version
+from substation_state import diff_state, expected_state, probe_signal, station_snapshot
+from switching import BAYS, run_switching
+
+FILE_DIR_PATH = os.path.dirname(os.path.abspath(__file__))
+
+# =========================
+# ======= CONFIG =========
+# =========================
+CAMPAIGN_CONFIG = {
+    "model_path": os.path.join(FILE_DIR_PATH, "..", "models", "digital-substation-demo.tse"),
+    "scada_panel_path": os.path.join(FILE_DIR_PATH, "..", "scada", "digital-substation-demo.cus"),
+
+    # Fault injection signals: see busbar_faults.FAULT_CONFIG
+
+    # --- Timing ---
+    "settle_s": 0.5,          # after pre-fault switching, before the fault
+    "capture_s": 0.5,         # capture window starting at fault inception
+    "capture_rate_hz": 10000,
+    "clear_s": 0.2,           # after clearing the fault
+    "baseline_impedance": (0.001, 0.0),   # TODO: model default R, X (ohm), restored between cases
+
+    "results_dir": "test_artifacts",
+    "results_store": os.path.join("test_artifacts", "results"),   # cross-run dataset (None = off)
+}
+
+# Pre-fault switchgear positions by name: complete state matrices of BAYS
+# (every CB, DC1 and DC2 position given, see substation_state)
+PREFAULT_STATES = {
+    "all_closed": expected_state(BAYS, cb_closed=True, dc1_closed=True, dc2_closed=False),
+    "dc2_closed": expected_state(BAYS, cb_closed=True, dc1_closed=False, dc2_closed=True),
+}
+
+FaultCase = namedtuple("FaultCase", ["fault_select", "impedance", "prefault"])
+
+RESULT_FIELDS = ["case", "device", "fault_select", "r_fault", "x_fault", "bay", "prefault",
+                 "trip_s", "duration_s", "error"]
+STRING_FIELDS = ("device", "bay", "prefault", "error")
+
+
+def build_cases(fault_selects, impedances, prefault_states=tuple(PREFAULT_STATES)):
+    """Cross product of all campaign dimensions."""
+    return [FaultCase(*combo) for combo in itertools.product(fault_selects, impedances, prefault_states)]
+
+
+def switch_to_prefault(name, bays=BAYS, settle_ms=250):
+    """Switch to the pre-fault positions ``name``; raises RuntimeError if the probes disagree."""
+    target = PREFAULT_STATES[name]
+    commands = restore_commands(station_snapshot(bays), target, bays)
+    if commands:
+        run_switching(commands, settle_ms=settle_ms)
+    mismatches = diff_state(station_snapshot(bays), target, bays)
+    if mismatches:
+        raise RuntimeError(f"Pre-fault state {name} not reached (bay, device, actual, expected): {mismatches}")
+
+
+# =========================
+# ===== Worker side =======
+# =========================
+_worker = {}
+
+
+def start_model(compiled_model_path, vhil_device=False):
+    """Load and start the model in this process and capture the baseline every case starts from."""
+    hil.load_model(file=compiled_model_path, vhil_device=vhil_device)
+    hil.start_simulation()
+    r, x = CAMPAIGN_CONFIG["baseline_impedance"]
+    component = FAULT_CONFIG["fault_component"]
+    _worker["baseline"] = Baseline.capture(parameters={
+        (component, FAULT_CONFIG["fault_param_r_f"]): r,
+        (component, FAULT_CONFIG["fault_param_x_f"]): x,
+    })
+
+
+def _init_worker(assignments, lock_dir):
+    """Lease one target for this worker process and load its compiled model on it."""
+    target, compiled_model_path = assignments.get()
+    leases = ExitStack()
+    # held until the worker exits, then the simulation is stopped and the target released
+    leases.enter_context(DevicePool([target], lock_dir).lease(
+        timeout_s=POOL_CONFIG["lease_timeout_s"], poll_s=POOL_CONFIG["poll_s"], owner=f"campaign-{os.getpid()}"))
+    Finalize(None, leases.close, exitpriority=10)
+    start_model(compiled_model_path, vhil_device=target.vhil)
+    _worker["device"] = target.name
+
+
+def run_case(case, bays=BAYS):
+    """Run one fault case on this worker's device and return one result row per bay in ``bays``."""
+    cfg = CAMPAIGN_CONFIG
+    common = {
+        "device": _worker.get("device"), "fault_select": case.fault_select,
+        "r_fault": case.impedance[0], "x_fault": case.impedance[1],
+        "prefault": case.prefault, "trip_s": None, "error": None,
+    }
+    rows = [{**common, "bay": bay} for bay in bays]
+    t_start = time.perf_counter()
+    trip_signals = [probe_signal(bay, "CB_closed") for bay in bays]
+    try:
+        _worker["baseline"].restore()
+        switch_to_prefault(case.prefault)
+        set_fault_impedance(case.impedance)
+        hil.wait_msec(cfg["settle_s"] * 1000)
+
+        capture.start_capture(
+            cfg["capture_s"],
+            rate=cfg["capture_rate_hz"],
+            signals=[FAULT_CONFIG["fault_signal"]] + trip_signals,
+            trigger_source=FAULT_CONFIG["fault_signal"],
+            trigger_threshold=0.5,
+            trigger_edge="Rising edge",
+        )
+        inject_bb_fault(case.fault_select)
+        cap_data = capture.get_capture_results(wait_capture=True)
+        inject_bb_fault(0)
+        hil.wait_msec(cfg["clear_s"] * 1000)
+
+        # Triggered without pre-trigger, so the fault signal is already high in
+        # the first sample; CB probes go high when the breaker opens
+        for row, trip_signal in zip(rows, trip_signals):
+            timing = fault_response_times(cap_data, FAULT_CONFIG["fault_signal"], trip_signal=trip_signal)
+            row["trip_s"] = timing["trip_s"]
+    except Exception as e:
+        for row in rows:
+            row["error"] = f"{type(e).__name__}: {e}"
+        try:
+            inject_bb_fault(0)
+        except Exception:
+            pass
+    duration_s = time.perf_counter() - t_start
+    for row in rows:
+        row["duration_s"] = duration_s
+    return rows
+
+
+# =========================
+# ===== Main side =========
+# =========================
+def compile_for_targets(targets):
+    """Compiled model path per target name, compiling once per (device, revision, conf_id)."""
+    cfg = CAMPAIGN_CONFIG
+    schematic = schematic_api()
+    builds = {}
+    compiled = {}
+    for target in targets:
+        hw = (target.device, target.revision, target.conf_id)
+        if hw not in builds:
+            schematic.load(cfg["model_path"])
+            configure_model(schematic, target)
+            builds[hw] = compile_cached(schematic, cfg["model_path"], extra_files=[cfg["scada_panel_path"]])
+        compiled[target.name] = builds[hw]
+    return compiled
+
+
+def run_campaign(cases, targets, bays=BAYS, results_path=None, lock_dir=None):
+    """
+    Run ``cases`` over ``targets`` (``device_pool.HilTarget``, one worker process each),
+    timing the breakers of ``bays``.
+
+    Returns the path of the Parquet results file. Rows are written as cases
+    finish, so a partial file is available if the campaign is interrupted.
+    """
+    cfg = CAMPAIGN_CONFIG
+    compiled = compile_for_targets(targets)
+
+    if results_path is None:
+        os.makedirs(cfg["results_dir"], exist_ok=True)
+        results_path = artifact_path(cfg["results_dir"], f"campaign_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+
+    ctx = multiprocessing.get_context("spawn")
+    assignments = ctx.Manager().Queue()
+    for target in targets:
+        assignments.put((target, compiled[target.name]))
+
+    metadata = {"kind": "fault_campaign", "cases": len(cases), "bays": list(bays),
+                "devices": [t.name for t in targets],
+                "config": {**cfg, **FAULT_CONFIG}, "started_at": datetime.now().isoformat()}
+    with ArtifactWriter(results_path, RESULT_FIELDS, metadata=metadata, string_fields=STRING_FIELDS,
+                        batch_rows=64) as writer:
+        with ctx.Pool(len(targets), initializer=_init_worker,
+                      initargs=(assignments, DevicePool(targets, lock_dir).lock_dir)) as pool:
+            for i, rows in enumerate(pool.imap_unordered(partial(run_case, bays=list(bays)), cases)):
+                for row in rows:
+                    row["case"] = i
+                    writer.writerow(row)
+                row = rows[0]
+                if row["error"]:
+                    status = "ERROR " + row["error"]
+                else:
+                    trips = [r["trip_s"] for r in rows if r["trip_s"] is not None]
+                    status = (f"{len(trips)}/{len(rows)} bays tripped"
+                              + (f", {min(trips) * 1000:.1f}-{max(trips) * 1000:.1f} ms" if trips else ""))
+                print(f"[{i + 1}/{len(cases)}] {row['device']} FS={row['fault_select']} "
+                      f"Z=({row['r_fault']}, {row['x_fault']}) {row['prefault']}: {status}")
+    return results_path
+
+
+def _floats(text):
+    return [float(v) for v in text.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pool", default=os.environ.get("HIL_DEVICE_POOL"),
+                        help="device pool file (default: $HIL_DEVICE_POOL, else the local device)")
+    parser.add_argument("--targets", default=None, help="comma-separated pool target names (default: all)")
+    parser.add_argument("--fault-selects", default="11", help="comma-separated FaultBB select codes")
+    parser.add_argument("--impedances", default="0.001:0.0", help="comma-separated R:X pairs in ohm")
+    parser.add_argument("--bays", default=",".join(BAYS), help="comma-separated bays whose CB trip is timed")
+    parser.add_argument("--prefault", default=",".join(PREFAULT_STATES))
+    parser.add_argument("--results", default=None, help="results .parquet path")
+    args = parser.parse_args(argv)
+
+    cases = build_cases(
+        [int(v) for v in args.fault_selects.split(",")],
+        [tuple(_floats(z.replace(":", ","))) for z in args.impedances.split(",")],
+        args.prefault.split(","),
+    )
+    pool = DevicePool(load_targets(args.pool)) if args.pool else default_pool(schematic_api())
+    targets = pool.eligible(min_cores=POOL_CONFIG["min_cores"])
+    if args.targets:
+        names = args.targets.split(",")
+        unknown = set(names) - {t.name for t in targets}
+        if unknown:
+            raise RuntimeError(f"Targets not in the pool or without {POOL_CONFIG['min_cores']} cores: "
+                               f"{sorted(unknown)}")
+        targets = [t for t in targets if t.name in names]
+    if not targets:
+        raise RuntimeError("No eligible HIL target in the device pool")
+    path = run_campaign(cases, targets, args.bays.split(","), results_path=args.results, lock_dir=pool.lock_dir)
+    print(f"Results: {path}")
+    if CAMPAIGN_CONFIG["results_store"]:
+        store = ResultsStore(CAMPAIGN_CONFIG["results_store"])
+        version = model_version(CAMPAIGN_CONFIG["model_path"], [CAMPAIGN_CONFIG["scada_panel_path"]])
+        import_artifact(store, path, model_version=version)
+        print(f"Added to results store: {store.root}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
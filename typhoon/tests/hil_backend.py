@@ -0,0 +1,41 @@
+"""
+HIL API backend selection.
+
+Tests and helpers import ``hil`` and ``capture`` from here instead of from
+the Typhoon API directly, so the same code runs against
+
+- ``HIL_BACKEND=typhoon`` (default): the Typhoon HIL API (real HIL or VHIL)
+- ``HIL_BACKEND=sim``: the offline NumPy model in ``sim_backend``
+
+Both modules are wrapped by ``hil_instrumentation.Instrumented`` so every
+call is counted and timed (``HIL_INSTRUMENT=0`` disables this), and ``hil``
+by ``hil_journal.Journaled``, which remembers the last value written to
+each input (``journal``).
+"""
+import os
+
+BACKEND = os.environ.get("HIL_BACKEND", "typhoon")
+
+if BACKEND == "sim":
+    from sim_backend import capture, hil
+elif BACKEND == "typhoon":
+    from typhoon.api import hil
+    from typhoon.test import capture
+else:
+    raise ImportError(f"Unknown HIL_BACKEND: {BACKEND!r} (expected 'typhoon' or 'sim')")
+
+from hil_journal import Journaled
+
+hil = journal = Journaled(hil)
+
+INSTRUMENTED = os.environ.get("HIL_INSTRUMENT", "1") != "0"
+
+if INSTRUMENTED:
+    from hil_instrumentation import Instrumented
+
+    hil = Instrumented(hil, "hil")
+    capture = Instrumented(capture, "capture")
+
+
+def is_simulated():
+    return BACKEND == "sim"
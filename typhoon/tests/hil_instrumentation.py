@@ -0,0 +1,208 @@
+"""
+Call counts and latency histograms for the HIL API.
+
+``hil_backend`` wraps the ``hil`` and ``capture`` modules in an
+``Instrumented`` proxy, so every call made by the tests and helpers is
+timed without changing any call site. Statistics are kept per function and
+per signal name (the first string argument, or the ``name``/``signal``
+keyword), in log2-spaced latency buckets from 1 µs to ~17 s:
+
+    hil.wait_msec                     count=  240  total=  2.412 s  p99=  16.8 ms
+    hil.read_digital_signal[Trip]     count= 1988  total=  0.031 s  p99=  32.8 µs
+
+``STATS.summary()`` gives a JSON-ready dict, ``STATS.to_prometheus()`` the
+Prometheus text exposition format. ``STATS.reset()`` starts a new
+measurement period (the conftest does this per test).
+
+Set ``HIL_INSTRUMENT=0`` to import the bare API modules instead.
+"""
+import json
+import threading
+import time
+
+# Bucket i holds latencies in [2**(i-1), 2**i) ns; the first bucket is < ~1 µs
+_MIN_EXP = 10
+_MAX_EXP = 34
+_N_BUCKETS = _MAX_EXP - _MIN_EXP + 1
+BUCKET_BOUNDS_S = [2 ** (_MIN_EXP + i) / 1e9 for i in range(_N_BUCKETS)]
+
+
+def _signal_of(args, kwargs):
+    if args and isinstance(args[0], str):
+        return args[0]
+    for key in ("name", "signal"):
+        value = kwargs.get(key)
+        if isinstance(value, str):
+            return value
+    return None
+
+
+class CallStats:
+    """Thread-safe call counters and latency histograms keyed by (function, signal)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.started = time.time()
+
+    def record(self, function, signal, elapsed_ns):
+        idx = min(max(elapsed_ns.bit_length() - _MIN_EXP, 0), _MAX_EXP - _MIN_EXP)
+        key = (function, signal)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = [0, 0, 0, [0] * _N_BUCKETS]
+            entry[0] += 1
+            entry[1] += elapsed_ns
+            if elapsed_ns > entry[2]:
+                entry[2] = elapsed_ns
+            entry[3][idx] += 1
+
+    def reset(self):
+        with self._lock:
+            self._entries = {}
+            self.started = time.time()
+
+    def _copy(self):
+        with self._lock:
+            return {key: (e[0], e[1], e[2], list(e[3])) for key, e in self._entries.items()}
+
+    @staticmethod
+    def _stats(count, total_ns, max_ns, buckets):
+        return {
+            "count": count,
+            "total_s": total_ns / 1e9,
+            "mean_s": total_ns / count / 1e9,
+            "max_s": max_ns / 1e9,
+            "p50_s": _bucket_quantile(buckets, count, 0.50),
+            "p99_s": _bucket_quantile(buckets, count, 0.99),
+            "buckets": buckets,
+        }
+
+    def summary(self):
+        """Per-function and per-signal statistics as a JSON-ready dict."""
+        entries = self._copy()
+        functions = {}
+        for (function, _), (count, total_ns, max_ns, buckets) in entries.items():
+            agg = functions.setdefault(function, [0, 0, 0, [0] * _N_BUCKETS])
+            agg[0] += count
+            agg[1] += total_ns
+            agg[2] = max(agg[2], max_ns)
+            agg[3] = [a + b for a, b in zip(agg[3], buckets)]
+        return {
+            "started": self.started,
+            "elapsed_s": time.time() - self.started,
+            "bucket_bounds_s": BUCKET_BOUNDS_S,
+            "functions": {name: self._stats(*agg) for name, agg in sorted(functions.items())},
+            "signals": {
+                f"{function}[{signal}]": self._stats(*entry)
+                for (function, signal), entry in sorted(entries.items(), key=lambda kv: kv[0][0])
+                if signal is not None
+            },
+        }
+
+    def to_json(self, path=None, **extra):
+        """Summary as a JSON string; also written to ``path`` when given."""
+        text = json.dumps({**extra, **self.summary()}, indent=2)
+        if path:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+    def to_prometheus(self, path=None, labels=None):
+        """Prometheus text format: a ``hil_api_call_seconds`` histogram per function and signal."""
+        base = "".join(f',{k}="{_escape(v)}"' for k, v in (labels or {}).items())
+        lines = [
+            "# HELP hil_api_call_seconds Latency of HIL API calls.",
+            "# TYPE hil_api_call_seconds histogram",
+        ]
+        for (function, signal), (count, total_ns, _, buckets) in sorted(self._copy().items(), key=str):
+            label = f'function="{function}"'
+            if signal is not None:
+                label += f',signal="{_escape(signal)}"'
+            label += base
+            cumulative = 0
+            for bound, n in zip(BUCKET_BOUNDS_S, buckets):
+                cumulative += n
+                lines.append(f'hil_api_call_seconds_bucket{{{label},le="{bound:.9g}"}} {cumulative}')
+            lines.append(f'hil_api_call_seconds_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f"hil_api_call_seconds_sum{{{label}}} {total_ns / 1e9:.9f}")
+            lines.append(f"hil_api_call_seconds_count{{{label}}} {count}")
+        text = "\n".join(lines) + "\n"
+        if path:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+    def format_table(self, top=10):
+        """Human-readable table of the ``top`` functions by total time."""
+        functions = self.summary()["functions"]
+        rows = sorted(functions.items(), key=lambda kv: kv[1]["total_s"], reverse=True)[:top]
+        return "\n".join(
+            f"{name:40s} count={s['count']:6d}  total={s['total_s']:8.3f} s  p99={_format_s(s['p99_s'])}"
+            for name, s in rows
+        )
+
+
+def _bucket_quantile(buckets, count, q):
+    """Upper bound of the bucket holding quantile ``q`` (s)."""
+    rank = q * count
+    cumulative = 0
+    for bound, n in zip(BUCKET_BOUNDS_S, buckets):
+        cumulative += n
+        if cumulative >= rank:
+            return bound
+    return BUCKET_BOUNDS_S[-1]
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_s(seconds):
+    if seconds >= 1.0:
+        return f"{seconds:7.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:6.1f} ms"
+    return f"{seconds * 1e6:6.1f} µs"
+
+
+STATS = CallStats()
+
+
+class Instrumented:
+    """Proxy for an API module that times every function call into ``stats``."""
+
+    def __init__(self, module, prefix, stats=STATS):
+        self._module = module
+        self._prefix = prefix
+        self._stats = stats
+        self._wrapped = {}
+
+    def __getattr__(self, attr):
+        wrapped = self._wrapped.get(attr)
+        if wrapped is not None:
+            return wrapped
+        value = getattr(self._module, attr)
+        if not callable(value) or isinstance(value, type):
+            return value
+        wrapped = self._wrapped[attr] = self._wrap(f"{self._prefix}.{attr}", value)
+        return wrapped
+
+    def _wrap(self, function, call):
+        record = self._stats.record
+        perf_counter_ns = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            t_start = perf_counter_ns()
+            try:
+                return call(*args, **kwargs)
+            finally:
+                record(function, _signal_of(args, kwargs), perf_counter_ns() - t_start)
+
+        timed.__name__ = getattr(call, "__name__", function)
+        timed.__doc__ = getattr(call, "__doc__", None)
+        return timed
+
+    def __repr__(self):
+        return f"<Instrumented {self._module!r}>"
@@ -0,0 +1,98 @@
+"""
+Last written value of every HIL input.
+
+The HIL API can set SCADA inputs, contactors, digital inputs and model
+parameters but offers no uniform way to read them back. ``hil_backend``
+therefore wraps ``hil`` in a ``Journaled`` proxy that remembers the value
+of the most recent successful call to each setter, keyed by the setter and
+its target (input name, or component path and parameter name):
+
+    ("set_scada_input_value", (("scadaInputName", "Bay 1.CB close"),)) -> (("value", 0),)
+
+``baseline.Baseline`` uses the journal to put inputs back to a snapshot.
+Values scheduled with ``executeAt`` are recorded as soon as the call is
+made. Loading a model clears the journal, since every input is back at its
+model default.
+"""
+import inspect
+import threading
+
+# setter -> names of its value arguments; the other arguments (except executeAt) identify the target
+SETTERS = {
+    "set_scada_input_value": ("value",),
+    "set_contactor": ("swControl", "swState"),
+    "set_digital_input_value": ("value",),
+    "set_parameter_value": ("value",),
+}
+SCHEDULE_ARGS = ("executeAt",)
+
+
+class Journaled:
+    """Proxy of the ``hil`` module that records setter calls in ``entries``."""
+
+    def __init__(self, module):
+        self._module = module
+        self._lock = threading.Lock()
+        self._wrapped = {}
+        self._signatures = {}
+        self.entries = {}
+
+    def __getattr__(self, name):
+        wrapped = self._wrapped.get(name)
+        if wrapped is not None:
+            return wrapped
+        attr = getattr(self._module, name)
+        if name in SETTERS:
+            wrapped = self._wrap_setter(name, attr)
+        elif name == "load_model":
+            wrapped = self._wrap_load(attr)
+        else:
+            return attr
+        self._wrapped[name] = wrapped
+        return wrapped
+
+    def _signature(self, function):
+        signature = self._signatures.get(function)
+        if signature is None:
+            signature = self._signatures[function] = inspect.signature(getattr(self._module, function))
+        return signature
+
+    def entry(self, function, /, *args, **kwargs):
+        """Journal (key, value) of the call ``function(*args, **kwargs)``, without making it."""
+        bound = self._signature(function).bind(*args, **kwargs)
+        bound.apply_defaults()
+        value_args = SETTERS[function]
+        target = tuple((k, v) for k, v in bound.arguments.items()
+                       if k not in value_args and k not in SCHEDULE_ARGS)
+        return (function, target), tuple((k, bound.arguments[k]) for k in value_args)
+
+    def _wrap_setter(self, name, func):
+        self._signatures[name] = inspect.signature(func)
+
+        def setter(*args, **kwargs):
+            # bind first: a call that does not match the setter never reaches the HIL
+            key, value = self.entry(name, *args, **kwargs)
+            result = func(*args, **kwargs)
+            with self._lock:
+                self.entries[key] = value
+            return result
+
+        setter.__name__ = name
+        return setter
+
+    def _wrap_load(self, func):
+        def load_model(*args, **kwargs):
+            result = func(*args, **kwargs)
+            self.clear()
+            return result
+
+        return load_model
+
+    def clear(self):
+        with self._lock:
+            self.entries = {}
+
+    def snapshot(self):
+        """Copy of the current entries."""
+        with self._lock:
+            return dict(self.entries)
@@ -0,0 +1,98 @@
+"""
+Pre-resolved I/O endpoints for the busbar tests.
+
+A configured name can be a physical DI/DO or a model signal, and the two are
+accessed through different ``hil`` calls. Trying one call and falling back to
+the other on an exception is fine once, but not on every iteration of a 1 ms
+polling loop. ``IORegistry`` works out the right access method for every
+name once, right after the model is started, and hands out plain callables;
+names that neither method accepts are reported immediately.
+
+Resolution never writes to the model: digital inputs are looked up in the
+model's input list (``hil.available_digital_inputs()``) and model signals
+in its signal lists. With an API that cannot list digital inputs, a name
+that is not a model signal is taken to be a digital input.
+"""
+
+
+class IORegistry:
+    def __init__(self, hil):
+        self.hil = hil
+        self._writers = {}
+        self._readers = {}
+        self._analog = {}
+        self._names = {}
+
+    def _available(self, lister):
+        """Names returned by ``hil.<lister>()`` (cached), or None if the API has no such list."""
+        if lister not in self._names:
+            try:
+                self._names[lister] = set(getattr(self.hil, lister)())
+            except Exception:
+                self._names[lister] = None
+        return self._names[lister]
+
+    def resolve_digital_input(self, name):
+        hil = self.hil
+        inputs = self._available("available_digital_inputs")
+        signals = (self._available("available_digital_signals") or set()) | \
+            (self._available("available_analog_signals") or set())
+        if (inputs is not None and name in inputs) or (inputs is None and name not in signals):
+            self._writers[name] = lambda value, **kwargs: hil.set_digital_input_value(name, value, **kwargs)
+            return
+        if name not in signals:
+            raise RuntimeError(f"Unknown digital input or model signal: {name!r}")
+
+        def write_signal(value, **kwargs):
+            if kwargs:
+                raise RuntimeError(f"Model signal {name!r} cannot be scheduled with executeAt; use a digital input.")
+            hil.set_signal_value(name, float(value))
+        self._writers[name] = write_signal
+
+    def resolve_digital_output(self, name):
+        hil = self.hil
+        try:
+            hil.get_digital_output_value(name)
+            self._readers[name] = lambda: int(hil.get_digital_output_value(name))
+            return
+        except Exception:
+            pass
+        try:
+            hil.get_signal_value(name)
+            self._readers[name] = lambda: int(hil.get_signal_value(name) > 0.5)
+        except Exception as e:
+            raise RuntimeError(f"Unknown digital output or model signal: {name!r}") from e
+
+    def resolve_analog(self, name):
+        hil = self.hil
+        try:
+            hil.get_signal_value(name)
+        except Exception as e:
+            raise RuntimeError(f"Unknown analog signal: {name!r}") from e
+        self._analog[name] = lambda: float(hil.get_signal_value(name))
+
+    def writer(self, name):
+        """``f(value, executeAt=None)`` setting digital input ``name``, or None if not resolved."""
+        return self._writers.get(name)
+
+    def reader(self, name):
+        """``f() -> 0/1`` reading digital output ``name``, or None if not resolved."""
+        return self._readers.get(name)
+
+    def analog(self, name):
+        """``f() -> float`` reading analog signal ``name``, or None if not resolved."""
+        return self._analog.get(name)
+
+    @classmethod
+    def from_config(cls, hil, config):
+        """Resolve every I/O name configured in the busbar test CONFIG."""
+        registry = cls(hil)
+        for key in ("arm_input_name", "internal_fault_di", "external_fault_di"):
+            if config.get(key):
+                registry.resolve_digital_input(config[key])
+        for key in ("trip_output_name", "pickup_output_name"):
+            if config.get(key):
+                registry.resolve_digital_output(config[key])
+        for name in config.get("meas_currents", []) + config.get("meas_voltages", []):
+            registry.resolve_analog(name)
+        return registry
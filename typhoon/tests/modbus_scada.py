@@ -0,0 +1,207 @@
+"""
+SCADA state verification over Modbus TCP.
+
+The HIL probes tell us what the model's switchgear is doing; the substation
+SCADA interface tells us what the operator sees. ``read_station`` reads the
+switchgear state of every bay from the Modbus endpoints and ``verify_scada``
+compares it with the HIL probe snapshot (``station_snapshot``, the same
+probes as ``dc*_state`` / ``cbr_state``).
+
+Register map (per endpoint, bays in the order listed in its config):
+
+- coils ``coil_address`` + ``i * len(STATE_COLUMNS)`` + j: bit j of
+  ``STATE_COLUMNS`` (CB_closed, DC1_open, DC1_closed, DC2_open, DC2_closed)
+  for the i-th bay; all bays are read in one request
+- holding registers ``register_address`` + ``i * 3`` + k: double-point
+  position of CB, DC1, DC2 (1 = open, 2 = closed, 0 = intermediate,
+  3 = faulty); all bays are read in one request
+
+Connections are kept in a per-endpoint pool (``ModbusPool``) and endpoints
+are read concurrently. ``LocalScadaServer`` serves the same map from the
+HIL probes for offline runs (``HIL_BACKEND=sim``).
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+from pyModbusTCP.client import ModbusClient
+from pyModbusTCP.server import ModbusServer
+
+from substation_state import STATE_COLUMNS, diff_state, station_snapshot
+from switching import BAYS
+
+POSITION_DEVICES = ["CB", "DC1", "DC2"]
+OPEN, CLOSED = 1, 2
+
+# TODO: endpoints of the substation SCADA gateway(s) and the bays they serve
+MODBUS_CONFIG = {
+    "timeout_s": 2.0,
+    "pool_size": 2,
+    "endpoints": [
+        {"name": "gateway", "host": "CHANGE_ME", "port": 502, "unit_id": 1, "bays": BAYS,
+         "coil_address": 0, "register_address": 0},
+    ],
+}
+
+
+def local_config(port=5020, groups=2):
+    """MODBUS_CONFIG for ``LocalScadaServer``: the bays split over ``groups`` local endpoints."""
+    endpoints = []
+    for k, bays in enumerate(np.array_split(np.array(BAYS, dtype=object), groups)):
+        endpoints.append({"name": f"local{k}", "host": "127.0.0.1", "port": port + k, "unit_id": 1,
+                          "bays": list(bays), "coil_address": 0, "register_address": 0})
+    return {**MODBUS_CONFIG, "endpoints": endpoints}
+
+
+def positions_from_state(state):
+    """Double-point positions (bays x POSITION_DEVICES) from a bays x STATE_COLUMNS matrix."""
+    state = np.asarray(state, dtype=np.int16)
+    cb = np.where(state[:, 0] == 1, CLOSED, OPEN)
+    dc1 = state[:, 2] * CLOSED + state[:, 1] * OPEN
+    dc2 = state[:, 4] * CLOSED + state[:, 3] * OPEN
+    return np.stack([cb, dc1, dc2], axis=1)
+
+
+class ModbusPool:
+    """Per-endpoint pools of open ``ModbusClient`` connections."""
+
+    def __init__(self, endpoints, size=2, timeout_s=2.0):
+        self.endpoints = {ep["name"]: ep for ep in endpoints}
+        self._pools = {name: queue.LifoQueue() for name in self.endpoints}
+        self._created = {name: 0 for name in self.endpoints}
+        self._lock = threading.Lock()
+        self.size = size
+        self.timeout_s = timeout_s
+
+    def _new_client(self, ep):
+        return ModbusClient(host=ep["host"], port=ep["port"], unit_id=ep.get("unit_id", 1),
+                            timeout=self.timeout_s, auto_open=True, auto_close=False)
+
+    @contextmanager
+    def lease(self, name):
+        """Borrow a connection to endpoint ``name``; creates one while the pool is below ``size``."""
+        pool = self._pools[name]
+        try:
+            client = pool.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created[name] < self.size
+                if create:
+                    self._created[name] += 1
+            client = self._new_client(self.endpoints[name]) if create else pool.get(timeout=self.timeout_s)
+        try:
+            yield client
+        except Exception:
+            # Reset connections that failed mid-request; auto_open reconnects on next use
+            client.close()
+            raise
+        finally:
+            pool.put(client)
+
+    def close(self):
+        for pool in self._pools.values():
+            while not pool.empty():
+                pool.get_nowait().close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _checked(result, client, what):
+    if result is None:
+        raise RuntimeError(f"Modbus {what} failed on {client.host}:{client.port}: {client.last_error_as_txt}")
+    return result
+
+
+def read_endpoint(pool, name):
+    """(bays, state matrix, position matrix) of one endpoint, one request per block."""
+    ep = pool.endpoints[name]
+    bays = list(ep["bays"])
+    with pool.lease(name) as client:
+        coils = _checked(client.read_coils(ep["coil_address"], len(bays) * len(STATE_COLUMNS)),
+                         client, "coil read")
+        regs = _checked(client.read_holding_registers(ep["register_address"], len(bays) * len(POSITION_DEVICES)),
+                        client, "register read")
+    state = np.asarray(coils, dtype=np.int8).reshape(len(bays), len(STATE_COLUMNS))
+    positions = np.asarray(regs, dtype=np.int16).reshape(len(bays), len(POSITION_DEVICES))
+    return bays, state, positions
+
+
+def read_station(pool, bays=BAYS):
+    """State and position matrices for ``bays``, reading all endpoints concurrently."""
+    with ThreadPoolExecutor(max_workers=len(pool.endpoints)) as executor:
+        results = list(executor.map(lambda name: read_endpoint(pool, name), pool.endpoints))
+    rows = {}
+    for ep_bays, state, positions in results:
+        for i, bay in enumerate(ep_bays):
+            rows[bay] = (state[i], positions[i])
+    missing = [bay for bay in bays if bay not in rows]
+    if missing:
+        raise RuntimeError(f"No Modbus endpoint serves bays: {missing}")
+    state = np.stack([rows[bay][0] for bay in bays])
+    positions = np.stack([rows[bay][1] for bay in bays])
+    return state, positions
+
+
+def verify_scada(pool, bays=BAYS, hil_state=None):
+    """
+    Mismatches between SCADA (Modbus) and HIL probe state.
+
+    Returns (bay, item, scada value, hil value) tuples; ``item`` is a
+    STATE_COLUMNS entry for coil bits or "<device> position" for registers.
+    """
+    bays = list(bays)
+    if hil_state is None:
+        hil_state = station_snapshot(bays)
+    state, positions = read_station(pool, bays)
+    mismatches = diff_state(state, hil_state, bays)
+    expected_positions = positions_from_state(hil_state)
+    for i, k in zip(*np.nonzero(positions != expected_positions)):
+        mismatches.append((bays[i], f"{POSITION_DEVICES[k]} position", int(positions[i, k]),
+                           int(expected_positions[i, k])))
+    return mismatches
+
+
+class LocalScadaServer:
+    """
+    Offline Modbus stand-in: serves the register map of ``config`` with the
+    current HIL probe state (call ``sync`` after switching).
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self._servers = [
+            (ep, ModbusServer(host=ep["host"], port=ep["port"], no_block=True)) for ep in config["endpoints"]
+        ]
+
+    def start(self):
+        for _, server in self._servers:
+            server.start()
+        return self
+
+    def stop(self):
+        for _, server in self._servers:
+            server.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def sync(self, state=None):
+        """Publish a bays x STATE_COLUMNS matrix (default: current HIL probe snapshot)."""
+        if state is None:
+            state = station_snapshot(BAYS)
+        rows = dict(zip(BAYS, np.asarray(state)))
+        for ep, server in self._servers:
+            ep_state = np.stack([rows[bay] for bay in ep["bays"]])
+            server.data_bank.set_coils(ep["coil_address"], [bool(v) for v in ep_state.ravel()])
+            server.data_bank.set_holding_registers(
+                ep["register_address"], [int(v) for v in positions_from_state(ep_state).ravel()]
+            )
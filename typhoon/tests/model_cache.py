@@ -0,0 +1,124 @@
+"""
+Content-addressed cache for compiled models.
+
+Compiling the substation schematic dominates CI wall time, yet the inputs
+rarely change. ``compile_cached`` hashes the schematic, any extra inputs
+(e.g. the SCADA panel) and the target hardware settings, and only compiles
+when no artifact exists for that hash. Compiled target directories are kept
+in a shared cache directory, so sessions and pytest workers reuse them.
+
+Compilation of a given schematic is serialised with a file lock: Schematic
+Editor writes its output next to the .tse, so two workers must never
+compile the same model at once.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "hil-testing", "models")
+MANIFEST = "manifest.json"
+
+
+def cache_dir_path(cache_dir=None):
+    return cache_dir or os.environ.get("HIL_MODEL_CACHE_DIR") or DEFAULT_CACHE_DIR
+
+
+@contextmanager
+def file_lock(path):
+    """Exclusive inter-process lock on ``path`` (created if missing)."""
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after ~10 s; keep waiting for long compiles
+                    continue
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _hash_file(h, path):
+    h.update(os.path.basename(path).encode())
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+
+
+def cache_key(model_path, extra_files=(), hw_settings=None) -> str:
+    """SHA-256 over the schematic, extra input files and the hardware settings."""
+    h = hashlib.sha256()
+    _hash_file(h, model_path)
+    for path in extra_files:
+        _hash_file(h, path)
+    h.update(json.dumps(hw_settings, default=str).encode())
+    return h.hexdigest()
+
+
+def _hw_settings(model):
+    try:
+        return list(model.get_hw_settings())
+    except Exception:
+        return None
+
+
+def compile_cached(model, model_path, extra_files=(), cache_dir=None, **compile_kwargs) -> str:
+    """
+    Return the path of a compiled model for ``model_path``, compiling only on a cache miss.
+
+    ``model`` is a SchematicAPI instance with ``model_path`` already loaded and
+    its hardware settings configured (e.g. after ``detect_hw_settings``).
+    The returned path points into the cache and can be passed to
+    ``hil.load_model``.
+    """
+    if getattr(model, "simulated", False):
+        # Offline simulated backend: nothing to compile
+        return model.get_compiled_model_file(model_path)
+
+    cache_dir = cache_dir_path(cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    extra_files = [p for p in extra_files if p]
+    key = cache_key(model_path, extra_files, _hw_settings(model))
+    entry = os.path.join(cache_dir, key)
+    model_id = hashlib.sha256(os.path.abspath(model_path).encode()).hexdigest()[:16]
+
+    with file_lock(os.path.join(cache_dir, f"{model_id}.lock")):
+        manifest_path = os.path.join(entry, MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                return os.path.join(entry, json.load(f)["compiled_file"])
+
+        model.compile(**compile_kwargs)
+        compiled = model.get_compiled_model_file(model_path)
+
+        # Copy the whole target directory; the compiled file references its siblings
+        tmp = tempfile.mkdtemp(prefix=f"{key}.", dir=cache_dir)
+        shutil.copytree(os.path.dirname(compiled), os.path.join(tmp, "target"))
+        with open(os.path.join(tmp, MANIFEST), "w") as f:
+            json.dump({
+                "compiled_file": os.path.join("target", os.path.basename(compiled)),
+                "model_path": os.path.abspath(model_path),
+                "extra_files": [os.path.abspath(p) for p in extra_files],
+                "created_at": datetime.now().isoformat(),
+            }, f, indent=2)
+        os.replace(tmp, entry)
+        return os.path.join(entry, "target", os.path.basename(compiled))
@@ -0,0 +1,179 @@
+"""
+Streaming phasor and RMS estimation with a sliding DFT.
+
+``SlidingPhasor`` keeps the last cycle of a signal in a ring buffer and
+updates, per sample and in constant time,
+
+- the fundamental phasor (magnitude as RMS, angle in degrees)
+- the true RMS over the window (includes DC offset and harmonics)
+
+Samples can be fed in chunks of any size (one sample from a polling loop,
+or slices of a long capture); each chunk is processed with vectorized
+cumulative sums, so the cost is proportional to the chunk length. Results
+for the first cycle, before the window is full, are NaN.
+
+Onset detection compares the fundamental RMS against ``onset_threshold``
+(with ``hysteresis`` for the reset) and records "onset" / "clear"
+``PhasorEvent`` entries. Events are stamped at the end of the window that
+first crossed, i.e. up to one cycle after the physical onset.
+
+The running sums are recomputed exactly from the ring buffer every
+``resync_samples`` samples, so rounding errors do not build up over long
+runs.
+
+    est = SlidingPhasor(rate_hz=10000, onset_threshold=1000.0)
+    for start in range(0, len(ia), 4096):
+        out = est.update(ia[start:start + 4096])
+    est.events  # [PhasorEvent(t=..., kind='onset', value=...)]
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from capture_timing import index_seconds
+
+PhasorChunk = namedtuple("PhasorChunk", ["t", "magnitude", "angle_deg", "rms"])
+PhasorEvent = namedtuple("PhasorEvent", ["t", "kind", "value"])
+
+
+class SlidingPhasor:
+    """
+    Sliding one-window DFT over a sampled signal.
+
+    The window is ``cycles`` periods of ``frequency_hz``, rounded to whole
+    samples at ``rate_hz``. Timestamps are ``t0 + n / rate_hz`` for sample
+    ``n`` unless given explicitly; angles are relative to sample 0.
+    """
+
+    def __init__(self, rate_hz, frequency_hz=60.0, cycles=1, t0=0.0, onset_threshold=None,
+                 hysteresis=0.05, resync_samples=1 << 16):
+        self.rate_hz = float(rate_hz)
+        self.window = int(round(cycles * rate_hz / frequency_hz))
+        if self.window < 2:
+            raise ValueError(f"Sample rate {rate_hz} Hz is too low for {frequency_hz} Hz")
+        self.cycles = cycles
+        self.t0 = t0
+        self.onset_threshold = onset_threshold
+        self.hysteresis = hysteresis
+        self.resync_samples = int(resync_samples)
+        # e^{-j 2 pi k n / N} depends only on n mod N
+        self._rot = np.exp(-2j * np.pi * cycles * np.arange(self.window) / self.window)
+        self._ring = np.zeros(self.window)
+        self._count = 0
+        self._dft = 0j
+        self._sumsq = 0.0
+        self._since_resync = 0
+        self.active = False
+        self.events = []
+
+    def reset(self):
+        """Forget all samples and events."""
+        self._ring[:] = 0.0
+        self._count = 0
+        self._dft = 0j
+        self._sumsq = 0.0
+        self._since_resync = 0
+        self.active = False
+        self.events = []
+
+    def update(self, samples, t=None) -> PhasorChunk:
+        """Feed a chunk of samples; returns the estimates after each of them."""
+        x = np.asarray(samples, dtype=float).ravel()
+        m = x.size
+        n = self.window
+        start = self._count
+        if t is None:
+            t = self.t0 + (start + np.arange(m)) / self.rate_hz
+        else:
+            t = np.asarray(t, dtype=float)
+        if m == 0:
+            empty = np.empty(0)
+            return PhasorChunk(t, empty, empty, empty)
+
+        # Samples leaving the window: the ring (oldest first) followed by the chunk itself
+        pos = start % n
+        if m <= n:
+            old = self._ring[(pos + np.arange(m)) % n]
+        else:
+            old = np.concatenate([np.roll(self._ring, -pos), x[:m - n]])
+        rot = self._rot[(start + np.arange(m)) % n]
+
+        dft = self._dft + np.cumsum((x - old) * rot)
+        sumsq = self._sumsq + np.cumsum(x * x - old * old)
+        self._dft = dft[-1]
+        self._sumsq = sumsq[-1]
+
+        # Store the newest samples in the ring
+        tail = x[-n:]
+        idx = (start + m - tail.size + np.arange(tail.size)) % n
+        self._ring[idx] = tail
+        self._count += m
+        self._since_resync += m
+        if self._since_resync >= self.resync_samples:
+            self._resync()
+
+        magnitude = np.abs(dft) * (np.sqrt(2.0) / n)
+        angle = np.degrees(np.angle(dft))
+        rms = np.sqrt(np.maximum(sumsq, 0.0) / n)
+        warm = start + np.arange(m) + 1 < n
+        if warm.any():
+            magnitude[warm] = np.nan
+            angle[warm] = np.nan
+            rms[warm] = np.nan
+        if self.onset_threshold is not None:
+            self._detect(t, magnitude)
+        return PhasorChunk(t, magnitude, angle, rms)
+
+    def _resync(self):
+        """Recompute the running sums exactly from the ring buffer."""
+        # Ring slot i holds the sample with index i mod N, like the rotation table
+        self._dft = complex(np.sum(self._ring * self._rot))
+        self._sumsq = float(np.sum(self._ring * self._ring))
+        self._since_resync = 0
+
+    def _detect(self, t, magnitude):
+        """Onset/clear events of the fundamental RMS, continuing the state of earlier chunks."""
+        on_level = self.onset_threshold
+        off_level = on_level * (1.0 - self.hysteresis)
+        valid = ~np.isnan(magnitude)
+        above = valid & (magnitude > on_level)
+        below = valid & (magnitude < off_level)
+        i = 0
+        while True:
+            candidates = np.flatnonzero((below if self.active else above)[i:])
+            if not candidates.size:
+                return
+            i += int(candidates[0])
+            self.active = not self.active
+            self.events.append(PhasorEvent(float(t[i]), "onset" if self.active else "clear", float(magnitude[i])))
+
+
+def stream_capture(cap_data, column, frequency_hz=60.0, chunk=4096, **kwargs):
+    """
+    Run a ``SlidingPhasor`` over one captured column in chunks of ``chunk`` samples.
+
+    Returns the estimator (with its events) and the concatenated ``PhasorChunk``.
+    """
+    t = index_seconds(cap_data)
+    x = cap_data[column].to_numpy(dtype=float)
+    rate_hz = (len(t) - 1) / (t[-1] - t[0])
+    est = SlidingPhasor(rate_hz, frequency_hz, t0=t[0], **kwargs)
+    parts = [est.update(x[i:i + chunk], t[i:i + chunk]) for i in range(0, len(x), chunk)]
+    return est, PhasorChunk(*(np.concatenate(field) for field in zip(*parts)))
+
+
+def rms_crosscheck(estimate, reference, min_reference=0.0):
+    """
+    Relative deviation of an RMS estimate from a reference channel (e.g. the
+    model's ``IA_RMS``), over samples where both are valid and the reference
+    is above ``min_reference``.
+
+    Returns {"max": ..., "p99": ..., "median": ...} or None if no sample qualifies.
+    """
+    estimate = np.asarray(estimate, dtype=float)
+    reference = np.asarray(reference, dtype=float)
+    ok = ~np.isnan(estimate) & ~np.isnan(reference) & (np.abs(reference) > min_reference)
+    if not ok.any():
+        return None
+    rel = np.abs(estimate[ok] - reference[ok]) / np.abs(reference[ok])
+    return {"max": float(rel.max()), "p99": float(np.percentile(rel, 99)), "median": float(np.median(rel))}
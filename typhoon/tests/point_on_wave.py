@@ -0,0 +1,32 @@
+"""
+Point-on-wave timing for fault inception.
+
+The DC offset of a fault current, and with it the relay's trip time,
+depends on the voltage angle at which the fault starts. Applying a fault
+"now" from the host gives a random angle. These helpers compute the
+simulation time at which a reference phase (phase A voltage by convention)
+reaches a chosen angle, so the fault can be scheduled there with
+``executeAt`` and every run starts at the same point on the wave.
+
+Angles are in degrees; ``reference_deg`` is the angle of the reference
+phase at simulation time 0 (0 for a source ``sin(2*pi*f*t)``).
+"""
+import math
+
+
+def phase_angle(t, frequency_hz, reference_deg=0.0):
+    """Angle of the reference phase at simulation time ``t``, in [0, 360)."""
+    return (reference_deg + 360.0 * frequency_hz * t) % 360.0
+
+
+def inception_time(t_now, angle_deg, frequency_hz, reference_deg=0.0, lead_s=0.0):
+    """
+    Earliest simulation time at or after ``t_now + lead_s`` at which the
+    reference phase is at ``angle_deg``.
+
+    ``lead_s`` leaves time to upload the ``executeAt`` command before it is due.
+    """
+    period = 1.0 / frequency_hz
+    t_min = t_now + lead_s
+    t_first = ((angle_deg - reference_deg) / 360.0) % 1.0 * period
+    return t_first + math.ceil((t_min - t_first) / period) * period
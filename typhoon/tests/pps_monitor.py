@@ -0,0 +1,188 @@
+"""
+Streaming quality analysis of pulse-per-second (PPS) time synchronisation signals.
+
+``PpsAnalyzer`` takes the ``PTP`` / ``Time Synch`` channels in chunks of any
+size (one capture, or consecutive capture windows of an overnight run),
+extracts rising edges with sub-sample interpolation and keeps only running
+statistics, so memory stays constant however long the run is:
+
+- period error: deviation of each pulse interval from the nominal period
+  (edge-to-edge jitter)
+- offset: deviation of each edge from the nominal pulse grid, and its drift
+  (least-squares slope, s/s) over the run
+- missed pulses (a grid slot without an edge) and extra edges (two edges in
+  one slot)
+
+The grid is anchored at ``reference`` (e.g. 0.0 when timestamps are
+simulation time and pulses are expected on whole seconds) or, by default,
+at the first edge. Timestamps that jump forward by more than a couple of
+samples are treated as a gap in the data (e.g. between capture windows):
+no interval or missed pulse is counted across it.
+
+``check`` compares the statistics against limits and returns a list of
+violations, empty when everything is in spec.
+"""
+import math
+
+import numpy as np
+
+from capture_timing import index_seconds
+from rolling_stats import RollingStats
+
+
+class PpsAnalyzer:
+    """
+    Constant-memory PPS edge statistics.
+
+    Jitter and offset are kept as histograms of absolute values with
+    ``stats_resolution_s`` bins up to ``stats_range_s`` (see ``RollingStats``).
+    """
+
+    def __init__(self, period_s=1.0, threshold=0.5, reference=None, stats_resolution_s=1e-6, stats_range_s=0.01):
+        self.period_s = period_s
+        self.threshold = threshold
+        self.reference = reference
+        self.period_error = RollingStats(stats_resolution_s, stats_range_s)  # |interval - period|
+        self.offset = RollingStats(stats_resolution_s, stats_range_s)        # |edge - grid|
+        self.edges = 0
+        self.missed = 0
+        self.extra = 0
+        self.gaps = 0
+        self.first_edge = None
+        self.latest_edge = None
+        self._last_edge = None
+        self._last_slot = None
+        self._last_sample = None
+        self._dt = None
+        # Running sums for the least-squares offset drift
+        self._n = 0
+        self._sx = self._sy = self._sxx = self._sxy = 0.0
+
+    def feed(self, t, x):
+        """Add a chunk of samples (timestamps in s, values)."""
+        t = np.asarray(t, dtype=float)
+        x = np.asarray(x, dtype=float)
+        if t.size == 0:
+            return
+        if self._dt is None and t.size > 1:
+            self._dt = float(np.median(np.diff(t)))
+        if self._last_sample is not None:
+            t_prev, x_prev = self._last_sample
+            if self._dt is not None and t[0] - t_prev > 2.5 * self._dt:
+                # Data gap: do not bridge intervals or count missed pulses across it
+                self.gaps += 1
+                self._last_slot = None
+                self._last_edge = None
+            else:
+                t = np.concatenate([[t_prev], t])
+                x = np.concatenate([[x_prev], x])
+        self._last_sample = (t[-1], x[-1])
+
+        above = x > self.threshold
+        idx = np.flatnonzero(~above[:-1] & above[1:]) + 1
+        if not idx.size:
+            return
+        x0, x1 = x[idx - 1], x[idx]
+        frac = (self.threshold - x0) / (x1 - x0)
+        for edge in t[idx - 1] + frac * (t[idx] - t[idx - 1]):
+            self._add_edge(float(edge))
+
+    def _add_edge(self, edge):
+        if self.reference is None:
+            self.reference = edge
+        slot = round((edge - self.reference) / self.period_s)
+        offset = edge - (self.reference + slot * self.period_s)
+        if self.first_edge is None:
+            self.first_edge = edge
+        # Regression on time since the first edge keeps the sums well conditioned
+        x = edge - self.first_edge
+
+        if self._last_slot is not None:
+            step = slot - self._last_slot
+            if step <= 0:
+                self.extra += 1
+                return
+            self.missed += step - 1
+            if step == 1:
+                self.period_error.add(abs(edge - self._last_edge - self.period_s))
+        self.edges += 1
+        self.offset.add(abs(offset))
+        self._last_slot = slot
+        self._last_edge = edge
+        self.latest_edge = edge
+
+        self._n += 1
+        self._sx += x
+        self._sy += offset
+        self._sxx += x * x
+        self._sxy += x * offset
+
+    @property
+    def drift(self):
+        """Least-squares slope of the edge offset over time (s/s), None with fewer than 2 edges."""
+        if self._n < 2:
+            return None
+        denom = self._n * self._sxx - self._sx * self._sx
+        if denom <= 0:
+            return None
+        return (self._n * self._sxy - self._sx * self._sy) / denom
+
+    def summary(self):
+        return {
+            "edges": self.edges, "missed": self.missed, "extra": self.extra, "gaps": self.gaps,
+            "span_s": None if self.first_edge is None else self.latest_edge - self.first_edge,
+            "jitter_p99_s": self.period_error.quantile(0.99),
+            "jitter_max_s": self.period_error.max if self.period_error.count else None,
+            "offset_p99_s": self.offset.quantile(0.99),
+            "offset_max_s": self.offset.max if self.offset.count else None,
+            "drift_s_per_s": self.drift,
+        }
+
+    def check(self, max_jitter_s, max_offset_s, max_drift_s_per_s=None, max_missed=0, min_edges=1):
+        """Limit violations as human-readable strings (empty list = pass)."""
+        s = self.summary()
+        violations = []
+        if s["edges"] < min_edges:
+            violations.append(f"only {s['edges']} edges (expected at least {min_edges})")
+        if s["missed"] > max_missed:
+            violations.append(f"{s['missed']} missed pulses (limit {max_missed})")
+        if s["extra"]:
+            violations.append(f"{s['extra']} extra edges")
+        if s["jitter_max_s"] is not None and s["jitter_max_s"] > max_jitter_s:
+            violations.append(f"period jitter {s['jitter_max_s'] * 1e6:.1f} us > {max_jitter_s * 1e6:.1f} us")
+        if s["offset_max_s"] is not None and s["offset_max_s"] > max_offset_s:
+            violations.append(f"offset {s['offset_max_s'] * 1e6:.1f} us > {max_offset_s * 1e6:.1f} us")
+        if max_drift_s_per_s is not None and s["drift_s_per_s"] is not None \
+                and abs(s["drift_s_per_s"]) > max_drift_s_per_s:
+            violations.append(f"offset drift {s['drift_s_per_s'] * 1e6:.3f} ppm > {max_drift_s_per_s * 1e6:.3f} ppm")
+        return violations
+
+
+def analyze_capture(cap_data, column, analyzer=None, t_offset=0.0, chunk=65536, **kwargs):
+    """Feed one captured column into ``analyzer`` (a new ``PpsAnalyzer`` by default) in chunks."""
+    analyzer = analyzer or PpsAnalyzer(**kwargs)
+    t = index_seconds(cap_data) + t_offset
+    x = cap_data[column].to_numpy(dtype=float)
+    for start in range(0, len(t), chunk):
+        analyzer.feed(t[start:start + chunk], x[start:start + chunk])
+    return analyzer
+
+
+def monitor(capture, hil, signal, duration_s, window_s=60.0, rate_hz=10000, analyzer=None, log=None, **kwargs):
+    """
+    Analyze ``signal`` over ``duration_s`` in consecutive capture windows.
+
+    Each window is scheduled shortly after the current simulation time and
+    its samples are stamped in simulation time, so the pulse grid stays
+    continuous across windows (with a data gap where the capture was re-armed).
+    """
+    analyzer = analyzer or PpsAnalyzer(**kwargs)
+    n_windows = int(math.ceil(duration_s / window_s))
+    for k in range(n_windows):
+        t_start = hil.get_sim_time() + 0.05
+        capture.start_capture(window_s, rate=rate_hz, signals=[signal], executeAt=t_start)
+        cap_data = capture.get_capture_results(wait_capture=True)
+        analyze_capture(cap_data, signal, analyzer, t_offset=t_start)
+        if log:
+            log(f"{signal} window {k + 1}/{n_windows}: {analyzer.summary()}")
+    return analyzer
@@ -0,0 +1,270 @@
+"""
+Long-term store of test results for analysis across runs.
+
+Every run appends its result rows (one per fault test or campaign case) to a
+Parquet dataset, hive-partitioned by date, fault type and device:
+
+    test_artifacts/results/date=2026-10-17/fault_type=internal/device=HIL606/<run_id>-0.parquet
+
+Queries go through ``pyarrow.dataset``, so a question like "p99 trip time
+for internal faults last month" only opens the files of the matching
+partitions (partition pruning), skips row groups by their statistics
+(predicate pushdown) and reads only the requested columns (projection):
+
+    store = ResultsStore()
+    since, until = last_month()
+    store.trip_time_quantiles(fault_type="internal", since=since, until=until)
+
+``import_artifact`` loads older result artifacts (e.g. the fault campaign's
+``test_artifacts/campaign_*.parquet`` / ``.csv``) into the store.
+
+CLI:
+    python typhoon/tests/results_store.py --fault-type internal --last-month
+    python typhoon/tests/results_store.py --import test_artifacts/campaign_*.csv
+"""
+import argparse
+import os
+import uuid
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from artifacts import read_artifact, read_artifact_metadata
+from model_cache import cache_key
+
+DEFAULT_ROOT = os.path.join("test_artifacts", "results")
+UNKNOWN = "unknown"
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("date", pa.string()), ("fault_type", pa.string()), ("device", pa.string())]),
+    flavor="hive",
+)
+RESULT_SCHEMA = pa.schema([
+    ("run_id", pa.string()),
+    ("timestamp", pa.timestamp("ms")),
+    ("source", pa.string()),
+    ("test", pa.string()),
+    ("model_version", pa.string()),
+    ("bay", pa.string()),
+    ("fault_select", pa.float64()),
+    ("inception_deg", pa.float64()),
+    ("pickup_s", pa.float64()),
+    ("trip_s", pa.float64()),
+    ("passed", pa.bool_()),
+    ("error", pa.string()),
+    ("date", pa.string()),
+    ("fault_type", pa.string()),
+    ("device", pa.string()),
+])
+
+
+def store_root(root=None):
+    return root or os.environ.get("HIL_RESULTS_STORE") or DEFAULT_ROOT
+
+
+def model_version(model_path, extra_files=()):
+    """Short content hash of the schematic (and e.g. SCADA panel), or None if it is not on disk."""
+    files = [f for f in extra_files if f]
+    if not model_path or not all(os.path.exists(f) for f in [model_path] + files):
+        return None
+    return cache_key(model_path, files)[:12]
+
+
+def last_month(today=None):
+    """(first day, last day) of the calendar month before ``today``."""
+    today = today or date.today()
+    until = today.replace(day=1) - timedelta(days=1)
+    return until.replace(day=1), until
+
+
+def _as_date_str(value):
+    if value is None or isinstance(value, str):
+        return value
+    return value.isoformat()[:10]
+
+
+def result_filter(fault_type=None, device=None, model_version=None, since=None, until=None, source=None):
+    """Dataset filter expression; ``since``/``until`` are inclusive dates (date or "YYYY-MM-DD")."""
+    terms = []
+    for column, value in (("fault_type", fault_type), ("device", device), ("model_version", model_version),
+                          ("source", source)):
+        if value is not None:
+            terms.append(pc.field(column).isin(list(value)) if isinstance(value, (list, tuple))
+                         else pc.field(column) == value)
+    # ISO dates compare correctly as strings, so these prune date= partitions
+    if since is not None:
+        terms.append(pc.field("date") >= _as_date_str(since))
+    if until is not None:
+        terms.append(pc.field("date") <= _as_date_str(until))
+    expr = None
+    for term in terms:
+        expr = term if expr is None else expr & term
+    return expr
+
+
+class ResultsStore:
+    """Partitioned Parquet dataset of result rows; see the module docstring."""
+
+    def __init__(self, root=None):
+        self.root = store_root(root)
+
+    def append(self, rows, source, device=None, model_version=None, timestamp=None, run_id=None):
+        """
+        Add the result rows of one run; returns the run id.
+
+        Row keys are RESULT_SCHEMA column names (missing ones are null);
+        ``device``, ``model_version`` and ``timestamp`` apply to rows that do
+        not set them.
+        """
+        rows = list(rows)
+        if not rows:
+            return None
+        run_id = run_id or f"{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:8]}"
+        timestamp = timestamp or datetime.now()
+        columns = {name: [] for name in RESULT_SCHEMA.names}
+        for row in rows:
+            row = {
+                "run_id": run_id, "source": source, "model_version": model_version,
+                "device": device, "timestamp": timestamp, **row,
+            }
+            row["date"] = _as_date_str(row["timestamp"])
+            for part in ("fault_type", "device"):
+                row[part] = row.get(part) or UNKNOWN
+            for name in RESULT_SCHEMA.names:
+                columns[name].append(row.get(name))
+        table = pa.Table.from_pydict(columns, schema=RESULT_SCHEMA)
+        ds.write_dataset(
+            table, self.root, format="parquet", partitioning=PARTITIONING,
+            basename_template=f"{run_id}-{{i}}.parquet", existing_data_behavior="overwrite_or_ignore",
+        )
+        return run_id
+
+    def dataset(self):
+        return ds.dataset(self.root, format="parquet", partitioning=PARTITIONING, schema=RESULT_SCHEMA)
+
+    def scan(self, columns=None, filter=None, **criteria) -> pa.Table:
+        """Rows matching ``filter`` (or ``result_filter(**criteria)``), with only ``columns``."""
+        if not os.path.isdir(self.root):
+            return RESULT_SCHEMA.empty_table().select(columns or RESULT_SCHEMA.names)
+        if filter is None:
+            filter = result_filter(**criteria)
+        return self.dataset().to_table(columns=columns, filter=filter)
+
+    def trip_times(self, **criteria) -> np.ndarray:
+        """Trip times (s) of the matching rows that tripped."""
+        expr = pc.field("trip_s").is_valid()
+        criteria_expr = result_filter(**criteria)
+        table = self.scan(["trip_s"], expr if criteria_expr is None else criteria_expr & expr)
+        return table["trip_s"].to_numpy()
+
+    def trip_time_quantiles(self, quantiles=(0.5, 0.99), by=None, **criteria) -> pa.Table:
+        """
+        Trip time quantiles (s) and counts of the matching rows, overall or per
+        combination of the ``by`` columns (e.g. ("fault_type", "model_version", "device")).
+        """
+        by = list(by or [])
+        expr = pc.field("trip_s").is_valid()
+        criteria_expr = result_filter(**criteria)
+        table = self.scan(by + ["trip_s"], expr if criteria_expr is None else criteria_expr & expr)
+        names = [f"p{q * 100:g}_s" for q in quantiles]
+        if not by:
+            values = table["trip_s"].to_numpy()
+            row = {"count": [len(values)]}
+            for name, q in zip(names, quantiles):
+                row[name] = [float(np.quantile(values, q)) if len(values) else None]
+            return pa.table(row)
+        frame = table.to_pandas()
+        grouped = frame.groupby(by, dropna=False)["trip_s"]
+        out = grouped.count().rename("count").to_frame()
+        for name, q in zip(names, quantiles):
+            out[name] = grouped.quantile(q)
+        return pa.Table.from_pandas(out.reset_index(), preserve_index=False)
+
+
+def _fault_type_of(test):
+    test = (test or "").lower()
+    return "external" if "external" in test else "internal" if "internal" in test else None
+
+
+def busbar_rows(results):
+    """Store rows from ``BusbarDiffTester.results`` entries."""
+    rows = []
+    for r in results:
+        rows.append({
+            "test": r["test"],
+            "fault_type": _fault_type_of(r["test"]),
+            "inception_deg": r.get("inception_deg"),
+            "pickup_s": None if r.get("pickup_ms") is None else r["pickup_ms"] / 1000.0,
+            "trip_s": None if r.get("trip_ms") is None else r["trip_ms"] / 1000.0,
+            "passed": bool(r["passed"]),
+        })
+    return rows
+
+
+def import_artifact(store, path, model_version=None):
+    """
+    Append the rows of a fault campaign result artifact to ``store``; returns
+    the run id, or None for artifacts without trip times (e.g. waveforms).
+    """
+    table = read_artifact(path)
+    if "trip_s" not in table.column_names:
+        return None
+    try:
+        metadata = read_artifact_metadata(path)
+    except (OSError, ValueError):
+        metadata = {}
+    started = metadata.get("started_at")
+    timestamp = datetime.fromisoformat(started) if started else datetime.fromtimestamp(os.path.getmtime(path))
+    rows = []
+    for row in table.to_pylist():
+        error = row.get("error") or None
+        rows.append({
+            "test": metadata.get("kind", "fault_campaign"),
+            # campaign faults are busbar (FaultBB) faults
+            "fault_type": "internal",
+            "device": row.get("device"),
+            "bay": row.get("bay"),
+            "fault_select": row.get("fault_select"),
+            "trip_s": row.get("trip_s"),
+            "passed": error is None and row.get("trip_s") is not None,
+            "error": error,
+        })
+    run_id = os.path.splitext(os.path.basename(path))[0]
+    return store.append(rows, source="fault_campaign", model_version=model_version, timestamp=timestamp,
+                        run_id=run_id)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query or extend the HIL test results store.")
+    parser.add_argument("--root", help=f"store directory (default: $HIL_RESULTS_STORE or {DEFAULT_ROOT})")
+    parser.add_argument("--import", dest="imports", nargs="+", default=[], metavar="ARTIFACT",
+                        help="add result artifacts to the store")
+    parser.add_argument("--fault-type")
+    parser.add_argument("--device")
+    parser.add_argument("--model-version")
+    parser.add_argument("--since", help="YYYY-MM-DD (inclusive)")
+    parser.add_argument("--until", help="YYYY-MM-DD (inclusive)")
+    parser.add_argument("--last-month", action="store_true")
+    parser.add_argument("--by", nargs="*", default=[], help="group columns, e.g. fault_type model_version device")
+    parser.add_argument("--quantiles", type=float, nargs="+", default=[0.5, 0.99])
+    args = parser.parse_args(argv)
+
+    store = ResultsStore(args.root)
+    for path in args.imports:
+        run_id = import_artifact(store, path)
+        print(f"{path}: {'imported as ' + run_id if run_id else 'no trip times, skipped'}")
+    if args.imports:
+        return 0
+
+    since, until = last_month() if args.last_month else (args.since, args.until)
+    table = store.trip_time_quantiles(args.quantiles, by=args.by, fault_type=args.fault_type, device=args.device,
+                                      model_version=args.model_version, since=since, until=until)
+    print(table.to_pandas().to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,76 @@
+"""
+Constant-memory running statistics, shared by the endurance runs and the
+PPS analyzer.
+"""
+import math
+
+import numpy as np
+
+
+class RollingStats:
+    """
+    Constant-memory statistics of a stream of values (trip times in s).
+
+    Keeps count, mean/variance (Welford), min/max and a fixed-bin histogram
+    for quantiles; ``missed`` counts events that produced no value.
+    """
+
+    def __init__(self, bin_width=0.0005, max_value=1.0):
+        self.bin_width = bin_width
+        self.max_value = max_value
+        self.hist = np.zeros(int(math.ceil(max_value / bin_width)) + 1, dtype=np.int64)
+        self.count = 0
+        self.missed = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        if value is None:
+            self.missed += 1
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        # The last bin collects everything above max_value
+        self.hist[min(int(value / self.bin_width), len(self.hist) - 1)] += 1
+
+    @property
+    def std(self):
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def quantile(self, q):
+        """Approximate quantile (upper edge of the histogram bin); None if empty."""
+        if not self.count:
+            return None
+        i = int(np.searchsorted(np.cumsum(self.hist), q * self.count, side="left"))
+        return min((i + 1) * self.bin_width, self.max)
+
+    def summary(self):
+        return {
+            "count": self.count, "missed": self.missed,
+            "mean_s": self.mean if self.count else None, "std_s": self.std,
+            "min_s": self.min if self.count else None, "max_s": self.max if self.count else None,
+            "p50_s": self.quantile(0.50), "p99_s": self.quantile(0.99),
+        }
+
+    def to_dict(self):
+        return {
+            "bin_width": self.bin_width, "max_value": self.max_value, "hist": self.hist.tolist(),
+            "count": self.count, "missed": self.missed, "mean": self.mean, "m2": self._m2,
+            "min": self.min if self.count else None, "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        stats = cls(d["bin_width"], d["max_value"])
+        stats.hist = np.asarray(d["hist"], dtype=np.int64)
+        stats.count, stats.missed = d["count"], d["missed"]
+        stats.mean, stats._m2 = d["mean"], d["m2"]
+        if d["min"] is not None:
+            stats.min, stats.max = d["min"], d["max"]
+        return stats
@@ -0,0 +1,169 @@
+"""
+Declarative test scenarios compiled into a simulation-time timeline.
+
+A scenario (YAML, see ``typhoon/scenarios``) lists timed steps, an optional
+capture and the checks to run afterwards. Times are in seconds from the
+scenario start:
+
+    name: q3_fault
+    lead_s: 0.5                  # upload margin before the scenario starts
+    capture: {at: 1.0, duration_s: 5, rate_hz: 10000, signals: [S3_fb, ...]}
+    steps:
+      - {at: 0.0, switch: {bays: all, device: CB, action: "On"}}
+      - {at: 1.5, contactor: {name: Grid Fault1.enable, state: true}}
+      - {at: 1.5, fault: {select: 11, clear_after_s: 0.2}}   # input defaults to FAULT_CONFIG
+      - {at: 2.0, scada: {input: Bay 1.CB open, value: 1}}
+      - {at: 2.0, digital: {name: DI_ARM, value: 0}}
+      - {at: 2.0, parameter: {path: FaultBB, param: Rfault, value: 0.01}}
+    expect:
+      - {reaction: {cause: Grid Fault1.enable_fb, effect: S3_fb, effect_edge: falling, max_s: 0.1}}
+      - {edge: {signal: S3_fb, edge: falling, within: [1.5, 1.7]}}
+      - {state: {cb_closed: false, dc1_closed: true}}
+
+``compile_scenario`` expands every step into ``Action`` entries (switching
+steps become their staged SCADA pulses, see ``switching_pulses``), and
+``run_scenario`` uploads all of them at once with ``executeAt``, so the
+scenario runs on the device timeline with a single host wait for the
+capture (or the end of the timeline). Edge checks use the capture, state
+checks the probe snapshot after the timeline has ended.
+"""
+from collections import namedtuple
+
+import yaml
+
+from busbar_faults import FAULT_CONFIG
+from hil_backend import capture, hil
+from substation_state import diff_state, expected_state, station_snapshot
+from switching import BAYS, SwitchCommand, switching_pulses
+from transitions import find_transitions
+
+Action = namedtuple("Action", ["t", "function", "args"])
+CaptureSpec = namedtuple("CaptureSpec", ["at", "duration_s", "rate_hz", "signals"])
+Scenario = namedtuple("Scenario", ["name", "lead_s", "actions", "capture", "checks", "end_s"])
+CheckResult = namedtuple("CheckResult", ["check", "ok", "detail"])
+ScenarioResult = namedtuple("ScenarioResult", ["scenario", "t0", "cap_data", "checks"])
+
+STEP_KINDS = ("switch", "scada", "contactor", "digital", "parameter", "fault")
+CHECK_KINDS = ("reaction", "edge", "state")
+# time given to the last step to take effect before state checks
+DEFAULT_SETTLE_S = 0.3
+
+
+def load_scenario(path):
+    """Compile the scenario in YAML file ``path``."""
+    with open(path) as f:
+        return compile_scenario(yaml.safe_load(f))
+
+
+def _switch_commands(spec):
+    if "commands" in spec:
+        return [SwitchCommand(*cmd) for cmd in spec["commands"]]
+    bays = BAYS if spec.get("bays", "all") == "all" else spec["bays"]
+    return [SwitchCommand(bay, spec["device"], spec["action"]) for bay in bays]
+
+
+def _compile_step(t, kind, spec):
+    """Actions of one step and the time it is done."""
+    if kind == "switch":
+        writes, t_done = switching_pulses(_switch_commands(spec), t, spec.get("pulse_ms", 100),
+                                          spec.get("settle_ms", 250))
+        return [Action(t_w, "set_scada_input_value", (name, value)) for t_w, name, value in writes], t_done
+    if kind == "scada":
+        return [Action(t, "set_scada_input_value", (spec["input"], spec["value"]))], t
+    if kind == "contactor":
+        return [Action(t, "set_contactor", (spec["name"], spec.get("control", True), spec["state"]))], t
+    if kind == "digital":
+        return [Action(t, "set_digital_input_value", (spec["name"], spec["value"]))], t
+    if kind == "parameter":
+        return [Action(t, "set_parameter_value", (spec["path"], spec["param"], spec["value"]))], t
+    # fault: select a busbar fault type, optionally clearing it again
+    select_input = spec.get("input", FAULT_CONFIG["fault_select_input"])
+    actions = [Action(t, "set_scada_input_value", (select_input, spec["select"]))]
+    if spec.get("clear_after_s") is not None:
+        t += spec["clear_after_s"]
+        actions.append(Action(t, "set_scada_input_value", (select_input, 0)))
+    return actions, t
+
+
+def compile_scenario(spec):
+    """Scenario (time-ordered actions, capture, checks) from a parsed YAML document."""
+    name = spec.get("name", "scenario")
+    actions = []
+    end_s = 0.0
+    for i, step in enumerate(spec.get("steps", [])):
+        kinds = [k for k in step if k != "at"]
+        if len(kinds) != 1 or kinds[0] not in STEP_KINDS or "at" not in step:
+            raise ValueError(f"{name}: step {i} needs 'at' and one of {STEP_KINDS}, got {sorted(step)}")
+        step_actions, t_done = _compile_step(float(step["at"]), kinds[0], step[kinds[0]])
+        actions += step_actions
+        end_s = max(end_s, t_done)
+    # stable sort keeps the order of writes scheduled for the same instant
+    actions.sort(key=lambda a: a.t)
+
+    cap = None
+    if spec.get("capture"):
+        c = spec["capture"]
+        cap = CaptureSpec(float(c.get("at", 0.0)), float(c["duration_s"]), c.get("rate_hz", 10000),
+                          list(c["signals"]))
+        end_s = max(end_s, cap.at + cap.duration_s)
+
+    checks = []
+    for i, check in enumerate(spec.get("expect", [])):
+        if len(check) != 1 or next(iter(check)) not in CHECK_KINDS:
+            raise ValueError(f"{name}: check {i} must be one of {CHECK_KINDS}, got {sorted(check)}")
+        kind, args = next(iter(check.items()))
+        if kind != "state" and cap is None:
+            raise ValueError(f"{name}: {kind} check {i} needs a capture")
+        checks.append((kind, args))
+
+    return Scenario(name, float(spec.get("lead_s", 0.5)), actions, cap, checks,
+                    end_s + float(spec.get("settle_s", DEFAULT_SETTLE_S)))
+
+
+def _check(kind, args, edges, t_capture):
+    """CheckResult of one check; capture times are shifted to scenario time by ``t_capture``."""
+    if kind == "reaction":
+        reaction = edges.reaction_time(args["cause"], args["effect"], args.get("cause_edge", "rising"),
+                                       args.get("effect_edge", "rising"))
+        label = f"{args['cause']} -> {args['effect']}"
+        if reaction is None:
+            return CheckResult(kind, False, f"{label}: no reaction")
+        return CheckResult(kind, reaction <= args["max_s"], f"{label}: {reaction * 1000:.1f} ms "
+                                                            f"(limit {args['max_s'] * 1000:.1f} ms)")
+    if kind == "edge":
+        t_from, t_to = args["within"]
+        times = edges.edges(args["signal"], args.get("edge", "both"),
+                            during=(t_from - t_capture, t_to - t_capture)) + t_capture
+        return CheckResult(kind, times.size > 0, f"{args['signal']} {args.get('edge', 'both')} edges in "
+                                                 f"[{t_from}, {t_to}] s: {times.round(4).tolist()}")
+    bays = BAYS if args.get("bays", "all") == "all" else args["bays"]
+    expected = expected_state(bays, args.get("cb_closed"), args.get("dc1_closed"), args.get("dc2_closed"))
+    mismatches = diff_state(station_snapshot(bays), expected, bays)
+    return CheckResult(kind, not mismatches, f"mismatches (bay, device, actual, expected): {mismatches}")
+
+
+def run_scenario(scenario):
+    """
+    Upload every action with ``executeAt``, wait once for the capture and the
+    end of the timeline, then evaluate the checks.
+    """
+    t0 = hil.get_sim_time() + scenario.lead_s
+    if scenario.capture:
+        c = scenario.capture
+        capture.start_capture(c.duration_s, rate=c.rate_hz, signals=c.signals, executeAt=t0 + c.at)
+    for action in scenario.actions:
+        getattr(hil, action.function)(*action.args, executeAt=t0 + action.t)
+
+    cap_data = capture.get_capture_results(wait_capture=True) if scenario.capture else None
+    remaining_s = t0 + scenario.end_s - hil.get_sim_time()
+    if remaining_s > 0:
+        hil.wait_msec(remaining_s * 1000)
+
+    edges = find_transitions(cap_data) if cap_data is not None else None
+    t_capture = scenario.capture.at if scenario.capture else 0.0
+    checks = [_check(kind, args, edges, t_capture) for kind, args in scenario.checks]
+    return ScenarioResult(scenario, t0, cap_data, checks)
+
+
+def failed_checks(result):
+    return [c for c in result.checks if not c.ok]
@@ -0,0 +1,132 @@
+"""
+Continuous background sampling of analog model signals.
+
+``SignalSampler`` reads all configured signals in one batched call per tick on
+a background thread and stores them in a preallocated NumPy ring buffer, so
+the memory footprint is fixed no matter how long the run is. Labelled
+checkpoints ("prefault", "fault_applied", ...) become event markers on the
+sample timeline instead of extra blocking reads in the test flow.
+
+Note: the sampler thread calls the HIL API concurrently with the test
+thread; keep the rate moderate (a few hundred Hz) so it does not compete
+with time-critical calls.
+"""
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+def batch_reader(hil, signals):
+    """Callable reading all ``signals`` in one API call if the API supports it."""
+    signals = list(signals)
+    if hasattr(hil, "read_analog_signals"):
+        return lambda: hil.read_analog_signals(signals=signals)
+
+    def read_each():
+        return [hil.get_signal_value(name) for name in signals]
+    return read_each
+
+
+class SignalSampler:
+    """
+    Fixed-rate background sampler with a ring buffer and event markers.
+
+    ``read`` returns one value per signal; it defaults to a batched
+    ``hil`` read. Once ``capacity`` samples are stored, the oldest are
+    overwritten.
+    """
+
+    def __init__(self, signals, rate_hz=200.0, capacity=100_000, read=None, hil=None, max_markers=10_000):
+        self.signals = list(signals)
+        self.period = 1.0 / rate_hz
+        self.capacity = int(capacity)
+        self._read = read or batch_reader(hil, self.signals)
+        self._times = np.full(self.capacity, np.nan)
+        self._values = np.full((self.capacity, len(self.signals)), np.nan)
+        self._count = 0
+        self.markers = deque(maxlen=max_markers)
+        self.overruns = 0
+        self.read_errors = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._t0 = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    @property
+    def count(self):
+        """Number of samples taken (including overwritten ones)."""
+        return self._count
+
+    def start(self, t0=None):
+        """Start sampling; timestamps are seconds since ``t0`` (a ``time.perf_counter()`` value)."""
+        self._t0 = time.perf_counter() if t0 is None else t0
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="SignalSampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def mark(self, label):
+        """Place an event marker at the current time."""
+        self.markers.append((time.perf_counter() - self._t0, label))
+
+    def _run(self):
+        next_tick = time.perf_counter()
+        while not self._stop.is_set():
+            t = time.perf_counter() - self._t0
+            try:
+                values = self._read()
+            except Exception:
+                self.read_errors += 1
+                values = np.nan
+            with self._lock:
+                i = self._count % self.capacity
+                self._times[i] = t
+                self._values[i] = values
+                self._count += 1
+
+            next_tick += self.period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                # Fell behind: skip the missed ticks instead of bursting to catch up
+                missed = int(-delay // self.period) + 1
+                self.overruns += missed
+                next_tick += missed * self.period
+
+    def snapshot(self):
+        """Copy of the buffered samples in time order: (times, values[n, signals])."""
+        with self._lock:
+            n = min(self._count, self.capacity)
+            start = self._count % self.capacity if self._count > self.capacity else 0
+            order = (np.arange(n) + start) % self.capacity
+            return self._times[order], self._values[order]
+
+    def to_columns(self, time_field="t_since_start_s", label_field="label"):
+        """Buffered samples as {column: array} with markers folded into a label column."""
+        times, values = self.snapshot()
+        labels = np.full(len(times), "", dtype=object)
+        for t_mark, label in self.markers:
+            if not len(times) or t_mark < times[0] - self.period:
+                continue  # marker older than the buffered window
+            i = int(np.searchsorted(times, t_mark, side="left"))
+            if i < len(times):
+                labels[i] = f"{labels[i]};{label}" if labels[i] else label
+        columns = {time_field: times, label_field: labels}
+        for j, name in enumerate(self.signals):
+            columns[name] = values[:, j]
+        return columns
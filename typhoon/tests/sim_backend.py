@@ -0,0 +1,632 @@
+"""
+Offline simulated HIL backend.
+
+A NumPy stand-in for the parts of ``typhoon.api.hil`` / ``typhoon.test.capture``
+used by this suite, so the tests and their helpers run in CI containers
+without a HIL device or VHIL install. Select it with ``HIL_BACKEND=sim``
+(see ``hil_backend.py``).
+
+Model
+-----
+- 10 feeder bays + "HV Bay 1" (source) on one busbar. Every bay has DC1,
+  DC2 and a CB operated by "<bay>.<dev> close/open" SCADA pulses and
+  reported on Digital Probe1-5 (see ``substation_state``). The model starts
+  energised, like the substation model: DC1 and every CB closed, DC2 open.
+- Internal (busbar) faults: ``FaultBB.Fault select`` != 0, contactor
+  "Grid Fault1.enable" or DI ``DI_FAULT_INTERNAL``. External (feeder)
+  fault: DI ``DI_FAULT_EXTERNAL`` on Bay 1.
+- Busbar differential relay: picks up and trips after fixed delays for an
+  energised internal fault (and only while ``DI_ARM`` is set, default on);
+  the trip opens every CB after the breaker operating time.
+- Currents: load current through every closed feeder, balanced by the HV
+  bay; fault current with a DC offset that depends on the inception angle.
+  ``<bay>.IA/IB/IC``, ``Three-phase Meter1.IA`` (HV bay), ``IA_RMS`` and the
+  busbar template signals ``Ia_bus``.. ``Vc_bus``.
+- ``PTP`` / ``Time Synch``: 1 PPS pulses with a few microseconds of jitter.
+
+Clock
+-----
+By default the clock is virtual: waits (``wait_msec``, captures) jump ahead
+without sleeping, so the suite runs much faster than real time. Output reads
+also advance it by the host time spent since the previous read, so scripts
+that poll outputs against ``time.perf_counter`` see the model evolve as on a
+device. ``SimHil(realtime_factor=1.0)`` follows the wall clock throughout.
+
+Everything is derived from the timestamped input events, so any signal can
+be evaluated on an arbitrary time grid in one vectorized call.
+"""
+import heapq
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+BAYS = ["HV Bay 1"] + [f"Bay {i}" for i in range(1, 11)]
+SOURCE_BAY = "HV Bay 1"
+DEVICES = ["CB", "DC1", "DC2"]
+DIGITAL_INPUTS = ["DI_ARM", "DI_FAULT_INTERNAL", "DI_FAULT_EXTERNAL"]
+CONTACTORS = ["Grid Fault1.enable"]
+FAULT_SELECT_INPUT = "FaultBB.Fault select"
+SCADA_INPUTS = [f"{bay}.{dev} {op}" for bay in BAYS for dev in DEVICES for op in ("close", "open")]
+SCADA_INPUTS.append(FAULT_SELECT_INPUT)
+
+DEFAULTS = {
+    "frequency_hz": 60.0,
+    "dc_operate_s": 0.020,
+    "cb_close_s": 0.050,
+    "cb_open_s": 0.040,
+    "relay_pickup_s": 0.006,
+    "relay_trip_s": 0.022,
+    "load_current_a": 100.0,
+    "load_angle_deg": -25.0,
+    "fault_current_a": 2000.0,
+    "fault_angle_deg": -80.0,
+    "fault_tau_s": 0.03,
+    "voltage_v": 11000.0 * math.sqrt(2.0 / 3.0),
+    "fault_voltage_sag": 0.9,
+    "pps_width_s": 0.1,
+    "pps_jitter_s": 2e-6,
+}
+
+_PHASES = {"A": 0.0, "B": -2.0 * math.pi / 3.0, "C": 2.0 * math.pi / 3.0}
+_BAY_CURRENTS = {f"{bay}.I{ph}": (bay, ph) for bay in BAYS for ph in _PHASES}
+_PROBES = {  # probe number -> (device, value when closed)
+    1: ("CB", 0),
+    2: ("DC1", 0),
+    3: ("DC1", 1),
+    4: ("DC2", 0),
+    5: ("DC2", 1),
+}
+
+
+class SimApiError(Exception):
+    """Raised for unknown names, like the HIL API does."""
+
+
+def _pseudo_random(k, seed):
+    """Deterministic, vectorizable noise in [-0.5, 0.5) per integer k."""
+    x = np.sin((np.asarray(k, dtype=float) + seed) * 12.9898) * 43758.5453
+    return x - np.floor(x) - 0.5
+
+
+class _Step:
+    """Piecewise-constant signal: value[i] holds from time[i] on."""
+
+    def __init__(self, initial=0.0):
+        self.times = [-math.inf]
+        self.values = [float(initial)]
+
+    def set(self, t, value):
+        value = float(value)
+        if value == self.values[-1]:
+            return
+        if t == self.times[-1]:
+            self.values[-1] = value
+        else:
+            self.times.append(t)
+            self.values.append(value)
+
+    def at(self, t):
+        times = np.asarray(self.times)
+        i = np.searchsorted(times, t, side="right") - 1
+        return np.asarray(self.values)[i]
+
+    def intervals(self):
+        """(start, end) intervals where the value is non-zero."""
+        out = []
+        for i, v in enumerate(self.values):
+            if v:
+                end = self.times[i + 1] if i + 1 < len(self.times) else math.inf
+                out.append((self.times[i], end))
+        return out
+
+
+class _Replay:
+    """
+    Input events replayed in time order into ``_Step`` timelines, adding the
+    derived device and relay events.
+
+    New inputs never execute before the current sim time, so everything
+    before it is final: ``update`` keeps the state at the last checkpoint
+    and only replays the events after it. The pending events are replayed
+    again after every change.
+    """
+
+    def __init__(self, params):
+        self.params = params
+        self.steps = {}
+        self.parameters = {}  # (path, param) -> [(t, value)]
+        self.queue = []       # (t, derived, seq, kind, name, value)
+        self.fault_inputs = {"FaultBB.enable_fb": 0.0, "Grid Fault1.enable": 0.0, "DI_FAULT_INTERNAL": 0.0}
+        self.scada_last = {}
+        self.epoch = 0
+        self.seq = 0
+        self.t = -math.inf    # checkpoint time
+        for bay in BAYS:
+            self.step(f"{bay}.CB", 1.0)
+            self.step(f"{bay}.DC1", 1.0)
+            self.step(f"{bay}.DC2")
+        self.step("DI_ARM", 1.0)
+        for name in ("internal_fault", "external_fault", "DO_PICKUP", "DO_TRIP"):
+            self.step(name)
+        self._checkpoint = self._save()
+
+    def step(self, name, initial=0.0):
+        if name not in self.steps:
+            self.steps[name] = _Step(initial)
+        return self.steps[name]
+
+    def _save(self):
+        return {
+            "steps": {name: (len(step.times), step.values[-1]) for name, step in self.steps.items()},
+            "parameters": {key: len(history) for key, history in self.parameters.items()},
+            "queue": [e for e in self.queue if e[1]],
+            "fault_inputs": dict(self.fault_inputs),
+            "scada_last": dict(self.scada_last),
+            "epoch": self.epoch,
+            "seq": self.seq,
+        }
+
+    def _restore(self, saved):
+        for name in list(self.steps):
+            if name not in saved["steps"]:
+                del self.steps[name]
+                continue
+            n, last = saved["steps"][name]
+            step = self.steps[name]
+            del step.times[n:], step.values[n:]
+            step.values[-1] = last
+        for key in list(self.parameters):
+            if key not in saved["parameters"]:
+                del self.parameters[key]
+            else:
+                del self.parameters[key][saved["parameters"][key]:]
+        self.queue = list(saved["queue"])
+        heapq.heapify(self.queue)
+        self.fault_inputs = dict(saved["fault_inputs"])
+        self.scada_last = dict(saved["scada_last"])
+        self.epoch = saved["epoch"]
+        self.seq = saved["seq"]
+
+    def update(self, events, now):
+        """
+        Rebuild the timelines for the input ``events`` since the last checkpoint
+        and move the checkpoint to ``now``. Returns the events still pending.
+        """
+        self._restore(self._checkpoint)
+        for t, seq, kind, name, value in events:
+            heapq.heappush(self.queue, (t, 0, seq, kind, name, value))
+        self._run(until=now)
+        self.t = now
+        self._checkpoint = self._save()
+        self._run()
+        return [e for e in events if e[0] >= now]
+
+    def _push(self, t, kind, name, value):
+        heapq.heappush(self.queue, (t, 1, self.seq, kind, name, value))
+        self.seq += 1
+
+    def _run(self, until=math.inf):
+        """Process the queued events before ``until``."""
+        p = self.params
+        step = self.step
+        internal = self.steps["internal_fault"]
+        external = self.steps["external_fault"]
+        pickup = self.steps["DO_PICKUP"]
+        trip = self.steps["DO_TRIP"]
+        fault_inputs = self.fault_inputs
+        while self.queue and self.queue[0][0] < until:
+            t, _, _, kind, name, value = heapq.heappop(self.queue)
+            if kind == "scada":
+                rising = value and not self.scada_last.get(name)
+                self.scada_last[name] = value
+                if name == FAULT_SELECT_INPUT:
+                    fault_inputs["FaultBB.enable_fb"] = float(value != 0)
+                    step("FaultBB.enable_fb").set(t, value != 0)
+                elif rising:
+                    target, op = name.rsplit(" ", 1)
+                    device = target.rsplit(".", 1)[1]
+                    delay = p["dc_operate_s"] if device.startswith("DC") else (
+                        p["cb_close_s"] if op == "close" else p["cb_open_s"])
+                    self._push(t + delay, "device", target, float(op == "close"))
+            elif kind == "device":
+                bay, device = name.rsplit(".", 1)
+                if device == "CB" and value:
+                    # Interlocking: a CB only closes onto a closed disconnector
+                    if not (step(f"{bay}.DC1").values[-1] or step(f"{bay}.DC2").values[-1]):
+                        continue
+                step(name).set(t, value)
+            elif kind == "input":
+                step(name).set(t, value)
+                if name in fault_inputs:
+                    fault_inputs[name] = value
+                if name == "DI_FAULT_EXTERNAL":
+                    external.set(t, value)
+            elif kind == "parameter":
+                self.parameters.setdefault(name, []).append((t, value))
+            elif kind == "relay":
+                if value != self.epoch:
+                    continue  # fault cleared in the meantime
+                if name == "pickup":
+                    pickup.set(t, 1)
+                else:
+                    trip.set(t, 1)
+                    for bay in BAYS:
+                        self._push(t + p["cb_open_s"], "device", f"{bay}.CB", 0.0)
+
+            fault_on = any(fault_inputs.values())
+            if fault_on and not internal.values[-1]:
+                internal.set(t, 1)
+                self.epoch += 1
+                energised = step(f"{SOURCE_BAY}.CB").values[-1]
+                if energised and step("DI_ARM").values[-1]:
+                    self._push(t + p["relay_pickup_s"], "relay", "pickup", float(self.epoch))
+                    self._push(t + p["relay_trip_s"], "relay", "trip", float(self.epoch))
+            elif not fault_on and internal.values[-1]:
+                internal.set(t, 0)
+                self.epoch += 1
+                pickup.set(t, 0)
+                trip.set(t, 0)
+
+
+class SimHil:
+    """Simulated ``hil`` module (the subset of calls used by the suite)."""
+
+    def __init__(self, realtime_factor=None, **params):
+        self.params = dict(DEFAULTS, **params)
+        self.realtime_factor = realtime_factor
+        self.reset()
+
+    # ----- clock -----
+    def reset(self):
+        self._t = 0.0
+        self._wall0 = self._wall_read = time.perf_counter()
+        self._events = []
+        self._seq = 0
+        self._timeline = None
+        self._replay = _Replay(self.params)
+        self.running = False
+        self.model_file = None
+
+    def now(self):
+        if self.realtime_factor:
+            return self._t + (time.perf_counter() - self._wall0) * self.realtime_factor
+        return self._t
+
+    def _read_time(self):
+        """Sim time of an output read; the virtual clock catches up with the host time since the last read."""
+        if not self.realtime_factor:
+            wall = time.perf_counter()
+            self._t += wall - self._wall_read
+            self._wall_read = wall
+        return self.now()
+
+    def advance_to(self, t):
+        if self.realtime_factor:
+            delay = (t - self.now()) / self.realtime_factor
+            if delay > 0:
+                time.sleep(delay)
+        else:
+            self._t = max(self._t, t)
+
+    def get_sim_time(self):
+        return self.now()
+
+    def wait_msec(self, msec):
+        self.advance_to(self.now() + msec / 1000.0)
+
+    def wait_sec(self, sec):
+        self.advance_to(self.now() + sec)
+
+    # ----- model lifecycle -----
+    def load_model(self, file=None, vhil_device=False, **kwargs):
+        self.reset()
+        self.model_file = file
+        return True
+
+    def start_simulation(self):
+        if self._replay.t > 0.0:
+            # restarted: the model starts over from its initial state
+            self._events = []
+            self._timeline = None
+            self._replay = _Replay(self.params)
+        self.running = True
+        self._t = 0.0
+        self._wall0 = self._wall_read = time.perf_counter()
+
+    def stop_simulation(self):
+        self.running = False
+
+    def release_hardware(self):
+        pass
+
+    def get_device_features(self, device=None, conf_id=None, feature=None):
+        return 4 if feature == "Standard Processing Cores" else None
+
+    def available_scada_inputs(self):
+        return list(SCADA_INPUTS)
+
+    def available_digital_inputs(self):
+        return list(DIGITAL_INPUTS)
+
+    def available_contactors(self):
+        return list(CONTACTORS)
+
+    def available_analog_signals(self):
+        return sorted(self._analog_names())
+
+    def available_digital_signals(self):
+        return sorted(self._digital_names())
+
+    # ----- inputs -----
+    def _event(self, kind, name, value, execute_at=None):
+        # executeAt in the past executes immediately
+        t = self.now() if execute_at is None else max(float(execute_at), self.now())
+        if kind != "parameter":
+            value = float(value)
+        self._events.append((t, self._seq, kind, name, value))
+        self._seq += 1
+        self._timeline = None
+
+    def set_scada_input_value(self, scadaInputName, value, executeAt=None):
+        if scadaInputName not in SCADA_INPUTS:
+            raise SimApiError(f"Unknown SCADA input: {scadaInputName!r}")
+        self._event("scada", scadaInputName, value, executeAt)
+
+    def set_contactor(self, name, swControl=True, swState=True, executeAt=None):
+        if name not in CONTACTORS:
+            raise SimApiError(f"Unknown contactor: {name!r}")
+        self._event("input", name, bool(swState), executeAt)
+
+    def set_digital_input_value(self, name, value, executeAt=None):
+        if name not in DIGITAL_INPUTS:
+            raise SimApiError(f"Unknown digital input: {name!r}")
+        self._event("input", name, value, executeAt)
+
+    def set_signal_value(self, name, value):
+        raise SimApiError(f"Signal {name!r} is not writable in the simulated model")
+
+    def set_parameter_value(self, path, param, value, executeAt=None):
+        self._event("parameter", (path, param), value, executeAt)
+
+    @property
+    def parameters(self):
+        """Model parameter values in effect now, {(path, param): value}."""
+        self.timeline
+        now = self.now()
+        values = {}
+        for key, history in self._replay.parameters.items():
+            for t, value in history:
+                if t > now:
+                    break
+                values[key] = value
+        return values
+
+    # ----- outputs -----
+    def get_signal_value(self, name):
+        return float(self.evaluate([name], np.array([self._read_time()]))[name][0])
+
+    def read_analog_signal(self, name):
+        return self.get_signal_value(name)
+
+    def read_analog_signals(self, signals):
+        t = np.array([self._read_time()])
+        values = self.evaluate(signals, t)
+        return [float(values[name][0]) for name in signals]
+
+    def read_digital_signal(self, name, device=0):
+        if name not in self._digital_names():
+            raise SimApiError(f"Unknown digital signal: {name!r}")
+        return int(self.get_signal_value(name) > 0.5)
+
+    def read_digital_signals(self, signals):
+        unknown = set(signals) - self._digital_names()
+        if unknown:
+            raise SimApiError(f"Unknown digital signals: {sorted(unknown)!r}")
+        return [int(v > 0.5) for v in self.read_analog_signals(signals)]
+
+    def get_digital_output_value(self, name):
+        if name not in ("DO_TRIP", "DO_PICKUP"):
+            raise SimApiError(f"Unknown digital output: {name!r}")
+        return int(self.get_signal_value(name) > 0.5)
+
+    # ----- model -----
+    def _digital_names(self):
+        names = {f"{bay}.Digital Probe{n}" for bay in BAYS for n in _PROBES}
+        names.update(["S3_fb", "Grid Fault1.enable_fb", "FaultBB.enable_fb", "DO_TRIP", "DO_PICKUP",
+                      "PTP", "Time Synch"])
+        names.update(DIGITAL_INPUTS)
+        return names
+
+    def _analog_names(self):
+        names = set(_BAY_CURRENTS)
+        names.update(["Three-phase Meter1.IA", "Three-phase Meter1.IA_RMS"])
+        names.update(f"I{ph.lower()}_bus" for ph in _PHASES)
+        names.update(f"V{ph.lower()}_bus" for ph in _PHASES)
+        return names
+
+    @property
+    def timeline(self):
+        if self._timeline is None:
+            self._events = self._replay.update(self._events, self.now())
+            self._timeline = self._replay.steps
+        return self._timeline
+
+    def _fault_current(self, t, intervals, energised, ph):
+        """Fault current of one phase with inception-dependent DC offset."""
+        p = self.params
+        w = 2.0 * math.pi * p["frequency_hz"]
+        theta = math.radians(p["fault_angle_deg"])
+        out = np.zeros_like(t)
+        for t_on, t_off in intervals:
+            active = (t >= t_on) & (t < t_off)
+            if not active.any():
+                continue
+            tt = t[active]
+            dc = np.sin(w * t_on + ph + theta) * np.exp(-(tt - t_on) / p["fault_tau_s"])
+            out[active] = p["fault_current_a"] * (np.sin(w * tt + ph + theta) - dc)
+        return out * energised
+
+    def evaluate(self, names, t):
+        """Values of ``names`` at sim times ``t`` as {name: ndarray}."""
+        p = self.params
+        steps = self.timeline
+        t = np.asarray(t, dtype=float)
+        w = 2.0 * math.pi * p["frequency_hz"]
+        out = {}
+        cache = {}
+
+        def state(name):
+            if name not in cache:
+                cache[name] = steps[name].at(t) if name in steps else np.zeros_like(t)
+            return cache[name]
+
+        def bay_current(bay, ph_name):
+            key = ("I", bay, ph_name)
+            if key in cache:
+                return cache[key]
+            ph = _PHASES[ph_name]
+            energised = state(f"{SOURCE_BAY}.CB")
+            load = p["load_current_a"] * np.sin(w * t + ph + math.radians(p["load_angle_deg"]))
+            if bay == SOURCE_BAY:
+                n_loads = sum(state(f"{b}.CB") for b in BAYS if b != SOURCE_BAY)
+                i = load * n_loads * energised
+                i = i + self._fault_current(t, steps["internal_fault"].intervals(), energised, ph)
+                i = i + self._fault_current(t, steps["external_fault"].intervals(), energised, ph)
+            else:
+                i = -load * state(f"{bay}.CB") * energised
+                if bay == "Bay 1":
+                    i = i - self._fault_current(t, steps["external_fault"].intervals(),
+                                                energised * state("Bay 1.CB"), ph)
+            cache[key] = i
+            return i
+
+        for name in names:
+            if ".Digital Probe" in name:
+                bay, probe = name.rsplit(".Digital Probe", 1)
+                device, closed_value = _PROBES[int(probe)]
+                closed = state(f"{bay}.{device}")
+                out[name] = closed if closed_value else 1.0 - closed
+            elif name == "S3_fb":
+                out[name] = state("Bay 3.CB")
+            elif name == "Grid Fault1.enable_fb":
+                out[name] = state("Grid Fault1.enable")
+            elif name in ("FaultBB.enable_fb", "DO_TRIP", "DO_PICKUP") or name in DIGITAL_INPUTS:
+                out[name] = state(name)
+            elif name in ("PTP", "Time Synch"):
+                seed = 1.0 if name == "PTP" else 2.0
+                k = np.round(t)
+                edge = k + p["pps_jitter_s"] * _pseudo_random(k, seed)
+                out[name] = ((t >= edge) & (t < edge + p["pps_width_s"])).astype(float)
+            elif name in _BAY_CURRENTS:
+                out[name] = bay_current(*_BAY_CURRENTS[name])
+            elif name == "Three-phase Meter1.IA":
+                out[name] = bay_current(SOURCE_BAY, "A")
+            elif name == "Three-phase Meter1.IA_RMS":
+                out[name] = self._rms_envelope(t, state)
+            elif name in ("Ia_bus", "Ib_bus", "Ic_bus"):
+                out[name] = bay_current(SOURCE_BAY, name[1].upper())
+            elif name in ("Va_bus", "Vb_bus", "Vc_bus"):
+                ph = _PHASES[name[1].upper()]
+                sag = 1.0 - p["fault_voltage_sag"] * state("internal_fault") * state(f"{SOURCE_BAY}.CB")
+                out[name] = p["voltage_v"] * sag * np.sin(w * t + ph)
+            else:
+                raise SimApiError(f"Unknown signal: {name!r}")
+        return out
+
+    def _rms_envelope(self, t, state):
+        """Steady-state RMS of the HV bay phase A current (no DC offset)."""
+        p = self.params
+        energised = state(f"{SOURCE_BAY}.CB")
+        n_loads = sum(state(f"{b}.CB") for b in BAYS if b != SOURCE_BAY)
+        load = p["load_current_a"] * n_loads * np.exp(1j * math.radians(p["load_angle_deg"]))
+        fault = p["fault_current_a"] * (state("internal_fault") + state("external_fault")) \
+            * np.exp(1j * math.radians(p["fault_angle_deg"]))
+        return np.abs((load + fault) * energised) / math.sqrt(2.0)
+
+
+class SimCapture:
+    """Simulated ``typhoon.test.capture`` (start_capture / get_capture_results)."""
+
+    def __init__(self, hil):
+        self.hil = hil
+        self._pending = None
+
+    def start_capture(self, duration, rate=None, signals=(), trigger_source="Forced", trigger_threshold=None,
+                      trigger_edge=None, executeAt=None, timeout=None, **kwargs):
+        self._pending = {
+            "duration": float(duration),
+            "rate": float(rate or 10000),
+            "signals": list(signals),
+            "trigger_source": trigger_source,
+            "trigger_threshold": 0.5 if trigger_threshold is None else float(trigger_threshold),
+            "trigger_edge": trigger_edge or "Rising edge",
+            "armed_at": self.hil.now() if executeAt is None else max(float(executeAt), self.hil.now()),
+            "timeout": timeout,
+        }
+
+    def _trigger_time(self, cap):
+        """First trigger crossing after arming, searched on the capture sample grid."""
+        hil = self.hil
+        horizon = max([hil.now()] + [e[0] for e in hil._events]) + cap["duration"] + 1.0
+        if cap["timeout"] is not None:
+            horizon = min(horizon, cap["armed_at"] + cap["timeout"])
+        t = cap["armed_at"] + np.arange(0.0, horizon - cap["armed_at"], 1.0 / cap["rate"])
+        x = hil.evaluate([cap["trigger_source"]], t)[cap["trigger_source"]]
+        above = x > cap["trigger_threshold"]
+        if "Falling" in cap["trigger_edge"]:
+            above = ~above
+        if above[0]:
+            return t[0]
+        hits = np.flatnonzero(~above[:-1] & above[1:])
+        if hits.size == 0:
+            raise TimeoutError(f"Capture trigger on {cap['trigger_source']!r} did not occur")
+        return t[hits[0] + 1]
+
+    def get_capture_results(self, wait_capture=True):
+        cap = self._pending
+        if cap is None:
+            raise SimApiError("No capture started")
+        if cap["trigger_source"] in (None, "Forced"):
+            start = cap["armed_at"]
+        else:
+            start = self._trigger_time(cap)
+        n = int(round(cap["duration"] * cap["rate"]))
+        offsets = np.arange(n) / cap["rate"]
+        self.hil.advance_to(start + cap["duration"])
+        values = self.hil.evaluate(cap["signals"], start + offsets)
+        self._pending = None
+        return pd.DataFrame(values, index=pd.to_timedelta(offsets, unit="s"), columns=cap["signals"])
+
+
+class SimSchematic:
+    """Minimal SchematicAPI stand-in: nothing to compile in the simulated backend."""
+
+    simulated = True
+
+    def __init__(self, hw_settings=("HIL606", 4, 1)):
+        self.hw_settings = tuple(hw_settings)
+        self.model_path = None
+
+    def load(self, path):
+        self.model_path = str(path)
+
+    def compile(self, **kwargs):
+        return True
+
+    def get_compiled_model_file(self, path):
+        return str(path)
+
+    def detect_hw_settings(self):
+        return self.hw_settings
+
+    def get_hw_settings(self):
+        return self.hw_settings
+
+    def set_hw_settings(self, product, revision, conf_id):
+        self.hw_settings = (product, revision, conf_id)
+
+
+hil = SimHil()
+capture = SimCapture(hil)
@@ -0,0 +1,75 @@
+"""
+Bulk disconnector/breaker state snapshot for all bays.
+
+Every bay exposes its switching device positions on five digital probes:
+
+    Digital Probe1  CB   (low = closed)
+    Digital Probe2  DC1 open
+    Digital Probe3  DC1 closed
+    Digital Probe4  DC2 open
+    Digital Probe5  DC2 closed
+
+``station_snapshot`` reads all probes of all bays in one batched call and
+returns a bay x device int8 matrix (columns as in ``STATE_COLUMNS``; 1 =
+condition true). Expected topologies use the same layout, with -1 marking
+"don't care" entries, and ``diff_state`` lists the mismatches.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from hil_backend import hil
+from switching import BAYS
+
+STATE_COLUMNS = ["CB_closed", "DC1_open", "DC1_closed", "DC2_open", "DC2_closed"]
+_PROBES = ["Digital Probe1", "Digital Probe2", "Digital Probe3", "Digital Probe4", "Digital Probe5"]
+_INVERTED = np.array([True, False, False, False, False])
+
+DONT_CARE = -1
+
+
+@lru_cache(maxsize=None)
+def probe_signal(bay, column):
+    """Digital probe signal name for one state column of ``bay``."""
+    return f"{bay}.{_PROBES[STATE_COLUMNS.index(column)]}"
+
+
+@lru_cache(maxsize=None)
+def _snapshot_signals(bays):
+    return [probe_signal(bay, column) for bay in bays for column in STATE_COLUMNS]
+
+
+def read_digital_signals(names):
+    """Read several digital signals, in one API call when the API supports it."""
+    if hasattr(hil, "read_digital_signals"):
+        return hil.read_digital_signals(signals=list(names))
+    return [hil.read_digital_signal(name=name) for name in names]
+
+
+def station_snapshot(bays=BAYS) -> np.ndarray:
+    """Current bay x STATE_COLUMNS state matrix (int8, 1 = true)."""
+    bays = tuple(bays)
+    raw = np.asarray(read_digital_signals(_snapshot_signals(bays)), dtype=bool)
+    return (raw.reshape(len(bays), len(STATE_COLUMNS)) ^ _INVERTED).astype(np.int8)
+
+
+def expected_state(bays=BAYS, cb_closed=None, dc1_closed=None, dc2_closed=None) -> np.ndarray:
+    """Expected state matrix with the same value for every bay; None means don't care."""
+    row = np.full(len(STATE_COLUMNS), DONT_CARE, dtype=np.int8)
+    for closed, open_col, closed_col in ((dc1_closed, 1, 2), (dc2_closed, 3, 4)):
+        if closed is not None:
+            row[open_col], row[closed_col] = (0, 1) if closed else (1, 0)
+    if cb_closed is not None:
+        row[0] = int(cb_closed)
+    return np.tile(row, (len(bays), 1))
+
+
+def diff_state(actual, expected, bays=BAYS):
+    """Mismatches between two state matrices as (bay, column, actual, expected) tuples."""
+    actual = np.asarray(actual)
+    expected = np.asarray(expected)
+    mismatch = (expected != DONT_CARE) & (actual != expected)
+    return [
+        (bays[i], STATE_COLUMNS[j], int(actual[i, j]), int(expected[i, j]))
+        for i, j in zip(*np.nonzero(mismatch))
+    ]
@@ -0,0 +1,116 @@
+"""
+Concurrent bay switching through SCADA pulse commands.
+
+Disconnectors and breakers are operated by pulsing their "<bay>.<device>
+close/open" SCADA inputs. Instead of pulsing devices one at a time with host
+waits in between, ``run_switching`` groups commands into interlocking
+stages and pulses every command of a stage together:
+
+    1. open breakers        (CB Off)
+    2. open disconnectors   (DC* Off)
+    3. close disconnectors  (DC* On)
+    4. close breakers       (CB On)
+
+Commands of different bays never depend on each other, so energising the
+whole substation takes two pulses (all DCs, then all CBs) instead of one
+per device. With ``execute_at`` the pulses are pre-scheduled on the
+simulation timeline via ``executeAt`` and no host waits are needed at all.
+"""
+from collections import namedtuple
+
+from hil_backend import hil
+
+BAYS = ["HV Bay 1"] + [f"Bay {i}" for i in range(1, 11)]
+
+SwitchCommand = namedtuple("SwitchCommand", ["bay", "device", "action"])
+
+# Interlocking order of (device kind, action)
+_STAGE_ORDER = [("CB", "Off"), ("DC", "Off"), ("DC", "On"), ("CB", "On")]
+
+
+def scada_input_name(bay, device, action):
+    """SCADA input operating ``device`` of ``bay``; action is "On" (close) or "Off" (open)."""
+    if action not in ("On", "Off"):
+        raise ValueError(f"Unknown switching action: {action!r}")
+    return f"{bay}.{device} {'close' if action == 'On' else 'open'}"
+
+
+def _device_kind(device):
+    if device == "CB":
+        return "CB"
+    if device.startswith("DC"):
+        return "DC"
+    raise ValueError(f"Unknown switching device: {device!r}")
+
+
+def plan_stages(commands):
+    """
+    Group commands into interlocking stages; returns a list of lists of SCADA input names.
+
+    Stages are global, not per bay: stage k holds that step of every bay
+    (all CB Off, then all DC Off, all DC On, all CB On), so a bay that only
+    closes its CB still waits for the disconnector stages of the others.
+    Bays do not interlock with each other, so this only costs time, and
+    every stage takes one pulse for the whole substation.
+    """
+    stages = [[] for _ in _STAGE_ORDER]
+    for cmd in commands:
+        cmd = SwitchCommand(*cmd)
+        rank = _STAGE_ORDER.index((_device_kind(cmd.device), cmd.action))
+        name = scada_input_name(cmd.bay, cmd.device, cmd.action)
+        if name not in stages[rank]:
+            stages[rank].append(name)
+    return [stage for stage in stages if stage]
+
+
+def switching_pulses(commands, execute_at, pulse_ms=100, settle_ms=250):
+    """
+    Timed SCADA writes of ``commands`` starting at ``execute_at`` (s).
+
+    Returns the (time, SCADA input, value) writes and the time at which the
+    last stage has settled.
+    """
+    stages = plan_stages(commands)
+    step_s = (pulse_ms + settle_ms) / 1000.0
+    writes = []
+    for k, stage in enumerate(stages):
+        t_on = execute_at + k * step_s
+        for name in stage:
+            writes.append((t_on, name, 1))
+            writes.append((t_on + pulse_ms / 1000.0, name, 0))
+    return writes, execute_at + len(stages) * step_s
+
+
+def run_switching(commands, pulse_ms=100, settle_ms=250, execute_at=None):
+    """
+    Execute switching commands stage by stage, pulsing each stage concurrently.
+
+    ``pulse_ms`` is the SCADA pulse width and ``settle_ms`` the time a stage
+    is given to complete before the dependent stage starts (see
+    ``plan_stages`` for the staging).
+
+    Without ``execute_at`` the pulses are driven from the host with
+    ``hil.wait_msec``, and the function returns once the last stage has
+    settled. With ``execute_at`` (simulation time in s) all pulses
+    are uploaded at once with ``executeAt`` and the function returns
+    immediately; the return value is the simulation time at which the last
+    stage has settled.
+    """
+    if execute_at is not None:
+        writes, t_done = switching_pulses(commands, execute_at, pulse_ms, settle_ms)
+        for t, name, value in writes:
+            hil.set_scada_input_value(name, value, executeAt=t)
+        return t_done
+
+    stages = plan_stages(commands)
+    for k, stage in enumerate(stages):
+        if k:
+            hil.wait_msec(settle_ms)
+        for name in stage:
+            hil.set_scada_input_value(name, 1)
+        hil.wait_msec(pulse_ms)
+        for name in stage:
+            hil.set_scada_input_value(name, 0)
+    if stages:
+        hil.wait_msec(settle_ms)
+    return None
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Live telemetry of test runs over ZeroMQ.
+
+``TelemetryPublisher`` streams capture chunks and test events on a PUB
+socket so operators can watch long runs while they happen:
+
+    topic "chunk.<stream>"  [topic, header JSON, buffer, buffer, ...]
+        one raw buffer per signal, sent zero-copy (``copy=False``) from the
+        NumPy arrays; the header lists names, dtypes, lengths, t0 and rate
+    topic "event.<kind>"    [topic, JSON]
+        fault / pickup / trip / result / ... events
+
+Sends never block: the socket is an XPUB with ``XPUB_NODROP``, so when a
+subscriber has reached the high-water mark the send fails with EAGAIN and
+the message is dropped and counted (``dropped``) instead of stalling the
+test loop. Arrays handed to ``publish_chunk`` must not be modified
+afterwards, since ZeroMQ may still be reading from them.
+
+Set ``HIL_TELEMETRY_ENDPOINT`` (e.g. ``tcp://*:5556``) to enable telemetry
+in the tests; without it, or without pyzmq installed, ``publisher()``
+returns a no-op publisher.
+
+Reference subscriber:
+    python typhoon/tests/telemetry.py tcp://localhost:5556 [topic ...]
+"""
+import argparse
+import json
+import os
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from capture_timing import index_seconds
+
+try:
+    import zmq
+except ImportError:  # telemetry is optional; publisher() falls back to NullPublisher
+    zmq = None
+
+
+class TelemetryPublisher:
+    """Non-blocking XPUB publisher of capture chunks and events; see the module docstring."""
+
+    def __init__(self, endpoint, hwm=1000, context=None):
+        self.endpoint = endpoint
+        self._context = context or zmq.Context.instance()
+        self._socket = self._context.socket(zmq.XPUB)
+        self._socket.setsockopt(zmq.SNDHWM, hwm)
+        self._socket.setsockopt(zmq.XPUB_NODROP, 1)
+        self._socket.setsockopt(zmq.LINGER, 0)
+        self._socket.bind(endpoint)
+        # resolved address, e.g. the port chosen for "tcp://127.0.0.1:*"
+        self.endpoint = self._socket.getsockopt_string(zmq.LAST_ENDPOINT)
+        self.sent = 0
+        self.dropped = 0
+        self._seq = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _send(self, frames, copy=True):
+        try:
+            self._socket.send_multipart(frames, flags=zmq.NOBLOCK, copy=copy)
+        except zmq.Again:
+            self.dropped += 1
+            return False
+        self.sent += 1
+        return True
+
+    def publish_chunk(self, stream, columns, t0=0.0, rate_hz=None, **extra):
+        """Send {name: 1-D ndarray} as one message without copying the array data."""
+        names = list(columns)
+        arrays = [np.ascontiguousarray(columns[name]) for name in names]
+        seq = self._seq[stream] = self._seq.get(stream, 0) + 1
+        header = {
+            "seq": seq, "t0": t0, "rate_hz": rate_hz, "names": names,
+            "dtypes": [a.dtype.str for a in arrays], "lengths": [len(a) for a in arrays],
+            "sent_at": time.time(), **extra,
+        }
+        frames = [f"chunk.{stream}".encode(), json.dumps(header, default=str).encode()]
+        return self._send(frames + [memoryview(a) for a in arrays], copy=False)
+
+    def publish_frame(self, stream, cap_data, t0=0.0, **extra):
+        """Send a capture DataFrame (TimedeltaIndex) as one chunk."""
+        seconds = index_seconds(cap_data)
+        rate_hz = (len(seconds) - 1) / (seconds[-1] - seconds[0]) if len(seconds) > 1 else None
+        columns = {name: cap_data[name].to_numpy() for name in cap_data.columns}
+        return self.publish_chunk(stream, columns, t0=t0 + float(seconds[0]) if len(seconds) else t0,
+                                  rate_hz=rate_hz, **extra)
+
+    def event(self, kind, **fields):
+        """Send a JSON event (fault, pickup, trip, result, ...)."""
+        body = {"kind": kind, "time": time.time(), **fields}
+        return self._send([f"event.{kind}".encode(), json.dumps(body, default=str).encode()])
+
+    def close(self):
+        self._socket.close()
+
+
+class NullPublisher:
+    """Stand-in used when telemetry is not configured."""
+
+    sent = 0
+    dropped = 0
+
+    def publish_chunk(self, *args, **kwargs):
+        return False
+
+    def publish_frame(self, *args, **kwargs):
+        return False
+
+    def event(self, *args, **kwargs):
+        return False
+
+    def close(self):
+        pass
+
+
+@lru_cache(maxsize=None)
+def publisher():
+    """Process-wide publisher on ``HIL_TELEMETRY_ENDPOINT``, or a ``NullPublisher``."""
+    endpoint = os.environ.get("HIL_TELEMETRY_ENDPOINT")
+    if not endpoint or zmq is None:
+        return NullPublisher()
+    return TelemetryPublisher(endpoint, hwm=int(os.environ.get("HIL_TELEMETRY_HWM", "1000")))
+
+
+class TelemetrySubscriber:
+    """Reference subscriber: yields ("chunk", stream, header, {name: ndarray}) and ("event", kind, body)."""
+
+    def __init__(self, endpoint, topics=("",), hwm=1000, context=None):
+        self._socket = (context or zmq.Context.instance()).socket(zmq.SUB)
+        self._socket.setsockopt(zmq.RCVHWM, hwm)
+        self._socket.connect(endpoint)
+        for topic in topics:
+            self._socket.setsockopt(zmq.SUBSCRIBE, topic.encode())
+
+    def recv(self, timeout_ms=None):
+        """Next message, or None after ``timeout_ms`` without one."""
+        if timeout_ms is not None and not self._socket.poll(timeout_ms):
+            return None
+        frames = self._socket.recv_multipart(copy=False)
+        kind, _, name = frames[0].bytes.decode().partition(".")
+        body = json.loads(frames[1].bytes)
+        if kind != "chunk":
+            return "event", name, body
+        arrays = {
+            n: np.frombuffer(frame.buffer, dtype=np.dtype(dtype), count=length)
+            for n, dtype, length, frame in zip(body["names"], body["dtypes"], body["lengths"], frames[2:])
+        }
+        return "chunk", name, body, arrays
+
+    def close(self):
+        self._socket.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print HIL test telemetry.")
+    parser.add_argument("endpoint", help="e.g. tcp://localhost:5556")
+    parser.add_argument("topics", nargs="*", default=[""], help="topic prefixes (default: all)")
+    args = parser.parse_args(argv)
+
+    sub = TelemetrySubscriber(args.endpoint, args.topics)
+    last_seq = {}
+    try:
+        while True:
+            msg = sub.recv()
+            if msg[0] == "event":
+                print(f"[event] {msg[1]}: {json.dumps(msg[2], default=str)}")
+                continue
+            _, stream, header, arrays = msg
+            lost = header["seq"] - last_seq.get(stream, header["seq"] - 1) - 1
+            last_seq[stream] = header["seq"]
+            stats = ", ".join(f"{n}=[{a.min():.3g}, {a.max():.3g}]" for n, a in arrays.items() if a.size)
+            print(f"[chunk] {stream} #{header['seq']} t0={header['t0']:.3f} n={max(header['lengths'], default=0)}"
+                  f"{f' (lost {lost})' if lost > 0 else ''}: {stats}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sub.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
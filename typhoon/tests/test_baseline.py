@@ -0,0 +1,68 @@
+""" Baseline restore (baseline.Baseline) on the simulated backend. """
+
+import pytest
+import baseline
+from baseline import Baseline
+from hil_backend import hil, is_simulated, journal
+from substation_state import diff_state, station_snapshot
+
+pytestmark = pytest.mark.skipif(not is_simulated(), reason="changes and restores inputs on HIL_BACKEND=sim")
+
+R_FAULT = ("FaultBB", "Rfault")
+
+
+@pytest.fixture
+def simulation():
+    hil.load_model(file="digital-substation-demo.tse", vhil_device=True)
+    hil.start_simulation()
+    yield
+    hil.stop_simulation()
+
+
+@pytest.fixture
+def hil_calls(monkeypatch):
+    """Names of the hil functions restore() calls."""
+    calls = []
+
+    class Recorder:
+        def __getattr__(self, name):
+            calls.append(name)
+            return getattr(hil, name)
+
+    monkeypatch.setattr(baseline, "hil", Recorder())
+    return calls
+
+
+def journal_value(function, *args):
+    key, _ = journal.entry(function, *args, 0)
+    return journal.snapshot().get(key)
+
+
+def test_restore_changed_inputs(simulation):
+    hil.set_digital_input_value("DI_ARM", 1)
+    base = Baseline.capture(parameters={R_FAULT: 0.001})
+
+    hil.set_digital_input_value("DI_ARM", 0)
+    hil.set_scada_input_value("Bay 3.CB open", 1)      # pulse left high: Bay 3 breaker opens
+    hil.set_parameter_value(*R_FAULT, 5.0)
+    hil.wait_msec(250)
+    assert diff_state(station_snapshot(), base.state) == [("Bay 3", "CB_closed", 0, 1)]
+
+    inputs, commands = base.restore()
+
+    assert len(inputs) == 3
+    assert [tuple(c) for c in commands] == [("Bay 3", "CB", "On")]
+    assert journal_value("set_digital_input_value", "DI_ARM") == (("value", 1),)
+    assert journal_value("set_scada_input_value", "Bay 3.CB open") == (("value", 0),)
+    assert journal_value("set_parameter_value", *R_FAULT) == (("value", 0.001),)
+    assert hil.parameters[R_FAULT] == 0.001
+    assert diff_state(station_snapshot(), base.state) == []
+
+
+def test_restore_unchanged_is_noop(simulation, hil_calls):
+    hil.set_digital_input_value("DI_ARM", 1)
+    base = Baseline.capture(parameters={R_FAULT: 0.001})
+    hil.wait_msec(250)
+
+    assert base.restore() == ([], [])
+    assert not [name for name in hil_calls if name.startswith("set_")]
@@ -0,0 +1,56 @@
+""" Differential/restraint analytics (busbar_analytics) against known answers. """
+
+import numpy as np
+import pytest
+from busbar_analytics import differential_analysis, operate_threshold, operating_point
+
+RATE_HZ = 6000.0          # 100 samples per 60 Hz cycle
+FREQUENCY_HZ = 60.0
+N_SAMPLES = 300           # three cycles
+
+
+def bay_currents(rms_per_bay, h2_fraction=0.0):
+    """(bays, phases, samples) sinusoidal currents with the given RMS per bay (sign = direction)."""
+    t = np.arange(N_SAMPLES) / RATE_HZ
+    w = 2.0 * np.pi * FREQUENCY_HZ
+    shifts = np.array([0.0, -2.0 * np.pi / 3.0, 2.0 * np.pi / 3.0])
+    rms = np.asarray(rms_per_bay, dtype=float)[:, None, None]
+    wave = np.sin(w * t + shifts[:, None]) + h2_fraction * np.sin(2.0 * w * t + shifts[:, None])
+    return np.sqrt(2.0) * rms * wave[None, :, :]
+
+
+def test_operate_threshold_dual_slope():
+    ir = [100.0, 1000.0, 2000.0, 3000.0]
+    # i_diff_min, slope1 = 0.3, break point at 2000 A, slope2 = 0.6 above it
+    assert operate_threshold(ir) == pytest.approx([200.0, 300.0, 600.0, 1200.0])
+
+
+def test_through_current_is_stable():
+    # 1000 A in through one bay, out through the other two
+    result = differential_analysis(bay_currents([1000.0, -600.0, -400.0]), RATE_HZ, FREQUENCY_HZ)
+    i_r, i_d = operating_point(result, result.t[-1])
+
+    assert i_d == pytest.approx([0.0] * 3, abs=1e-6)
+    assert i_r == pytest.approx([2000.0] * 3)
+    assert result.threshold[:, -1] == pytest.approx([600.0] * 3)
+    assert not result.operate.any()
+
+
+def test_internal_fault_operates():
+    result = differential_analysis(bay_currents([1000.0, 500.0, 0.0]), RATE_HZ, FREQUENCY_HZ)
+    i_r, i_d = operating_point(result, result.t[-1])
+
+    assert i_d == pytest.approx([1500.0] * 3)
+    assert i_r == pytest.approx([1500.0] * 3)
+    assert result.threshold[:, -1] == pytest.approx([450.0] * 3)
+    assert result.h2_ratio.max() == pytest.approx(0.0, abs=1e-9)
+    assert result.operate.all()
+
+
+def test_second_harmonic_blocks():
+    # inrush-like: 30 % 2nd harmonic in the differential current (blocking level 15 %)
+    result = differential_analysis(bay_currents([1000.0, 500.0, 0.0], h2_fraction=0.3), RATE_HZ, FREQUENCY_HZ)
+
+    assert result.h2_ratio[:, -1] == pytest.approx([0.3] * 3)
+    assert result.blocked.all()
+    assert not result.operate.any()
@@ -0,0 +1,17 @@
+""" Busbar differential harness (busbar_diff_fault_test.py) end to end on the
+simulated backend, in both pickup/trip timing modes. """
+
+import pytest
+import busbar_diff_fault_test as busbar
+from hil_backend import is_simulated
+
+pytestmark = pytest.mark.skipif(not is_simulated(), reason="runs the harness against HIL_BACKEND=sim")
+
+
+@pytest.mark.parametrize("timing_mode", ["poll", "capture"])
+def test_busbar_main(monkeypatch, tmp_path, timing_mode):
+    monkeypatch.setitem(busbar.CONFIG, "timing_mode", timing_mode)
+    monkeypatch.setitem(busbar.CONFIG, "capture_dir", str(tmp_path))
+    monkeypatch.setitem(busbar.CONFIG, "results_store", str(tmp_path / "results"))
+
+    assert busbar.main() == 0
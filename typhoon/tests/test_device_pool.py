@@ -0,0 +1,26 @@
+""" Local target detection of the device pool (device_pool.local_target). """
+
+import pytest
+from device_pool import local_target
+
+
+class NoDeviceSchematic:
+    """Schematic Editor stand-in with no HIL device attached."""
+
+    def detect_hw_settings(self):
+        raise Exception("no device found")
+
+    def get_hw_settings(self):
+        return ("HIL606", 1, 4)
+
+
+def test_local_target_requires_a_detected_device():
+    with pytest.raises(RuntimeError, match="HIL_VHIL"):
+        local_target(NoDeviceSchematic())
+
+
+def test_local_target_vhil_when_asked_for():
+    target = local_target(NoDeviceSchematic(), vhil=True)
+
+    assert target.vhil
+    assert (target.device, target.revision, target.conf_id) == ("HIL606", 1, 4)
@@ -8,23 +8,40 @@ showing the most important concepts when writing a tests.
 
 All the fundamental concepts shown here can be extended to more complex models. """
 
-from typhoon.api import hil
-from typhoon.api.schematic_editor import SchematicAPI
 import pytest
 import logging
+import numpy as np
 from pathlib import Path
-from typhoon.test import capture
-from typhoon.test import ranges
-import typhoon.test.signals as sig
+from baseline import Baseline
+from device_pool import configure_model
+from hil_backend import capture, hil, is_simulated
+from modbus_scada import MODBUS_CONFIG, LocalScadaServer, ModbusPool, local_config, verify_scada
+from model_cache import compile_cached
+from phasor_stream import rms_crosscheck, stream_capture
+from pps_monitor import analyze_capture as analyze_pps
+from scenario import failed_checks, load_scenario, run_scenario
+from substation_state import STATE_COLUMNS, expected_state, probe_signal
+from switching import BAYS, SwitchCommand, run_switching
+from transitions import find_transitions
 
 logger = logging.getLogger(__name__)
-model = SchematicAPI()
 
 name = "model"
 dirpath = Path(__file__).parent
 model_path = str(dirpath / "digital substation 10 bays.tse")
+# SCADA panel used with the model (part of the compile cache key)
+scada_panel_path = str(dirpath / ".." / "scada" / "digital-substation-demo.cus")
+scenario_dir = dirpath / ".." / "scenarios"
 
-compiled_model_path = model.get_compiled_model_file(model_path)
+# maximum fault-to-trip time accepted for the relay
+RELAY_OPERATE_TIME_S = 0.1
+RATED_FREQUENCY_HZ = 60.0
+# streamed IA RMS must match the model's IA_RMS channel within this (relative, p99)
+RMS_CROSSCHECK_TOLERANCE = 0.05
+# PPS checks: edge timing can only be resolved to about one capture sample
+PPS_CAPTURE_RATE_HZ = 1000
+PPS_MAX_JITTER_S = 2.0 / PPS_CAPTURE_RATE_HZ
+PPS_MAX_OFFSET_S = 2.0 / PPS_CAPTURE_RATE_HZ
 
 
 def discnt_state(bay, dc, inputValue):
@@ -41,7 +58,7 @@ def discnt_state(bay, dc, inputValue):
 
 
 def dc1_off_state(bay):
-    if bool(hil.read_digital_signal(name=bay + '.Digital Probe2')):
+    if bool(hil.read_digital_signal(name=probe_signal(bay, "DC1_open"))):
         displayValue = True
     else:
         displayValue = False
@@ -49,7 +66,7 @@ def dc1_off_state(bay):
 
 
 def dc1_on_state(bay):
-    if bool(hil.read_digital_signal(name=bay + '.Digital Probe3')):
+    if bool(hil.read_digital_signal(name=probe_signal(bay, "DC1_closed"))):
         displayValue = True
     else:
         displayValue = False
@@ -57,7 +74,7 @@ def dc1_on_state(bay):
 
 
 def dc2_off_state(bay):
-    if bool(hil.read_digital_signal(name=bay + '.Digital Probe4')):
+    if bool(hil.read_digital_signal(name=probe_signal(bay, "DC2_open"))):
         displayValue = True
     else:
         displayValue = False
@@ -65,7 +82,7 @@ def dc2_off_state(bay):
 
 
 def dc2_on_state(bay):
-    if bool(hil.read_digital_signal(name=bay + '.Digital Probe5')):
+    if bool(hil.read_digital_signal(name=probe_signal(bay, "DC2_closed"))):
         displayValue = True
     else:
         displayValue = False
@@ -86,19 +103,21 @@ def circbrk_state(bay, inputValue):
 
 
 def cbr_state(bay):
-    if bool(hil.read_digital_signal(name=bay + '.Digital Probe1')):
+    if bool(hil.read_digital_signal(name=probe_signal(bay, "CB_closed"))):
         displayValue = False
     else:
         displayValue = True
     return displayValue
 
 @pytest.fixture(scope="module")
-def setup_function():
+def setup_function(schematic, hil_target):
     """
-    Loads schematic, sets parameters, compiles and loads model to HIL device.
+    Loads schematic, sets parameters, compiles and loads model to the leased HIL device.
     """
+    model = schematic
 
     model.load(model_path)
+    configure_model(model, hil_target)
 
 #    try:
 #        model.detect_hw_settings()
@@ -106,143 +125,141 @@ def setup_function():
 #        pytest.skip("This test is not supported for VHIL mode. "
 #                    "The model requires HIL connect and a HIL device that supports CAN communication.")
 
-    model.compile(conditional_compile = True)  # Compile model
-    hil.load_model(file=compiled_model_path, vhil_device=False)  # Load compiled model into the HIL
+    compiled = compile_cached(model, model_path, extra_files=[scada_panel_path], conditional_compile = True)  # Compile model (cached)
+    hil.load_model(file=compiled, vhil_device=hil_target.vhil)  # Load compiled model into the HIL
     
     hil.start_simulation()
 
-    yield
+    yield Baseline.capture()
     hil.stop_simulation()
 
+
+@pytest.fixture(autouse=True)
+def restore_baseline(setup_function):
+    """Start every test from the state captured after the model was started, without reloading it."""
+    setup_function.restore()
+
 def test_ptp_check(setup_function):
-    step_signal = []
-    capture.start_capture(10, signals=["PTP"], rate=1000)
+    capture.start_capture(10, signals=["PTP"], rate=PPS_CAPTURE_RATE_HZ)
     
     cap_data = capture.get_capture_results(wait_capture=True)
     
-    step_signal = sig.find(cap_data["PTP"], "above", 0.5, from_region="below", during=(0,10))
+    pps = analyze_pps(cap_data, "PTP")
+    logger.info(f"PTP: {pps.summary()}")
     
-    assert len(cap_data["PTP"]) != 0
+    violations = pps.check(PPS_MAX_JITTER_S, PPS_MAX_OFFSET_S, min_edges=9)
+    assert not violations, f"PTP out of spec: {violations}"
     
 def test_hil_synch_check(setup_function):
-    step_signal = []
-    capture.start_capture(10, signals=["Time Synch"], rate=1000)
+    capture.start_capture(10, signals=["Time Synch"], rate=PPS_CAPTURE_RATE_HZ)
     
     cap_data = capture.get_capture_results(wait_capture=True)
     
-    step_signal = sig.find(cap_data["Time Synch"], "above", 0.5, from_region="below", during=(0,10))
+    pps = analyze_pps(cap_data, "Time Synch")
+    logger.info(f"Time Synch: {pps.summary()}")
     
-    assert len(cap_data["Time Synch"]) != 0
+    violations = pps.check(PPS_MAX_JITTER_S, PPS_MAX_OFFSET_S, min_edges=9)
+    assert not violations, f"Time Synch out of spec: {violations}"
 
 def test_discnt_cb_manipulation(setup_function):
-    
-    capture.start_capture(10, signals=["Three-phase Meter1.IA","Three-phase Meter1.IA_RMS"],executeAt = 12, rate=10000)
-
-    
-    # set the statuses of disconectors evey second, observ DCs on web_HMI
-    # set the CBs and capture all of them
-    discnt_state("HV Bay 1", "DC1", "On")
-    hil.wait_msec(250)
-    circbrk_state("HV Bay 1", "On")
-    hil.wait_msec(250)
-    discnt_state("Bay 1", "DC1", "On")
-    hil.wait_msec(250)
-    circbrk_state("Bay 1", "On")
-    hil.wait_msec(250)
-    discnt_state("Bay 2", "DC1", "On")
-    hil.wait_msec(250)
-    circbrk_state("Bay 2", "On")
-    hil.wait_msec(250)
-    discnt_state("Bay 3", "DC1", "On")
-    hil.wait_msec(250)
-    circbrk_state("Bay 3", "On")
-    hil.wait_msec(250)
-    discnt_state("Bay 4", "DC1", "On")
-    hil.wait_msec(250)
-    circbrk_state("Bay 4", "On")
-    hil.wait_msec(250)
-    discnt_state("Bay 5", "DC1", "On")
-    hil.wait_msec(250)
-    circbrk_state("Bay 5", "On")
-    hil.wait_msec(250)
-    discnt_state("Bay 6", "DC1", "On")
-    hil.wait_msec(250)
-    circbrk_state("Bay 6", "On")
-    hil.wait_msec(250)
-    discnt_state("Bay 7", "DC1", "On")
-    hil.wait_msec(250)
-    circbrk_state("Bay 7", "On")
-    hil.wait_msec(250)
-    discnt_state("Bay 8", "DC1", "On")
-    hil.wait_msec(250)
-    circbrk_state("Bay 8", "On")
-    hil.wait_msec(250)
-    discnt_state("Bay 9", "DC1", "On")
-    hil.wait_msec(250)
-    circbrk_state("Bay 9", "On")
-    hil.wait_msec(250)
-    discnt_state("Bay 10", "DC1", "On")
-    hil.wait_msec(250)
-    circbrk_state("Bay 10", "On")
-    
-    #preform the fault
-    #hil.set_contactor("Grid Fault1.enable",swControl = True,swState = True,executeAt= 5.5)
-    
-    cap_data = capture.get_capture_results(wait_capture=True)
-    
-    #fault_time = sig.find(cap_data["Grid Fault1.enable_fb"], "above", 0.5, from_region="below", during=(0,5))
-    #cb_time = sig.find(cap_data["S3_fb"], "below", 0.5, from_region="above", during=(0,5))
-    
-    #logger.info(f"Fault occured at: {fault_time}")
-    #logger.info(f"Circuit breaker trip occured at: {cb_time}")
-    
-    #reaction_time = cb_time - fault_time
-    
-    #assert reaction_time <= operation_time
-    
+    # close DC1 of every bay, then every CB (interlocking order), scheduled on the
+    # simulation timeline; observe DCs on web_HMI
+    result = run_scenario(load_scenario(scenario_dir / "dc_cb_switching.yaml"))
+    for check in result.checks:
+        logger.info(f"{check.check}: {check.detail}")
+    assert not failed_checks(result), f"Scenario checks failed: {failed_checks(result)}"
+
+
+# positions test_scada_modbus_state switches to: DC1 closed everywhere, CBs of the first 6 bays closed
+SCADA_CLOSED_CB_BAYS = BAYS[:6]
+
+
+def switch_scada_test_state():
+    commands = [SwitchCommand(bay, "DC1", "On") for bay in BAYS]
+    commands += [SwitchCommand(bay, "CB", "On" if bay in SCADA_CLOSED_CB_BAYS else "Off") for bay in BAYS]
+    run_switching(commands)
+
+
+def expected_scada_state():
+    """State matrix the switching of test_scada_modbus_state should produce, independent of the probes."""
+    return np.vstack([expected_state([bay], cb_closed=bay in SCADA_CLOSED_CB_BAYS, dc1_closed=True,
+                                     dc2_closed=False) for bay in BAYS])
+
+
+def test_scada_modbus_state(setup_function):
+    """SCADA (Modbus TCP) switchgear state must match the HIL probes for every bay."""
+    switch_scada_test_state()
+
+    if is_simulated():
+        # the stand-in serves the expected state, so the check compares it with the probes
+        config = local_config()
+        server = LocalScadaServer(config).start()
+        server.sync(expected_scada_state())
+    elif MODBUS_CONFIG["endpoints"][0]["host"] == "CHANGE_ME":
+        pytest.skip("Modbus endpoints not configured (modbus_scada.MODBUS_CONFIG)")
+    else:
+        config, server = MODBUS_CONFIG, None
+
+    try:
+        with ModbusPool(config["endpoints"], config["pool_size"], config["timeout_s"]) as pool:
+            mismatches = verify_scada(pool)
+    finally:
+        if server:
+            server.stop()
+
+    assert not mismatches, f"SCADA/HIL state mismatch (bay, item, scada, hil): {mismatches}"
+
+
+@pytest.mark.skipif(not is_simulated(), reason="needs the local Modbus stand-in")
+def test_scada_modbus_mismatch(setup_function):
+    """A SCADA state that disagrees with the probes in one breaker is reported for that breaker only."""
+    switch_scada_test_state()
+    scada_state = expected_scada_state()
+    scada_state[BAYS.index("Bay 8"), STATE_COLUMNS.index("CB_closed")] = 1
+
+    config = local_config()
+    with LocalScadaServer(config) as server:
+        server.sync(scada_state)
+        with ModbusPool(config["endpoints"], config["pool_size"], config["timeout_s"]) as pool:
+            mismatches = verify_scada(pool)
+
+    assert sorted((bay, item) for bay, item, _, _ in mismatches) == [("Bay 8", "CB position"),
+                                                                      ("Bay 8", "CB_closed")]
+
 
 def test_q3_fault(setup_function):
-    
-    capture.start_capture(5, signals=["Grid Fault1.enable_fb","S3_fb","Three-phase Meter1.IA","Three-phase Meter1.IA_RMS"],executeAt = 5, rate=10000)
-    
-    #set the CBs and capture all of them
-    hil.set_scada_input_value("HV Bay 1.CB close", 1)
-    hil.wait_msec(250)
-    hil.set_scada_input_value("Bay 1.CB close", 1)
-    hil.wait_msec(250)
-    hil.set_scada_input_value("Bay 2.CB close", 1)
-    hil.wait_msec(250)
-    hil.set_scada_input_value("Bay 3.CB close", 1)
-    hil.wait_msec(250)
-    hil.set_scada_input_value("Bay 4.CB close", 1)
-    hil.wait_msec(250)
-    hil.set_scada_input_value("Bay 5.CB close", 1)
-    hil.wait_msec(250)
-    hil.set_scada_input_value("Bay 6.CB close", 1)
-    hil.wait_msec(250)
-    hil.set_scada_input_value("Bay 7.CB close", 1)
-    hil.wait_msec(250)
-    hil.set_scada_input_value("Bay 8.CB close", 1)
-    hil.wait_msec(250)
-    hil.set_scada_input_value("Bay 9.CB close", 1)
-    hil.wait_msec(250)
-    hil.set_scada_input_value("Bay 10.CB close", 1)
-    hil.wait_msec(250)
-    
-    #preform the fault
-    hil.set_contactor("Grid Fault1.enable",swControl = True,swState = True,executeAt= 5.5)
-    
-    cap_data = capture.get_capture_results(wait_capture=True)
-    
-    fault_time = sig.find(cap_data["Grid Fault1.enable_fb"], "above", 0.5, from_region="below", during=(0,5))
-    cb_time = sig.find(cap_data["S3_fb"], "below", 0.5, from_region="above", during=(0,5))
+    # close every CB, then the fault; uploaded at once with executeAt
+    result = run_scenario(load_scenario(scenario_dir / "q3_fault.yaml"))
+    cap_data = result.cap_data
+    for check in result.checks:
+        logger.info(f"{check.check}: {check.detail}")
+    assert not failed_checks(result), f"Scenario checks failed: {failed_checks(result)}"
+
+    edges = find_transitions(cap_data)
+    fault_time = edges.first("Grid Fault1.enable_fb", "rising", during=(0,5))
+    cb_time = edges.first("S3_fb", "falling", during=(0,5), after=fault_time)
     
     logger.info(f"Fault occured at: {fault_time}")
     logger.info(f"Circuit breaker trip occured at: {cb_time}")
     
     reaction_time = cb_time - fault_time
     
-    assert reaction_time <= Vreme_releja
+    assert reaction_time <= RELAY_OPERATE_TIME_S
+
+    # fault onset and RMS from the IA waveform, streamed like a live signal
+    t = cap_data.index.total_seconds()
+    prefault = t < fault_time
+    prefault_rms = cap_data["Three-phase Meter1.IA_RMS"][prefault].median()
+    estimator, ia = stream_capture(
+        cap_data, "Three-phase Meter1.IA", RATED_FREQUENCY_HZ, onset_threshold=1.5 * prefault_rms
+    )
+    onsets = [e.t for e in estimator.events if e.kind == "onset"]
+    logger.info(f"IA onset detected at: {onsets[0] if onsets else None}")
+    assert onsets and fault_time <= onsets[0] <= fault_time + 2.0 / RATED_FREQUENCY_HZ
+
+    deviation = rms_crosscheck(ia.magnitude[prefault], cap_data["Three-phase Meter1.IA_RMS"][prefault])
+    logger.info(f"IA RMS vs IA_RMS (pre-fault): {deviation}")
+    assert deviation is not None and deviation["p99"] <= RMS_CROSSCHECK_TOLERANCE
     
     
     
@@ -0,0 +1,69 @@
+""" Short endurance runs (endurance.EnduranceRun) on the simulated backend. """
+
+import pytest
+from endurance import EnduranceRun
+from hil_backend import hil, is_simulated
+
+pytestmark = pytest.mark.skipif(not is_simulated(), reason="runs minutes of simulated time on HIL_BACKEND=sim")
+
+RELAY_OPERATE_TIME_S = 0.1
+
+
+@pytest.fixture
+def simulation():
+    hil.load_model(file="digital-substation-demo.tse", vhil_device=True)
+    hil.start_simulation()
+    yield
+    hil.stop_simulation()
+
+
+def short_run(out_dir, **kwargs):
+    params = dict(signals=["Three-phase Meter1.IA"], fault_signal="FaultBB.enable_fb",
+                  trip_signal="HV Bay 1.Digital Probe1", duration_s=40.0, window_s=2.0,
+                  fault_interval_s=10.0, rate_hz=2000, envelope=())
+    params.update(kwargs)
+    return EnduranceRun(str(out_dir), **params)
+
+
+def test_every_fault_window_trips(simulation, tmp_path):
+    run = short_run(tmp_path)
+    stats = run.run(log=lambda msg: None)
+
+    assert run.n_faults == 4
+    assert stats["missed"] == 0
+    assert stats["count"] == run.n_faults
+    assert stats["max_s"] <= RELAY_OPERATE_TIME_S
+
+
+def test_resume_continues_interrupted_run(simulation, tmp_path):
+    run = short_run(tmp_path)
+    run.resume()
+    for k in range(3):
+        run.energise()
+        run.run_window(k)
+        run.next_window = k + 1
+        run.save_checkpoint()
+
+    resumed = short_run(tmp_path)
+    assert resumed.resume()
+    assert resumed.next_window == 3
+    assert resumed.stats.count == 1
+    stats = resumed.run(log=lambda msg: None)
+    assert stats["count"] == resumed.n_faults
+
+
+def test_resume_refuses_other_config(simulation, tmp_path):
+    run = short_run(tmp_path)
+    run.save_checkpoint()
+
+    with pytest.raises(RuntimeError, match="fault_select"):
+        short_run(tmp_path, fault_select=2).resume()
+    with pytest.raises(RuntimeError, match="n_windows"):
+        short_run(tmp_path, duration_s=60.0).resume()
+
+
+def test_resume_refuses_completed_run(simulation, tmp_path):
+    short_run(tmp_path).run(log=lambda msg: None)
+
+    with pytest.raises(RuntimeError, match="completed"):
+        short_run(tmp_path).run(log=lambda msg: None)
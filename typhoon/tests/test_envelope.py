@@ -0,0 +1,69 @@
+""" Min/max envelope levels (envelope.EnvelopeWriter, read_envelope, crossing_blocks). """
+
+import numpy as np
+import pyarrow.parquet as pq
+import pytest
+from artifacts import ArtifactWriter
+from envelope import crossing_blocks, envelope_path, read_envelope
+
+RATE_HZ = 10000.0
+N_SAMPLES = 25037         # not a multiple of any factor: every level ends in a short block
+FACTORS = (10, 100, 1000)
+EDGE = 12345
+
+
+def write_signal(path, x, bounds=(0, 1, 999, 1000, 7003, 20000, N_SAMPLES)):
+    """Raw artifact of ``x`` with envelope levels, written in the uneven chunks between ``bounds``."""
+    t = np.arange(len(x)) / RATE_HZ
+    with ArtifactWriter(path, ["t", "x"], string_fields=(), envelope=FACTORS) as writer:
+        for a, b in zip(bounds, bounds[1:]):
+            writer.write_columns({"t": t[a:b], "x": x[a:b]})
+    return t
+
+
+def test_levels_match_reduceat(tmp_path):
+    path = str(tmp_path / "window.parquet")
+    x = np.sin(np.arange(N_SAMPLES) * 0.37) + 0.01 * (np.arange(N_SAMPLES) % 3)
+    t = write_signal(path, x)
+
+    for factor in FACTORS:
+        level = pq.read_table(envelope_path(path, factor)).to_pydict()
+        starts = np.arange(0, N_SAMPLES, factor)
+        ends = np.minimum(starts + factor, N_SAMPLES) - 1
+        np.testing.assert_array_equal(level["t_start"], t[starts], err_msg=f"env{factor}")
+        np.testing.assert_array_equal(level["t_end"], t[ends], err_msg=f"env{factor}")
+        np.testing.assert_array_equal(level["x.min"], np.minimum.reduceat(x, starts), err_msg=f"env{factor}")
+        np.testing.assert_array_equal(level["x.max"], np.maximum.reduceat(x, starts), err_msg=f"env{factor}")
+
+
+def test_spike_kept_at_every_level(tmp_path):
+    path = str(tmp_path / "window.parquet")
+    x = np.zeros(N_SAMPLES)
+    x[EDGE] = 1.0
+    write_signal(path, x)
+
+    for factor in FACTORS:
+        level = pq.read_table(envelope_path(path, factor)).to_pydict()
+        spikes = np.flatnonzero(np.asarray(level["x.max"]) == 1.0)
+        assert spikes.tolist() == [EDGE // factor], f"env{factor}"
+        assert max(level["x.min"]) == 0.0
+
+
+def test_crossing_narrows_to_raw_edge(tmp_path):
+    path = str(tmp_path / "window.parquet")
+    x = np.zeros(N_SAMPLES)
+    x[EDGE:] = 1.0
+    t = write_signal(path, x)
+
+    env = read_envelope(path, ["x"], max_points=30)
+    assert env.factor == 1000
+    blocks = crossing_blocks(env, "x")
+    assert blocks == [(t[12000], t[12999])]
+
+    # zoom into the crossing block; each step reads the next finer level
+    for factor, max_points, expected in [(100, 30, (12300, 12399)), (10, 150, (12340, 12349)),
+                                         (1, 1500, (EDGE - 1, EDGE))]:
+        env = read_envelope(path, ["x"], *blocks[0], max_points=max_points)
+        assert env.factor == factor
+        blocks = crossing_blocks(env, "x")
+        assert blocks == [pytest.approx((t[expected[0]], t[expected[1]]))]
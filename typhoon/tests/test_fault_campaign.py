@@ -0,0 +1,61 @@
+""" Fault campaign cases (fault_campaign.run_case) on the simulated backend. """
+
+import pytest
+import fault_campaign
+from device_pool import HilTarget
+from fault_campaign import FaultCase, compile_for_targets, run_case, start_model
+from hil_backend import hil, is_simulated
+from switching import BAYS
+
+pytestmark = pytest.mark.skipif(not is_simulated(), reason="runs campaign cases on HIL_BACKEND=sim")
+
+RELAY_OPERATE_TIME_S = 0.1
+
+
+@pytest.fixture
+def simulation():
+    start_model("digital-substation-demo.tse", vhil_device=True)
+    yield
+    hil.stop_simulation()
+
+
+def test_case_times_every_bay(simulation):
+    rows = run_case(FaultCase(11, (0.001, 0.0), "all_closed"))
+
+    assert [row["bay"] for row in rows] == BAYS
+    for row in rows:
+        assert row["error"] is None
+        assert row["trip_s"] is not None
+        assert 0.0 < row["trip_s"] <= RELAY_OPERATE_TIME_S
+
+
+def test_cases_do_not_depend_on_order(simulation):
+    cases = [FaultCase(11, (0.001, 0.0), prefault) for prefault in ("dc2_closed", "all_closed")]
+    bays = ["HV Bay 1", "Bay 3"]
+
+    forward = [run_case(case, bays) for case in cases]
+    backward = [run_case(case, bays) for case in reversed(cases)][::-1]
+
+    rows = [row for case_rows in forward + backward for row in case_rows]
+    assert [row["error"] for row in rows] == [None] * 8
+    trips = [row["trip_s"] for case_rows in forward for row in case_rows]
+    assert None not in trips
+    assert trips == pytest.approx([row["trip_s"] for case_rows in backward for row in case_rows])
+
+
+def test_compile_once_per_device_type(monkeypatch):
+    builds = []
+
+    def compile_cached(model, model_path, extra_files=()):
+        builds.append(model.get_hw_settings())
+        return f"{model_path}.{len(builds)}"
+
+    monkeypatch.setattr(fault_campaign, "compile_cached", compile_cached)
+    targets = [HilTarget("a", "HIL606", 1, 4, "10.0.0.21", False),
+               HilTarget("b", "HIL404", 1, 1, "10.0.0.22", False),
+               HilTarget("c", "HIL606", 1, 4, None, True)]
+
+    compiled = compile_for_targets(targets)
+
+    assert builds == [("HIL606", 1, 4), ("HIL404", 1, 1)]
+    assert compiled["a"] == compiled["c"] != compiled["b"]
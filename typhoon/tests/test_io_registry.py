@@ -0,0 +1,44 @@
+""" I/O name resolution (io_registry.IORegistry) against the simulated model. """
+
+import pytest
+from io_registry import IORegistry
+from sim_backend import SimHil
+
+
+@pytest.fixture
+def sim():
+    hil = SimHil()
+    hil.load_model(file="digital-substation-demo.tse")
+    hil.start_simulation()
+    return hil
+
+
+def test_resolve_without_writing(sim):
+    registry = IORegistry(sim)
+    registry.resolve_digital_input("DI_FAULT_INTERNAL")
+    registry.resolve_digital_input("S3_fb")
+
+    # nothing was written while resolving
+    assert sim._events == []
+
+    registry.writer("DI_FAULT_INTERNAL")(1)
+    assert sim.get_signal_value("DI_FAULT_INTERNAL") == 1.0
+    # a model signal resolves to set_signal_value, which the simulated model refuses
+    with pytest.raises(Exception, match="not writable"):
+        registry.writer("S3_fb")(1)
+
+
+def test_unknown_name(sim):
+    with pytest.raises(RuntimeError, match="Unknown digital input or model signal: 'DI_MISSING'"):
+        IORegistry(sim).resolve_digital_input("DI_MISSING")
+
+
+def test_api_without_input_list(sim, monkeypatch):
+    monkeypatch.delattr(SimHil, "available_digital_inputs")
+    registry = IORegistry(sim)
+    registry.resolve_digital_input("DI_MISSING")
+
+    assert sim._events == []
+    # not a model signal, so taken to be a digital input; the first write reports it
+    with pytest.raises(Exception, match="Unknown digital input"):
+        registry.writer("DI_MISSING")(1)
@@ -0,0 +1,51 @@
+""" Sliding-DFT phasor/RMS estimation (phasor_stream.SlidingPhasor) against known answers. """
+
+import numpy as np
+import pytest
+from phasor_stream import SlidingPhasor
+
+RATE_HZ = 6000.0          # 100 samples per 60 Hz cycle
+WINDOW = 100
+
+
+def sine(n, rms=100.0, angle_deg=30.0, frequency_hz=60.0, dc=0.0):
+    """``rms * sqrt(2) * cos(w t + angle) + dc`` sampled at RATE_HZ from t = 0."""
+    t = np.arange(n) / RATE_HZ
+    return np.sqrt(2.0) * rms * np.cos(2.0 * np.pi * frequency_hz * t + np.radians(angle_deg)) + dc
+
+
+def test_pure_sine_phasor():
+    out = SlidingPhasor(RATE_HZ).update(sine(500))
+
+    # NaN until the first window is full, then the exact phasor
+    assert np.isnan(out.magnitude[:WINDOW - 1]).all()
+    assert out.magnitude[WINDOW - 1:] == pytest.approx(np.full(500 - WINDOW + 1, 100.0))
+    assert out.angle_deg[WINDOW - 1:] == pytest.approx(np.full(500 - WINDOW + 1, 30.0))
+    assert out.rms[WINDOW - 1:] == pytest.approx(np.full(500 - WINDOW + 1, 100.0))
+
+
+def test_chunks_match_single_update():
+    x = sine(1000, dc=20.0)
+    whole = SlidingPhasor(RATE_HZ).update(x)
+
+    est = SlidingPhasor(RATE_HZ, resync_samples=150)
+    bounds = [0, 1, 38, 250, 251, 700, 1000]
+    parts = [est.update(x[a:b]) for a, b in zip(bounds, bounds[1:])]
+    magnitude = np.concatenate([p.magnitude for p in parts])
+    rms = np.concatenate([p.rms for p in parts])
+
+    np.testing.assert_allclose(magnitude, whole.magnitude, equal_nan=True)
+    np.testing.assert_allclose(rms, whole.rms, equal_nan=True)
+    # the DC offset is in the true RMS but not in the fundamental
+    assert whole.magnitude[-1] == pytest.approx(100.0)
+    assert whole.rms[-1] == pytest.approx(np.hypot(100.0, 20.0))
+
+
+def test_onset_within_one_cycle():
+    x = sine(1200)
+    x[:600] = 0.0
+    est = SlidingPhasor(RATE_HZ, onset_threshold=50.0)
+    est.update(x)
+
+    assert [e.kind for e in est.events] == ["onset"]
+    assert 600 / RATE_HZ <= est.events[0].t <= (600 + WINDOW) / RATE_HZ
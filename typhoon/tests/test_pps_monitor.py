@@ -0,0 +1,58 @@
+""" PPS quality analysis (pps_monitor.PpsAnalyzer / analyze_capture) on synthetic pulse trains. """
+
+import numpy as np
+import pandas as pd
+import pytest
+from pps_monitor import analyze_capture
+
+RATE_HZ = 10000.0
+DURATION_S = 10.5
+WIDTH_S = 0.1
+SECONDS = np.arange(1, 11)      # pulses due on whole seconds 1..10
+
+MAX_JITTER_S = 200e-6
+MAX_OFFSET_S = 200e-6
+MAX_DRIFT = 1e-6
+
+
+def pps_capture(edges):
+    """
+    Capture-shaped DataFrame of a 0/1 pulse train rising at ``edges``. The
+    rising edge is a two-sample ramp through 0.5 at the edge time, so the
+    interpolated edges are exact.
+    """
+    t = np.arange(int(DURATION_S * RATE_HZ)) / RATE_HZ
+    x = np.zeros_like(t)
+    for edge in edges:
+        ramp = np.clip((t - edge) * RATE_HZ / 2.0 + 0.5, 0.0, 1.0)
+        x = np.maximum(x, np.where(t < edge + WIDTH_S, ramp, 0.0))
+    return pd.DataFrame({"PTP": x}, index=pd.to_timedelta(t, unit="s"))
+
+
+def violations(edges):
+    analyzer = analyze_capture(pps_capture(edges), "PTP", chunk=7001, reference=0.0)
+    return analyzer.check(MAX_JITTER_S, MAX_OFFSET_S, max_drift_s_per_s=MAX_DRIFT)
+
+
+def test_ideal_train():
+    analyzer = analyze_capture(pps_capture(SECONDS), "PTP", chunk=7001, reference=0.0)
+
+    assert analyzer.check(MAX_JITTER_S, MAX_OFFSET_S, max_drift_s_per_s=MAX_DRIFT) == []
+    summary = analyzer.summary()
+    assert (summary["edges"], summary["missed"], summary["extra"]) == (10, 0, 0)
+    assert summary["offset_max_s"] == pytest.approx(0.0, abs=1e-9)
+
+
+def test_known_offset():
+    assert violations(SECONDS + 500e-6) == ["offset 500.0 us > 200.0 us"]
+
+
+def test_dropped_edge():
+    assert violations(np.delete(SECONDS, 4)) == ["1 missed pulses (limit 0)"]
+
+
+def test_jitter():
+    # symmetric pattern: intervals off by up to 300 us, edges within 150 us of the grid, no drift
+    offsets = np.array([0, 150, -150, 150, -150, -150, 150, -150, 150, 0]) * 1e-6
+
+    assert violations(SECONDS + offsets) == ["period jitter 300.0 us > 200.0 us"]
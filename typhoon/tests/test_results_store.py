@@ -0,0 +1,51 @@
+""" Results store (results_store.ResultsStore) append/query round trip. """
+
+from datetime import datetime
+
+import pytest
+from results_store import ResultsStore, result_filter
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(str(tmp_path / "results"))
+    september = datetime(2026, 9, 14, 10, 0)
+    october = datetime(2026, 10, 2, 10, 0)
+    internal = [{"test": "internal", "fault_type": "internal", "trip_s": t, "passed": True}
+                for t in (0.020, 0.022, 0.024, 0.030)]
+    store.append(internal, source="busbar", device="HIL606", model_version="abc", timestamp=september)
+    store.append([{"test": "internal", "fault_type": "internal", "trip_s": 0.050, "passed": True},
+                  {"test": "internal", "fault_type": "internal", "trip_s": None, "passed": False}],
+                 source="busbar", device="HIL404", model_version="abc", timestamp=september)
+    store.append([{"test": "external", "fault_type": "external", "trip_s": 0.5, "passed": False}],
+                 source="busbar", device="HIL606", model_version="abc", timestamp=september)
+    store.append([{"test": "internal", "fault_type": "internal", "trip_s": 0.9, "passed": True}],
+                 source="busbar", device="HIL606", model_version="def", timestamp=october)
+    return store
+
+
+def test_trip_time_quantiles(store):
+    table = store.trip_time_quantiles(quantiles=(0.5, 1.0), fault_type="internal", device="HIL606",
+                                      since="2026-09-01", until="2026-09-30")
+
+    assert table.to_pylist() == [{"count": 4, "p50_s": pytest.approx(0.023), "p100_s": pytest.approx(0.030)}]
+
+
+def test_trip_time_quantiles_by_device(store):
+    table = store.trip_time_quantiles(quantiles=(0.5,), by=["device"], fault_type="internal",
+                                      until="2026-09-30")
+    rows = {row["device"]: row for row in table.to_pylist()}
+
+    # the row without a trip time is not counted
+    assert rows["HIL404"]["count"] == 1
+    assert rows["HIL404"]["p50_s"] == pytest.approx(0.050)
+    assert rows["HIL606"]["count"] == 4
+    assert rows["HIL606"]["p50_s"] == pytest.approx(0.023)
+
+
+def test_partition_pruning(store):
+    expr = result_filter(fault_type="internal", device="HIL606", since="2026-09-01", until="2026-09-30")
+    paths = [fragment.path for fragment in store.dataset().get_fragments(filter=expr)]
+
+    assert len(paths) == 1
+    assert "date=2026-09-14/fault_type=internal/device=HIL606" in paths[0].replace("\\", "/")
@@ -0,0 +1,176 @@
+""" Scenario compiler and runner (scenario.compile_scenario / run_scenario). """
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import scenario
+from hil_backend import hil, is_simulated
+from scenario import Action, compile_scenario, failed_checks, load_scenario, run_scenario
+from substation_state import expected_state
+from switching import BAYS
+
+SCENARIO_DIR = Path(__file__).parent / ".." / "scenarios"
+
+SPEC = {
+    "name": "unit",
+    "lead_s": 0.5,
+    "settle_s": 0.1,
+    "capture": {"at": 1.0, "duration_s": 1.0, "rate_hz": 1000, "signals": ["cause", "effect"]},
+    "steps": [
+        {"at": 1.5, "fault": {"select": 11, "clear_after_s": 0.2}},
+        {"at": 0.0, "switch": {"bays": ["Bay 1", "Bay 2"], "device": "CB", "action": "Off"}},
+        {"at": 1.5, "digital": {"name": "DI_ARM", "value": 0}},
+    ],
+    "expect": [
+        {"reaction": {"cause": "cause", "effect": "effect", "effect_edge": "falling", "max_s": 0.05}},
+        {"edge": {"signal": "effect", "edge": "falling", "within": [1.5, 1.6]}},
+        {"state": {"bays": ["Bay 1"], "cb_closed": False}},
+    ],
+}
+
+
+class FakeHil:
+    """Records the writes run_scenario uploads; waits only move the clock."""
+
+    def __init__(self, t):
+        self.t = t
+        self.writes = []
+
+    def get_sim_time(self):
+        return self.t
+
+    def wait_msec(self, msec):
+        self.t += msec / 1000.0
+
+    def __getattr__(self, name):
+        def write(*args, executeAt=None):
+            self.writes.append((executeAt, name, args))
+
+        return write
+
+
+class FakeCapture:
+    def __init__(self, cap_data):
+        self.cap_data = cap_data
+        self.started = None
+
+    def start_capture(self, duration, rate=None, signals=(), executeAt=None):
+        self.started = (executeAt, duration, rate, signals)
+
+    def get_capture_results(self, wait_capture=True):
+        return self.cap_data
+
+
+def capture_frame(effect_falls_at=None, rate_hz=1000.0, n=1000):
+    """Capture of SPEC: ``cause`` rises at sample 500, ``effect`` falls at sample ``effect_falls_at``."""
+    cause = np.zeros(n)
+    cause[500:] = 1.0
+    effect = np.ones(n)
+    if effect_falls_at is not None:
+        effect[effect_falls_at:] = 0.0
+    index = pd.to_timedelta(np.arange(n) / rate_hz, unit="s")
+    return pd.DataFrame({"cause": cause, "effect": effect}, index=index)
+
+
+@pytest.fixture
+def fakes(monkeypatch):
+    def install(cap_data):
+        fake_hil, fake_capture = FakeHil(t=2.0), FakeCapture(cap_data)
+        monkeypatch.setattr(scenario, "hil", fake_hil)
+        monkeypatch.setattr(scenario, "capture", fake_capture)
+        # Bay 1 breaker open
+        monkeypatch.setattr(scenario, "station_snapshot", lambda bays: expected_state(
+            bays, cb_closed=False, dc1_closed=True, dc2_closed=False))
+        return fake_hil, fake_capture
+
+    return install
+
+
+def test_actions_in_time_order():
+    compiled = compile_scenario(SPEC)
+
+    assert compiled.actions == [
+        Action(0.0, "set_scada_input_value", ("Bay 1.CB open", 1)),
+        Action(0.0, "set_scada_input_value", ("Bay 2.CB open", 1)),
+        Action(0.1, "set_scada_input_value", ("Bay 1.CB open", 0)),
+        Action(0.1, "set_scada_input_value", ("Bay 2.CB open", 0)),
+        Action(1.5, "set_scada_input_value", ("FaultBB.Fault select", 11)),
+        Action(1.5, "set_digital_input_value", ("DI_ARM", 0)),
+        Action(pytest.approx(1.7), "set_scada_input_value", ("FaultBB.Fault select", 0)),
+    ]
+    # capture end (2.0 s) plus settle_s
+    assert compiled.end_s == pytest.approx(2.1)
+
+
+def test_run_uploads_with_execute_at_offsets(fakes):
+    fake_hil, fake_capture = fakes(capture_frame(effect_falls_at=530))
+    compiled = compile_scenario(SPEC)
+
+    result = run_scenario(compiled)
+
+    assert result.t0 == 2.5
+    assert fake_capture.started == (3.5, 1.0, 1000, ["cause", "effect"])
+    assert fake_hil.writes == [(2.5 + a.t, a.function, a.args) for a in compiled.actions]
+    # a single wait until the end of the timeline
+    assert fake_hil.t == pytest.approx(2.5 + compiled.end_s)
+
+
+def test_checks_evaluated(fakes):
+    fakes(capture_frame(effect_falls_at=530))
+    result = run_scenario(compile_scenario(SPEC))
+
+    assert [(c.check, c.ok) for c in result.checks] == [("reaction", True), ("edge", True), ("state", True)]
+    assert result.checks[0].detail == "cause -> effect: 30.0 ms (limit 50.0 ms)"
+
+    fakes(capture_frame())
+    result = run_scenario(compile_scenario(SPEC))
+
+    assert [c.check for c in failed_checks(result)] == ["reaction", "edge"]
+    assert result.checks[0].detail == "cause -> effect: no reaction"
+
+
+@pytest.mark.parametrize("change, message", [
+    ({"steps": [{"at": 0.0, "scada": {"input": "x", "value": 1}, "digital": {"name": "y", "value": 1}}]},
+     "step 0 needs 'at' and one of"),
+    ({"steps": [{"scada": {"input": "x", "value": 1}}]}, "step 0 needs 'at'"),
+    ({"steps": [{"at": 0.0, "wait": 1}]}, "step 0 needs 'at' and one of"),
+    ({"expect": [{"voltage": {}}]}, "check 0 must be one of"),
+    ({"capture": None}, "reaction check 0 needs a capture"),
+])
+def test_schema_errors(change, message):
+    with pytest.raises(ValueError, match=message):
+        compile_scenario({**SPEC, **change})
+
+
+def test_shipped_scenario_schedules():
+    dc_cb = load_scenario(SCENARIO_DIR / "dc_cb_switching.yaml")
+    schedule = [(a.t, a.args) for a in dc_cb.actions]
+    assert schedule == ([(0.0, (f"{bay}.DC1 close", 1)) for bay in BAYS]
+                        + [(pytest.approx(0.1), (f"{bay}.DC1 close", 0)) for bay in BAYS]
+                        + [(pytest.approx(0.35), (f"{bay}.CB close", 1)) for bay in BAYS]
+                        + [(pytest.approx(0.45), (f"{bay}.CB close", 0)) for bay in BAYS])
+    assert dc_cb.capture is None
+    assert dc_cb.end_s == pytest.approx(1.0)
+
+    q3 = load_scenario(SCENARIO_DIR / "q3_fault.yaml")
+    schedule = [(a.t, a.function, a.args) for a in q3.actions]
+    assert schedule == ([(0.0, "set_scada_input_value", (f"{bay}.CB close", 1)) for bay in BAYS]
+                        + [(pytest.approx(0.1), "set_scada_input_value", (f"{bay}.CB close", 0)) for bay in BAYS]
+                        + [(1.5, "set_contactor", ("Grid Fault1.enable", True, True))])
+    assert (q3.capture.at, q3.capture.duration_s) == (1.0, 5.0)
+    assert q3.end_s == pytest.approx(6.3)
+
+
+@pytest.mark.skipif(not is_simulated(), reason="runs the shipped scenarios on HIL_BACKEND=sim")
+@pytest.mark.parametrize("name", ["dc_cb_switching.yaml", "q3_fault.yaml"])
+def test_shipped_scenario_passes(name):
+    hil.load_model(file="digital-substation-demo.tse", vhil_device=True)
+    hil.start_simulation()
+    try:
+        result = run_scenario(load_scenario(SCENARIO_DIR / name))
+    finally:
+        hil.stop_simulation()
+
+    assert failed_checks(result) == []
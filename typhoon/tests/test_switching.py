@@ -0,0 +1,43 @@
+""" Staged bay switching (switching.plan_stages / run_switching). """
+
+import pytest
+import switching
+from switching import SwitchCommand, plan_stages, run_switching, switching_pulses
+
+
+class RecordingHil:
+    """Records SCADA writes and host waits in call order."""
+
+    def __init__(self):
+        self.calls = []
+
+    def set_scada_input_value(self, name, value):
+        self.calls.append((name, value))
+
+    def wait_msec(self, msec):
+        self.calls.append(("wait", msec))
+
+
+COMMANDS = [SwitchCommand("Bay 1", "CB", "On"),
+            SwitchCommand("Bay 2", "CB", "Off"), SwitchCommand("Bay 2", "DC1", "On")]
+
+
+def test_stages_are_global():
+    # Bay 1 only closes its CB, but waits for the disconnector stage of Bay 2
+    assert plan_stages(COMMANDS) == [["Bay 2.CB open"], ["Bay 2.DC1 close"], ["Bay 1.CB close"]]
+
+
+def test_host_mode_settles_after_last_stage(monkeypatch):
+    fake = RecordingHil()
+    monkeypatch.setattr(switching, "hil", fake)
+
+    run_switching(COMMANDS, pulse_ms=100, settle_ms=250)
+
+    assert fake.calls == [
+        ("Bay 2.CB open", 1), ("wait", 100), ("Bay 2.CB open", 0), ("wait", 250),
+        ("Bay 2.DC1 close", 1), ("wait", 100), ("Bay 2.DC1 close", 0), ("wait", 250),
+        ("Bay 1.CB close", 1), ("wait", 100), ("Bay 1.CB close", 0), ("wait", 250),
+    ]
+    # same duration as the scheduled pulses
+    _, t_done = switching_pulses(COMMANDS, 0.0, pulse_ms=100, settle_ms=250)
+    assert sum(msec for name, msec in fake.calls if name == "wait") / 1000.0 == pytest.approx(t_done)
@@ -0,0 +1,85 @@
+""" Live telemetry (telemetry.TelemetryPublisher / publisher) over a localhost XPUB/SUB pair. """
+
+import numpy as np
+import pytest
+import telemetry
+from busbar_diff_fault_test import BusbarDiffTester
+from telemetry import NullPublisher, TelemetryPublisher, TelemetrySubscriber, publisher
+
+TIMEOUT_MS = 2000
+
+
+@pytest.fixture
+def local_publisher(monkeypatch):
+    """publisher() on a free localhost port, closed again afterwards."""
+    pytest.importorskip("zmq")
+    monkeypatch.setenv("HIL_TELEMETRY_ENDPOINT", "tcp://127.0.0.1:*")
+    publisher.cache_clear()
+    pub = publisher()
+    yield pub
+    pub.close()
+    publisher.cache_clear()
+
+
+def subscribe(pub, topics):
+    """Subscriber on ``pub`` that is known to receive (ZeroMQ drops messages before a SUB has joined)."""
+    sub = TelemetrySubscriber(pub.endpoint, list(topics) + ["event.sync"])
+    for _ in range(TIMEOUT_MS // 50):
+        pub.event("sync")
+        if sub.recv(timeout_ms=50) is not None:
+            break
+    else:
+        pytest.fail("subscriber did not join")
+    while sub.recv(timeout_ms=50) is not None:
+        pass
+    return sub
+
+
+def test_round_trip_with_topic_filter(local_publisher):
+    assert isinstance(local_publisher, TelemetryPublisher)
+    sub = subscribe(local_publisher, ["chunk.busbar", "event.result"])
+    try:
+        ia = np.arange(1000, dtype=float)
+        local_publisher.publish_chunk("other", {"IA": ia})
+        local_publisher.event("trip", test="internal")
+        local_publisher.publish_chunk("busbar", {"IA": ia, "S3_fb": np.ones(10, dtype=np.int8)},
+                                      t0=1.5, rate_hz=10000)
+        BusbarDiffTester().add_result({"test": "internal", "passed": True, "trip_ms": 22.0})
+
+        kind, stream, header, arrays = sub.recv(timeout_ms=TIMEOUT_MS)
+        assert (kind, stream, header["seq"], header["t0"], header["rate_hz"]) == ("chunk", "busbar", 1, 1.5, 10000)
+        np.testing.assert_array_equal(arrays["IA"], ia)
+        np.testing.assert_array_equal(arrays["S3_fb"], np.ones(10, dtype=np.int8))
+
+        kind, name, body = sub.recv(timeout_ms=TIMEOUT_MS)
+        assert (kind, name) == ("event", "result")
+        assert {k: body[k] for k in ("test", "passed", "trip_ms")} == {"test": "internal", "passed": True,
+                                                                       "trip_ms": 22.0}
+
+        # "other" and "event.trip" were filtered out
+        assert sub.recv(timeout_ms=200) is None
+        assert local_publisher.dropped == 0
+    finally:
+        sub.close()
+
+
+def test_null_publisher_without_endpoint(monkeypatch):
+    monkeypatch.delenv("HIL_TELEMETRY_ENDPOINT", raising=False)
+    publisher.cache_clear()
+    try:
+        assert isinstance(publisher(), NullPublisher)
+        # the harness publishes unconditionally
+        BusbarDiffTester().add_result({"test": "internal", "passed": True})
+        assert publisher().sent == 0
+    finally:
+        publisher.cache_clear()
+
+
+def test_null_publisher_without_pyzmq(monkeypatch):
+    monkeypatch.setenv("HIL_TELEMETRY_ENDPOINT", "tcp://127.0.0.1:*")
+    monkeypatch.setattr(telemetry, "zmq", None)
+    publisher.cache_clear()
+    try:
+        assert isinstance(publisher(), NullPublisher)
+    finally:
+        publisher.cache_clear()
@@ -0,0 +1,76 @@
+""" Edge detection (transitions.find_transitions) on synthetic captures. """
+
+import numpy as np
+import pandas as pd
+import pytest
+from capture_timing import fault_response_times
+from transitions import find_transitions
+
+RATE_HZ = 10000.0
+
+
+def capture_frame(**columns):
+    """DataFrame shaped like capture.get_capture_results(): TimedeltaIndex at RATE_HZ."""
+    n = len(next(iter(columns.values())))
+    index = pd.to_timedelta(np.arange(n) / RATE_HZ, unit="s")
+    return pd.DataFrame({name: np.asarray(x, dtype=float) for name, x in columns.items()}, index=index)
+
+
+def steps(n, *changes):
+    """0/1 signal of ``n`` samples that takes value v from sample i on, for each (i, v) in ``changes``."""
+    x = np.zeros(n)
+    for i, v in changes:
+        x[i:] = v
+    return x
+
+
+def test_bouncing_contact_debounced():
+    # contact closes at sample 100 with four one-sample bounces, settles at 104, opens at 300
+    contact = steps(400, (100, 1), (101, 0), (102, 1), (103, 0), (104, 1), (300, 0))
+    cap_data = capture_frame(contact=contact)
+
+    assert find_transitions(cap_data).count("contact", "rising") == 3
+
+    edges = find_transitions(cap_data, debounce_s=0.0005)
+    assert edges.count("contact", "rising") == 1
+    assert edges.count("contact", "falling") == 1
+    assert edges.first("contact", "rising") == pytest.approx(103.5 / RATE_HZ)
+    assert edges.first("contact", "falling") == pytest.approx(299.5 / RATE_HZ)
+
+
+def test_noisy_analog_hysteresis():
+    # slow ramp through the threshold with +-0.05 sample-to-sample noise
+    n = 1000
+    ramp = np.linspace(0.0, 1.0, n)
+    noisy = ramp + 0.05 * (-1.0) ** np.arange(n)
+    cap_data = capture_frame(x=noisy)
+
+    assert find_transitions(cap_data).count("x", "rising") > 1
+
+    edges = find_transitions(cap_data, threshold=0.5, hysteresis=0.2)
+    assert edges.count("x", "rising") == 1
+    assert edges.count("x", "falling") == 0
+    # switches high where the signal first exceeds the upper level (0.6)
+    t_rise = edges.first("x", "rising")
+    assert 0.5 < ramp[int(t_rise * RATE_HZ)] < 0.6
+
+
+def test_cause_edge_at_first_sample():
+    # fault already high in sample 0 (capture triggered on it without pre-trigger)
+    cap_data = capture_frame(fault=np.ones(500), trip=steps(500, (220, 1)))
+
+    edges = find_transitions(cap_data)
+    assert edges.count("fault", "rising") == 0
+    assert edges.reaction_time("fault", "trip") is None
+
+    timing = fault_response_times(cap_data, "fault", trip_signal="trip")
+    assert timing["t_fault"] == 0.0
+    assert timing["trip_s"] == pytest.approx(219.5 / RATE_HZ)
+
+
+def test_reaction_time_after_cause_edge():
+    cap_data = capture_frame(fault=steps(500, (50, 1)), trip=steps(500, (10, 1), (20, 0), (270, 1)))
+
+    edges = find_transitions(cap_data)
+    # the trip edge before the fault is ignored
+    assert edges.reaction_time("fault", "trip") == pytest.approx(220 / RATE_HZ)
@@ -0,0 +1,165 @@
+"""
+Batch edge detection over captured DataFrames.
+
+``find_transitions`` takes the whole frame returned by
+``capture.get_capture_results()`` and extracts every rising and falling
+transition on every channel in one vectorized pass, instead of one
+``typhoon.test.signals.find`` scan per signal and direction. The result is a
+compact ``TransitionTable`` that tests query by channel name, e.g.::
+
+    edges = find_transitions(cap_data)
+    fault_time = edges.first("Grid Fault1.enable_fb", "rising")
+    cb_time = edges.first("S3_fb", "falling", after=fault_time)
+
+Hysteresis: the channel switches high only above ``threshold + hysteresis/2``
+and low only below ``threshold - hysteresis/2``.
+Debounce: a new level must persist for at least ``debounce_s`` to count;
+shorter excursions (contact bounce, glitches) are dropped.
+"""
+import numpy as np
+import pandas as pd
+
+from capture_timing import index_seconds
+
+RISING = 1
+FALLING = -1
+_EDGES = {"rising": (RISING,), "falling": (FALLING,), "both": (RISING, FALLING)}
+
+
+class TransitionTable:
+    """All transitions of a capture, sorted by channel and then by time."""
+
+    def __init__(self, channels, channel, index, time, direction):
+        self.channels = list(channels)
+        self._codes = {name: i for i, name in enumerate(self.channels)}
+        self.channel = channel
+        self.index = index
+        self.time = time
+        self.direction = direction
+        # Row ranges per channel: transitions of channel c are [offsets[c], offsets[c+1])
+        self._offsets = np.searchsorted(channel, np.arange(len(self.channels) + 1))
+
+    def __len__(self):
+        return len(self.time)
+
+    def _slice(self, name):
+        try:
+            code = self._codes[name]
+        except KeyError:
+            raise KeyError(f"Channel {name!r} is not in the capture") from None
+        return slice(self._offsets[code], self._offsets[code + 1])
+
+    def edges(self, name, edge="both", during=None) -> np.ndarray:
+        """Times (s) of the transitions of one channel, optionally within ``during=(t0, t1)``."""
+        sl = self._slice(name)
+        times = self.time[sl]
+        mask = np.isin(self.direction[sl], _EDGES[edge])
+        if during is not None:
+            mask &= (times >= during[0]) & (times <= during[1])
+        return times[mask]
+
+    def first(self, name, edge="rising", during=None, after=None):
+        """Time of the first matching transition, or None."""
+        times = self.edges(name, edge, during)
+        if after is not None:
+            times = times[times >= after]
+        return float(times[0]) if times.size else None
+
+    def count(self, name, edge="both") -> int:
+        return int(self.edges(name, edge).size)
+
+    def reaction_time(self, cause, effect, cause_edge="rising", effect_edge="rising", during=None):
+        """Delay from the first ``cause`` edge to the first following ``effect`` edge, or None."""
+        t_cause = self.first(cause, cause_edge, during)
+        if t_cause is None:
+            return None
+        t_effect = self.first(effect, effect_edge, during, after=t_cause)
+        return None if t_effect is None else t_effect - t_cause
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "channel": pd.Categorical.from_codes(self.channel, categories=self.channels),
+            "index": self.index,
+            "time": self.time,
+            "direction": self.direction,
+        })
+
+
+def _per_column(value, columns, default):
+    if isinstance(value, dict):
+        return np.array([value.get(c, default) for c in columns], dtype=float)
+    return np.full(len(columns), value, dtype=float)
+
+
+def _block_transitions(t, x, upper, lower, debounce_n):
+    """Transitions of one block of columns. Returns (column, row, time, direction) arrays."""
+    n, m = x.shape
+    rows = np.arange(n)[:, None]
+    cols = np.arange(m)[None, :]
+
+    # Two-level state with hysteresis: -1 = inside the band (hold previous level)
+    code = np.where(x > upper, 1, np.where(x < lower, 0, -1)).astype(np.int8)
+    code[0][code[0] < 0] = 0
+    fill = np.maximum.accumulate(np.where(code >= 0, rows, 0), axis=0)
+    state = code[fill, cols]
+
+    if debounce_n > 1:
+        # Replace runs shorter than debounce_n by the previous accepted level
+        change = np.ones((n, m), dtype=bool)
+        change[1:] = state[1:] != state[:-1]
+        run_start = np.maximum.accumulate(np.where(change, rows, 0), axis=0)
+        next_change = np.full((n, m), n)
+        next_change[:-1] = np.where(change[1:], rows[1:], n)
+        run_end = np.minimum.accumulate(next_change[::-1], axis=0)[::-1]
+        # The first run and a run still open at the end of the capture are kept
+        short = (run_end - run_start < debounce_n) & (run_start > 0) & (run_end < n)
+        fill = np.maximum.accumulate(np.where(short, 0, rows), axis=0)
+        state = state[fill, cols]
+
+    step = np.diff(state, axis=0)
+    col, row = np.nonzero(step.T)
+    row = row + 1
+    direction = step[row - 1, col]
+
+    # Interpolate the crossing of the switching level between row-1 and row
+    level = np.where(direction > 0, upper[col], lower[col])
+    x0 = x[row - 1, col]
+    x1 = x[row, col]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frac = np.where(x1 != x0, (level - x0) / (x1 - x0), 1.0)
+    frac = np.clip(np.nan_to_num(frac, nan=1.0), 0.0, 1.0)
+    time = t[row - 1] + frac * (t[row] - t[row - 1])
+    return col, row, time, direction
+
+
+def find_transitions(cap_data, threshold=0.5, hysteresis=0.0, debounce_s=0.0, columns=None, block_columns=64):
+    """
+    Find every rising/falling transition on every channel of ``cap_data``.
+
+    ``threshold`` and ``hysteresis`` are either scalars or dicts keyed by
+    column name. Columns are processed in blocks of ``block_columns`` to keep
+    temporary arrays bounded on very wide captures.
+    """
+    columns = list(cap_data.columns if columns is None else columns)
+    t = index_seconds(cap_data)
+    thr = _per_column(threshold, columns, 0.5)
+    half_band = _per_column(hysteresis, columns, 0.0) / 2.0
+    upper, lower = thr + half_band, thr - half_band
+
+    debounce_n = 0
+    if debounce_s and len(t) > 1:
+        debounce_n = int(np.ceil(debounce_s / np.median(np.diff(t))))
+
+    parts = []
+    for start in range(0, len(columns), block_columns):
+        block = columns[start:start + block_columns]
+        x = cap_data[block].to_numpy(dtype=float)
+        sl = slice(start, start + len(block))
+        col, row, time, direction = _block_transitions(t, x, upper[sl], lower[sl], debounce_n)
+        parts.append((col + start, row, time, direction))
+
+    if parts:
+        channel, index, time, direction = (np.concatenate(p) for p in zip(*parts))
+    else:
+        channel, index, time, direction = (np.empty(0, dtype=d) for d in (np.intp, np.intp, float, np.int8))
+    return TransitionTable(columns, channel.astype(np.int32), index, time, direction.astype(np.int8))